@@ -1,38 +1,72 @@
-import speech_recognition as sr
-import sounddevice  # to avoid lots of ALSA error
 import subprocess
-from time import sleep
+from time import monotonic, sleep
+from roboCarHelper import RobocarHelper
+from commandTrace import CommandTrace
 from exceptions import MicrophoneException
 
+# loaded in the background during startup, see load_speech_modules
+sr = RobocarHelper.lazy_import("speech_recognition")
+sounddevice = RobocarHelper.lazy_import("sounddevice")  # to avoid lots of ALSA error
+
 class AudioHandler:
     def __init__(self, exitCommand: str, language: str, microphoneName: str):
-        self._check_if_headphones_connected(microphoneName)
-
         self._deviceIndex: int = self._get_device_index()
         self._exitCommand: str = exitCommand
         self._headPhoneName: str = microphoneName
         self._languageCode: str = self._get_language_code(language)
         self._recognizer = sr.Recognizer()
         self._queue = None
+        self._startupTimeline = None
+
+        # how long to listen for the start of a phrase before checking for a shutdown
+        self._listenTimeout: float = 1.0
 
-    def setup(self, queue) -> None:
+    def setup(self, queue, startupTimeline=None) -> None:
         self._queue = queue
+        self._startupTimeline = startupTimeline
 
-    def set_audio_command(self, flag) -> None:
+    @staticmethod
+    def load_speech_modules() -> None:
+        # sounddevice has to be loaded before speech_recognition opens the microphone
+        sounddevice.query_devices
+        sr.Recognizer
+
+    def set_audio_command(self, shutdown) -> None:
         spokenWords: str = ""
+        trace: CommandTrace = None
 
         # Reading Microphone as source
         # listening the speech and store in audio_text variable
         with sr.Microphone(device_index=self._deviceIndex) as source:
-            while not flag.value:
+            while not shutdown.is_set():
                 # adjust to ambient noise on each go
                 self._recognizer.adjust_for_ambient_noise(source)
                 print("Talk")
-                while True:
-                    audio_text: str = self._recognizer.listen(source, timeout=None, phrase_time_limit=3)
+
+                # report how long it took from pressing the start button until the car listens for commands
+                if self._startupTimeline:
+                    self._startupTimeline.mark("ready to talk")
+                    self._startupTimeline.print_report()
+                    self._startupTimeline = None
+                while not shutdown.is_set():
+                    try:
+                        audio_text: str = self._recognizer.listen(
+                            source, timeout=self._listenTimeout, phrase_time_limit=3
+                        )
+                    except sr.WaitTimeoutError:
+                        # nothing was said, check if another process has started shutting down
+                        continue
+
+                    # listen returns after pause_threshold seconds of silence, so the phrase ended that long ago
+                    listenedTime: float = monotonic()
+                    trace = CommandTrace()
+                    trace.mark("phrase end", listenedTime - self._recognizer.pause_threshold)
+                    trace.mark("listened", listenedTime)
+
                     try:
                         # using google speech recognition
                         spokenWords = self._recognizer.recognize_google(audio_text, language=self._languageCode)
+                        trace.mark("recognized")
                         break
                     except sr.UnknownValueError:
                         # if nothing intelligible is picked up, then try again
@@ -41,14 +75,19 @@ class AudioHandler:
                         print(f"Could not request results from Google Speech Recognition; {e}")
                         break
 
+                if shutdown.is_set():
+                    break
+
                 spokenWords = self._clean_up_spoken_words(spokenWords)
 
-                # set the command in IPC
-                self._queue.put(spokenWords)
+                # set the command in IPC, the trace follows the command to the command handler
+                trace.command = spokenWords
+                trace.mark("queued")
+                self._queue.put(trace)
 
-                # set flag value to true if command is exit command and break out of loop
+                # start shutting down if command is exit command and break out of loop
                 if spokenWords == self._exitCommand:
-                    flag.value = True
+                    shutdown.request("exit command given")
                     break
 
                 # give some time for the user to observe the effects of the command given before
@@ -68,24 +107,22 @@ class AudioHandler:
 
         return spokenWords.lower().strip()
 
-    def _check_if_headphones_connected(self, headPhoneName: str) -> None:
+    @staticmethod
+    def check_if_headphones_connected(headPhoneName: str) -> None:
         sleepTime: int = 10
         numOfTries: int = 0
         treshold: int = 5
-        try:
-            while numOfTries < treshold:
-                output: str = subprocess.check_output("bluetoothctl devices Connected", shell=True).decode("utf-8")
-
-                numOfTries += 1
-                if headPhoneName not in output:
-                    print(f"Headphone {headPhoneName} not connected. Trying again in {sleepTime} seconds...\n"
-                          f"Number of retries: {treshold - numOfTries}\n")
-                    sleep(sleepTime)
-                else:
-                    print(f"Headphone {headPhoneName} connected\n")
-                    return
-        except KeyboardInterrupt:
-            raise MicrophoneException(f"User aborted connecting microphone")
+        while numOfTries < treshold:
+            output: str = subprocess.check_output("bluetoothctl devices Connected", shell=True).decode("utf-8")
+
+            numOfTries += 1
+            if headPhoneName not in output:
+                print(f"Headphone {headPhoneName} not connected. Trying again in {sleepTime} seconds...\n"
+                      f"Number of retries: {treshold - numOfTries}\n")
+                sleep(sleepTime)
+            else:
+                print(f"Headphone {headPhoneName} connected\n")
+                return
 
         raise MicrophoneException(f"Headphone {headPhoneName} not connected via bluetooth")
 
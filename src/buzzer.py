@@ -1,7 +1,8 @@
 import RPi.GPIO as GPIO
-from time import sleep
-from roboCarHelper import RobocarHelper
+from functools import partial
 from roboObject import RoboObject
+from commandGrammar import CommandTemplate
+from pulseScheduler import PulseScheduler
 
 class Buzzer(RoboObject):
     def __init__(self, buzzerPin: int, defaultHonkTime: float, maxHonkTime: float, userCommands: dict, **kwargs):
@@ -11,8 +12,13 @@ class Buzzer(RoboObject):
         self._defaultHonkTime: float = defaultHonkTime
         self._maxHonkTime: float = maxHonkTime
 
+        # the horn is turned off in the background so the car can be steered while honking
+        self._pulseScheduler: PulseScheduler = PulseScheduler(GPIO.output)
+
         self._buzzCommand: dict[str: dict] = {userCommands["buzzCommand"]: {"description": "Starts honking"}}
-        self._buzzForSpecifiedTimeCommands: dict[str: float] = self._set_honk_for_specified_time_commands(userCommands["buzzForSpecifiedTimeCommand"])
+        self._buzzForSpecifiedTimeTemplate: CommandTemplate = CommandTemplate(
+            userCommands["buzzForSpecifiedTimeCommand"], 0.1, self._maxHonkTime, decimals=1
+        )
 
         # mainly for printing at startup
         self._variableCommands: dict[str: dict] = {
@@ -21,55 +27,41 @@ class Buzzer(RoboObject):
             }
         }
 
+        self._commandDispatch: dict[str: tuple] = {
+            command: ("horn", self._get_horn_validity, partial(self._buzz, self._defaultHonkTime))
+            for command in self._buzzCommand
+        }
+        self._templateDispatch: list[tuple] = [
+            (self._buzzForSpecifiedTimeTemplate, "horn", self._get_horn_validity, self._buzz)
+        ]
+        self._register_commands()
+
     def setup(self) -> None:
         GPIO.setup(self._buzzerPin, GPIO.OUT)
+        self._pulseScheduler.start()
 
-    def get_command_validity(self, command: str) -> str:
-        return "valid" # honking commands are always valid
-
-    """
-    Handles voice commands for the buzzer.
+    def cleanup(self) -> None:
+        self._pulseScheduler.stop()
 
-    This method processes the given voice command and triggers the buzzer to honk
-    for a specified duration based on the command.
-
-    Parameters:
-    command (str): The voice command to be processed. It can be one of the predefined
-                   commands to start honking or honk for a specified time.
-    """
-    def handle_voice_command(self, command: str) -> None:
-        if command in self._buzzCommand:
-            honkTime: float = self._defaultHonkTime
-        elif command in self._buzzForSpecifiedTimeCommands:
-            honkTime: float = self._buzzForSpecifiedTimeCommands[command]
-        self._buzz(honkTime)
+    def cancel_timed_actions(self) -> None:
+        self._pulseScheduler.cancel()
 
     def print_commands(self) -> None:
         allDictsWithCommands: dict = {**self._buzzCommand, **self._variableCommands}
         title: str = "Honk commands:"
         self._print_commands(title, allDictsWithCommands)
 
-    def get_voice_commands(self) -> list[str]:
-        return RobocarHelper.chain_together_dict_keys([self._buzzCommand,
-                                                       self._buzzForSpecifiedTimeCommands]
-                                                      )
-
-    def _buzz(self, honkTime: float) -> None:
-        GPIO.output(self._buzzerPin, GPIO.HIGH)
-        sleep(honkTime)
-        GPIO.output(self._buzzerPin, GPIO.LOW)
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
 
-    def _set_honk_for_specified_time_commands(self, userCommand: str) -> dict[str, float]:
-        honkTime: float = 0.1
-        stepValue: float = 0.1
-        honkCommands: dict = {}
-        while honkTime <= (self._maxHonkTime + stepValue):
-            command = self._format_command(userCommand, str(round(honkTime, 1)))
-            honkCommands[command] = round(honkTime, 1) # round honkTime to avoid floating numbers with many decimals
+    def get_template_dispatch(self) -> list[tuple]:
+        return self._templateDispatch
 
-            honkTime += stepValue
+    def _get_horn_validity(self, honkTime: float = None) -> str:
+        return "valid" # honking commands are always valid
 
-        return honkCommands
+    def _buzz(self, honkTime: float) -> None:
+        self._pulseScheduler.pulse(self._buzzerPin, honkTime)
 
     def _check_argument_validity(self, pins: list[int], userCommands: dict[str, str], **kwargs) -> None:
         super()._check_argument_validity(pins, userCommands)
@@ -1,110 +1,287 @@
-import cv2
-import os
-os.environ["LIBCAMERA_LOG_LEVELS"] = "3" #disable info and warning logging
-from picamera2 import Picamera2
 from time import time
 from roboCarHelper import RobocarHelper
+from hudOverlay import HudOverlay
+from zoomEngine import ZoomEngine
+from frameBuffers import FrameBufferPool
+from mjpegStreamer import MjpegStreamer
+from cameraGovernor import CameraGovernor
+from stageTimings import StageTimings
+from videoRecorder import VideoRecorder
+from frameSource import FrameSource
+from picameraSource import PicameraSource
+from telemetry import TelemetryValues, Direction
+
+cv2 = RobocarHelper.lazy_import("cv2")
 
 class Camera:
-    def __init__(self, resolution, rotation=True):
+    def __init__(self, resolution, rotation=True, output="window", streamPort=8000, targetFps=0.0,
+                 stageTimings=False, recorder=None, frameSource=None):
         self._dispW, self._dispH = resolution
-        self._centerX = int(self._dispW / 2)
-        self._centerY = int(self._dispH / 2)
-        self._rotation: bool = rotation
+        self._maxResolution: tuple = resolution
 
-        self._picam2 = None
+        # frames come from the pi camera unless another source is given, e.g. to benchmark without a camera
+        self._frameSource: FrameSource = frameSource or PicameraSource(resolution, rotation)
+
+        # steps the resolution down when the pi can't keep up with the target fps, disabled when zero
+        self._targetFps: float = targetFps
+        self._governor: CameraGovernor = None
+
+        # duration histograms for each step of the capture and display loops, readable from other processes
+        self._stageTimings: StageTimings = None
+        if stageTimings:
+            self._stageTimings = StageTimings(
+                ["capture", "frame read", "telemetry read", "zoom", "HUD", "show frame"]
+            )
+
+        # the feed is either shown in a window through X11 or streamed as MJPEG over HTTP
+        self._output: str = output
+        self._streamPort: int = streamPort
+        self._streamer: MjpegStreamer = None
+
+        # records the raw camera feed in the background when turned on by voice command
+        self._recorder: VideoRecorder = recorder
 
         # text on video properties
         self._colour: tuple = (0, 255, 0)
         self._textPositions: list = self._set_text_positions()
-        self._font = cv2.FONT_HERSHEY_SIMPLEX
         self._scale: int = 1
         self._thickness: int = 1
 
         self._zoomValue: float = 1.0
+        self._zoomEngine: ZoomEngine = ZoomEngine(resolution)
+        self._hardwareZoom: bool = False
         self._hudActive: bool = True
 
         self._carEnabled: bool = False
         self._servoEnabled: bool = False
 
         self._fps: float = 0.0
+        self._captureFps: float = 0.0
+        self._droppedFrames: int = 0
         self._fpsPos: tuple = (10, 30)
 
-        self._arrayDict: dict[str: int] = {
-            "HUD": 0,
-            "Zoom": 1
-        }
-        self._indexCounter: int = len(self._arrayDict)
+        self._hudOverlay: HudOverlay = None
+        self._frameBuffers: FrameBufferPool = FrameBufferPool()
+
+        # local snapshot of the control values published by the command handling process
+        self._telemetryValues: TelemetryValues = TelemetryValues()
+        self._telemetryVersion: int = -1
+        self._hudTexts: dict[str: str] = {}
+
+    def capture_frames(self, shutdown, telemetry, frameRing, heartbeat=None) -> None:
+        self._setup_capture()
+        frameRing.hardware_zoom = self._hardwareZoom
+        frameRing.resume_writing()
+
+        while not shutdown.is_set():
+            # lets the supervisor know the capture hasn't stalled
+            if heartbeat:
+                heartbeat.beat()
+
+            tStart: float = time() # start timer for calculating capture fps
+            if self._stageTimings:
+                self._stageTimings.start()
+
+            # change the capture resolution when the display process asks for it
+            requestedResolution: tuple = frameRing.requested_resolution
+            if any(requestedResolution) and requestedResolution != (self._dispW, self._dispH):
+                self._set_capture_resolution(requestedResolution)
+
+            # let the camera crop the next frames if the zoom value has changed
+            if self._recorder or self._hardwareZoom:
+                self._read_telemetry(telemetry)
+            if self._hardwareZoom:
+                self._zoomEngine.set_zoom_value(self._zoomValue)
+
+            # copy the raw image straight from the source buffer to the display process,
+            # this never waits on the display
+            with self._frameSource.capture_frame() as frame:
+                frameRing.write(frame)
+
+                if self._recorder:
+                    self._record_frame(frame)
+
+            if self._stageTimings:
+                self._stageTimings.lap("capture")
 
-        self._number_to_directionValue: dict = {
-            0: "Stopped",
-            1: "Left",
-            2: "Right",
-            3: "Forward",
-            4: "Reverse"
-        }
+            self._captureFps = RobocarHelper.low_pass_filter(self._captureFps, 1 / (time() - tStart))
+            frameRing.capture_fps = self._captureFps
 
-    def show_camera_feed(self, flag, shared_array) -> None:
-        self._setup()
+    def show_camera_feed(self, shutdown, telemetry, frameRing, heartbeat=None) -> None:
+        self._setup_display()
 
-        while not flag.value:
-            tStart: float = time() # start timer for calculating fps
+        frameBuffer = self._frameBuffers.get("frame", (frameRing.slot_size,))
+        lastSeq: int = 0
+        tStart: float = time() # start timer for calculating fps
 
-            # get raw image
-            im = self._picam2.capture_array()
+        while not shutdown.is_set():
+            if heartbeat:
+                heartbeat.beat()
 
-            # flip image if specified by user
-            if self._rotation:
-                im = cv2.flip(im, -1)
+            if self._stageTimings:
+                self._stageTimings.start()
 
-            # set HUD active or inactive
-            self._set_HUD_active_value(shared_array)
+            # get the newest captured frame, stale frames are dropped
+            seq, im = frameRing.read_latest(frameBuffer, lastSeq)
+            if seq is None:
+                continue
 
-            # set zoom value
-            self._set_zoom_value(shared_array)
+            # includes the time spent waiting for the capture process
+            if self._stageTimings:
+                self._stageTimings.lap("frame read")
 
-            # resize image when zooming
-            if self._zoomValue != 1.0:
-                im = self._get_zoomed_image(im)
+            if lastSeq:
+                self._droppedFrames += seq - lastSeq - 1
+            lastSeq = seq
+
+            # text positions and zoom follow the resolution of the captured frames
+            if im.shape[:2] != (self._dispH, self._dispW):
+                self._set_display_resolution((im.shape[1], im.shape[0]))
+
+            # HUD text is only formatted again when new control values have been published
+            if self._read_telemetry(telemetry):
+                self._set_hud_texts()
+
+            if self._stageTimings:
+                self._stageTimings.lap("telemetry read")
+
+            # resize image when zooming, unless the camera already delivers zoomed frames
+            frame = im
+            if not frameRing.hardware_zoom:
+                frame = self._get_zoomed_image(im)
+
+            if self._stageTimings:
+                self._stageTimings.lap("zoom")
 
             # add fps and control values to cam feed
-            self._add_text_to_cam_feed(im, shared_array)
+            self._captureFps = frameRing.capture_fps
+            self._add_text_to_cam_feed(frame)
 
-            cv2.imshow("Camera", im)
-            cv2.waitKey(1)
+            if self._stageTimings:
+                self._stageTimings.lap("HUD")
+
+            self._show_frame(frame)
+
+            if self._stageTimings:
+                self._stageTimings.lap("show frame")
 
             # calculate fps
             self._calculate_fps(tStart)
+            tStart = time()
+
+            if self._governor:
+                newResolution: tuple = self._governor.update(self._fps)
+                if newResolution:
+                    frameRing.requested_resolution = newResolution
+
+            frameRing.allocations = self._frameBuffers.allocations
+
+    def check_if_source_available(self) -> None:
+        self._frameSource.check_if_available()
+
+    def cleanup_capture(self) -> None:
+        if self._recorder:
+            self._recorder.cleanup()
+
+        self._frameSource.close()
 
     def cleanup(self) -> None:
-        cv2.destroyAllWindows()
-        self._picam2.close()
+        print(f"Camera display fps: {self._fps:.1f}, capture fps: {self._captureFps:.1f}, "
+              f"dropped frames: {self._droppedFrames}, frame buffer allocations: {self._frameBuffers.allocations}")
+        if self._hudOverlay:
+            self._hudOverlay.print_stats()
+
+        if self._streamer:
+            print(f"Streamed frames: {self._streamer.encoded_frames}, "
+                  f"frames dropped for slow clients: {self._streamer.dropped_frames}")
+            self._streamer.stop()
+        else:
+            cv2.destroyAllWindows()
 
     def set_car_enabled(self) -> None:
         self._carEnabled = True
 
-        self._arrayDict.update({"speed": self._indexCounter, "direction": self._indexCounter + 1})
-        self._indexCounter += 2
-
     def set_servo_enabled(self) -> None:
         self._servoEnabled = True
 
-        self._arrayDict.update({"horizontal servo": self._indexCounter, "vertical servo": self._indexCounter + 1})
-        self._indexCounter += 2
+    @property
+    def stage_timings(self) -> StageTimings:
+        return self._stageTimings
+
+    @property
+    def output(self) -> str:
+        return self._output
 
     @property
-    def array_dict(self) -> dict[str: int]:
-        return self._arrayDict
+    def frame_shape(self) -> tuple:
+        return self._dispH, self._dispW, 3
+
+    def _setup_capture(self) -> None:
+        self._frameSource.start()
+
+        self._hardwareZoom = self._frameSource.use_hardware_zoom(self._zoomEngine)
+
+    def _record_frame(self, frame) -> None:
+        # start or stop recording when the recording value set by voice command changes
+        recordingActive: bool = self._telemetryValues.recording
+        if recordingActive != self._recorder.recording:
+            if recordingActive:
+                self._recorder.start(max(self._captureFps, 1.0))
+            else:
+                self._recorder.stop()
+
+        if recordingActive:
+            self._recorder.add_frame(frame)
+
+    def _set_capture_resolution(self, resolution: tuple) -> None:
+        self._dispW, self._dispH = resolution
+        self._frameSource.set_resolution(resolution)
+
+        # apply the current zoom again on the new configuration
+        self._zoomEngine.reset()
+
+    def _set_display_resolution(self, resolution: tuple) -> None:
+        self._dispW, self._dispH = resolution
 
-    def _setup(self) -> None:
-        self._picam2 = Picamera2()
+        self._textPositions = self._set_text_positions()
+        self._zoomEngine.set_frame_size(resolution)
+        self._hudOverlay = self._get_hud_overlay()
 
-        # set resolution, format and rotation of camera feed
-        config = self._picam2.create_preview_configuration(
-            {"size": (self._dispW, self._dispH), "format": "RGB888"}
-        )
-        self._picam2.configure(config)
-        self._picam2.start()
+    def _setup_display(self) -> None:
+        self._hudOverlay = self._get_hud_overlay()
+
+        if self._targetFps:
+            self._governor = CameraGovernor(self._targetFps, CameraGovernor.get_resolution_levels(self._maxResolution))
+
+        if self._output == "stream":
+            self._streamer = MjpegStreamer(self._streamPort)
+            self._streamer.start()
+
+    def _show_frame(self, frame) -> None:
+        if self._streamer:
+            self._streamer.publish_frame(frame)
+        else:
+            cv2.imshow("Camera", frame)
+            cv2.waitKey(1)
+
+    def _get_hud_overlay(self) -> HudOverlay:
+        hudOverlay = HudOverlay(self._dispW, cv2.FONT_HERSHEY_SIMPLEX, self._scale, self._thickness, self._colour)
+
+        # every text line gets its own tile that is only re-rendered when its text changes
+        hudOverlay.add_line("fps", self._fpsPos)
+        for count, name in enumerate(self._get_hud_line_names()):
+            hudOverlay.add_line(name, self._get_origin(count))
+
+        return hudOverlay
+
+    def _get_hud_line_names(self) -> list[str]:
+        names: list = ["zoom"]
+        if self._servoEnabled:
+            names.append("angle")
+        if self._carEnabled:
+            names.extend(["speed", "direction"])
+
+        return names
 
     def _set_text_positions(self) -> list[tuple]:
         spacingVertical: int = 30
@@ -125,63 +302,51 @@ class Camera:
 
         self._fps = RobocarHelper.low_pass_filter(self._fps, (1 / loopTime))
 
-    def _get_zoomed_image(self, image) -> None:
-        halfZoomDisplayWidth = int(self._dispW / (2 * self._zoomValue))
-        halfZoomDisplayHeight = int(self._dispH / (2 * self._zoomValue))
-
-        regionOfInterest = image[self._centerY - halfZoomDisplayHeight:self._centerY + halfZoomDisplayHeight,
-                           self._centerX - halfZoomDisplayWidth:self._centerX + halfZoomDisplayWidth]
+    def _get_zoomed_image(self, image):
+        self._zoomEngine.set_zoom_value(self._zoomValue)
+        if self._zoomValue == 1.0:
+            return image
 
-        im = cv2.resize(regionOfInterest, (self._dispW, self._dispH), cv2.INTER_LINEAR)
+        # resize into a buffer that is reused for every zoomed frame
+        zoomBuffer = self._frameBuffers.get("zoom", image.shape)
+        zoomedImage = self._zoomEngine.get_zoomed_image(image, zoomBuffer)
 
-        return im
+        return self._frameBuffers.check("zoom", zoomedImage)
 
-    def _add_text_to_cam_feed(self, image, shared_array) -> None:
+    def _add_text_to_cam_feed(self, image) -> None:
         # display fps
-        cv2.putText(image, self._get_fps_text(), self._fpsPos, self._font, self._scale, self._colour,
-                    self._thickness)
+        self._hudOverlay.draw(image, "fps", self._get_fps_text())
 
         # add external control values if HUD is enabled
         if self._hudActive:
-            counter: int = 0
-            cv2.putText(image, f"Zoom: {self._zoomValue}x", self._get_origin(counter), self._font, self._scale,
-                        self._colour,
-                        self._thickness)
-            counter += 1
-
-            if self._servoEnabled:
-                horizontalAngleValue = int(shared_array[self._arrayDict["horizontal servo"]])
-                verticalAngleValue = int(shared_array[self._arrayDict["vertical servo"]])
-
-                angleText: str = f"Angle: H{horizontalAngleValue}/V{verticalAngleValue}"
-                cv2.putText(image, angleText, self._get_origin(counter), self._font, self._scale, self._colour,
-                            self._thickness)
-                counter += 1
-
-            if self._carEnabled:
-                speedValue = int(shared_array[self._arrayDict["speed"]])
-                speedText: str = f"Speed: {speedValue}%"
-                cv2.putText(image, speedText, self._get_origin(counter), self._font, self._scale, self._colour,
-                            self._thickness)
-                counter += 1
-
-                directionValue: str = self._get_direction_value(shared_array[self._arrayDict["direction"]])
-                directionText: str = f"Direction: {directionValue}"
-                cv2.putText(image, directionText, self._get_origin(counter), self._font, self._scale, self._colour,
-                            self._thickness)
-                counter += 1
+            for name, text in self._hudTexts.items():
+                self._hudOverlay.draw(image, name, text)
+
+    def _set_hud_texts(self) -> None:
+        values: TelemetryValues = self._telemetryValues
+        self._hudTexts = {"zoom": f"Zoom: {self._zoomValue}x"}
+
+        if self._servoEnabled:
+            self._hudTexts["angle"] = f"Angle: H{values.horizontalAngle}/V{values.verticalAngle}"
+
+        if self._carEnabled:
+            self._hudTexts["speed"] = f"Speed: {values.speed}%"
+            self._hudTexts["direction"] = f"Direction: {Direction(values.direction).label}"
 
     def _get_fps_text(self) -> str:
-        return str(int(self._fps)) + " FPS"
+        return str(int(self._fps)) + " FPS (capture " + str(int(self._captureFps)) + ")"
 
-    def _set_HUD_active_value(self, shared_array) -> None:
-        self._hudActive = shared_array[self._arrayDict["HUD"]]
+    def _read_telemetry(self, telemetry) -> bool:
+        # returns True when new values were published since the last read, the read itself never locks
+        version: int = telemetry.read(self._telemetryValues, self._telemetryVersion)
+        if version == self._telemetryVersion:
+            return False
 
-    def _set_zoom_value(self, shared_array) -> None:
-        self._zoomValue = shared_array[self._arrayDict["Zoom"]]
+        self._telemetryVersion = version
+        self._hudActive = self._telemetryValues.hudActive
+        self._zoomValue = self._telemetryValues.zoom
 
-    def _get_direction_value(self, number: int) -> str:
-        return self._number_to_directionValue[number]
+        return True
 
     def _get_origin(self, count: int) -> tuple:
         return self._textPositions[count]
\ No newline at end of file
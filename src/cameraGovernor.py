@@ -0,0 +1,84 @@
+from time import monotonic
+
+
+class CameraGovernor:
+    def __init__(self, targetFps: float, resolutions: list[tuple], holdTime: float = 2.0, settleTime: float = 3.0,
+                 lowerMargin: float = 0.9, upperMargin: float = 1.2):
+        self._targetFps: float = targetFps
+
+        # ordered from the highest to the lowest resolution
+        self._resolutions: list[tuple] = resolutions
+        self._level: int = 0
+
+        # hysteresis: fps must stay outside the margins for holdTime before stepping, and no decision is
+        # made until the fps has had settleTime to adjust to the previous step
+        self._holdTime: float = holdTime
+        self._settleTime: float = settleTime
+        self._lowerMargin: float = lowerMargin
+        self._upperMargin: float = upperMargin
+
+        self._outsideMarginSince: float = None
+        self._lastStepTime: float = monotonic()
+        self._fpsBeforeStep: float = None
+
+    @staticmethod
+    def get_resolution_levels(resolution: tuple, scales: tuple = (1.0, 0.75, 0.5)) -> list[tuple]:
+        width, height = resolution
+
+        # keep dimensions even since the camera can't deliver odd sized frames
+        return [(int(width * scale) // 2 * 2, int(height * scale) // 2 * 2) for scale in scales]
+
+    @property
+    def resolution(self) -> tuple:
+        return self._resolutions[self._level]
+
+    def update(self, fps: float) -> tuple:
+        # returns the new resolution when stepping up or down, otherwise None
+        now: float = monotonic()
+        if now - self._lastStepTime < self._settleTime:
+            return None
+
+        if self._fpsBeforeStep is not None:
+            print(f"Camera governor: {self._fpsBeforeStep:.1f} FPS before and {fps:.1f} FPS after "
+                  f"changing resolution to {self._format_resolution(self.resolution)}")
+            self._fpsBeforeStep = None
+
+        newLevel: int = self._get_wanted_level(fps)
+        if newLevel == self._level:
+            self._outsideMarginSince = None
+            return None
+
+        if self._outsideMarginSince is None:
+            self._outsideMarginSince = now
+        if now - self._outsideMarginSince < self._holdTime:
+            return None
+
+        print(f"Camera governor: {fps:.1f} FPS with target {self._targetFps:.1f} FPS, changing resolution from "
+              f"{self._format_resolution(self.resolution)} to {self._format_resolution(self._resolutions[newLevel])}")
+
+        self._level = newLevel
+        self._fpsBeforeStep = fps
+        self._lastStepTime = now
+        self._outsideMarginSince = None
+
+        return self.resolution
+
+    def _get_wanted_level(self, fps: float) -> int:
+        # step down when the pi can't keep up
+        if fps < self._targetFps * self._lowerMargin and self._level < len(self._resolutions) - 1:
+            return self._level + 1
+
+        # step up only if the fps we expect at the higher resolution still leaves headroom
+        if self._level > 0:
+            expectedFps: float = fps * self._get_num_of_pixels(self._level) / self._get_num_of_pixels(self._level - 1)
+            if expectedFps > self._targetFps * self._upperMargin:
+                return self._level - 1
+
+        return self._level
+
+    def _get_num_of_pixels(self, level: int) -> int:
+        width, height = self._resolutions[level]
+        return width * height
+
+    def _format_resolution(self, resolution: tuple) -> str:
+        return f"{resolution[0]}x{resolution[1]}"
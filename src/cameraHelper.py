@@ -1,11 +1,13 @@
-from roboCarHelper import RobocarHelper
+from functools import partial
 from roboObject import RoboObject
+from commandGrammar import CommandTemplate
+from telemetry import Telemetry, TelemetryValues, Direction
 
 class CameraHelper(RoboObject):
     def __init__(self, userCommands: dict, maxZoomValue: float, zoomIncrement: float, car=None, servo=None):
         super().__init__(
             [],
-            {**userCommands["hudCommands"], **userCommands["zoomCommands"]},
+            {**userCommands["hudCommands"], **userCommands["zoomCommands"], **userCommands["recordingCommands"]},
             maxZoomValue=maxZoomValue,
             zoomIncrement=zoomIncrement
         )
@@ -24,14 +26,7 @@ class CameraHelper(RoboObject):
         self._maxZoomValue: float = maxZoomValue
 
         self._hudActive: bool = True
-
-        self._directionValue_to_number: dict = {
-            "Stopped": 0,
-            "Left": 1,
-            "Right": 2,
-            "Forward": 3,
-            "Reverse": 4
-        }
+        self._recording: bool = False
 
         self._userCommands: dict = userCommands
 
@@ -42,14 +37,26 @@ class CameraHelper(RoboObject):
         }
 
         zoomCommands: dict = userCommands["zoomCommands"]
-        self._zoomExactCommands: dict = self._set_zoom_commands(zoomCommands["zoomExactCommand"])
+        # two decimals so the zoom can be set more precisely than the zoom increment, e.g. "zoom 2.35"
+        self._zoomExactTemplate: CommandTemplate = CommandTemplate(
+            zoomCommands["zoomExactCommand"], self._minZoomValue, self._maxZoomValue, decimals=2
+        )
 
         self._zoomIncrementCommands: dict = {
             zoomCommands["zoomInCommand"]: {"description": "zooms in by the default increment value"},
             zoomCommands["zoomOutCommand"]: {"description": "zooms out by the default increment value"}
         }
 
-        self._arrayDict: dict[str: int] = None
+        recordingCommands: dict = userCommands["recordingCommands"]
+        self._recordingCommands: dict = {
+            recordingCommands["startRecordingCommand"]: {"description": "Starts recording the camera feed",
+                                                         "recordingValue": True},
+            recordingCommands["stopRecordingCommand"]: {"description": "Stops recording the camera feed",
+                                                        "recordingValue": False}
+        }
+
+        # the values are collected here and then published to the camera processes in one step
+        self._telemetryValues: TelemetryValues = TelemetryValues()
 
         # mainly for printing at startup
         self._variableCommands: dict[str: dict] = {
@@ -58,96 +65,100 @@ class CameraHelper(RoboObject):
             }
         }
 
-    def handle_voice_command(self, command: str) -> None:
-        print(command)
-        if command in self._hudCommands:
-            self._set_hud_value(command)
-        elif command in self._zoomExactCommands:
-            self._set_zoom_value(command)
-        elif command in self._zoomIncrementCommands:
-            self._increment_zoom_value(command)
+        self._commandDispatch: dict[str: tuple] = self._get_command_dispatch()
+        self._templateDispatch: list[tuple] = [
+            (self._zoomExactTemplate, "zoom", self._get_zoom_validity, self._set_zoom_value)
+        ]
+        self._register_commands()
 
     def print_commands(self) -> None:
         allDictsWithCommands: dict = {}
         allDictsWithCommands.update(self._hudCommands)
         allDictsWithCommands.update(self._zoomIncrementCommands)
         allDictsWithCommands.update(self._variableCommands)
+        allDictsWithCommands.update(self._recordingCommands)
         title: str = "Camera commands:"
 
         self._print_commands(title, allDictsWithCommands)
 
-    def get_command_validity(self, command: str) -> str:
-        if command in self._hudCommands: # check if display is already on or off
-            if self._hudActive == self._hudCommands[command]["hudValue"]:
-                return "partially valid"
-
-        elif command in self._zoomExactCommands:
-            if self._zoomValue == self._zoomExactCommands[command]: # check if zoom value is unchanged
-                return "partially valid"
-
-        elif command in self._zoomIncrementCommands:
-            if command == self._userCommands["zoomCommands"]["zoomOutCommand"]:
-                if (self._zoomValue - self._zoomIncrement) < self._minZoomValue:
-                    return "partially valid"
-            elif command == self._userCommands["zoomCommands"]["zoomInCommand"]:
-                if (self._zoomValue + self._zoomIncrement) > self._maxZoomValue:
-                    return "partially valid"
-
-        return "valid"
-
     def add_car(self, car) -> None:
         self._car = car
 
     def add_servo(self, servo) -> None:
         self._servo = servo
 
-    def update_control_values_for_video_feed(self, shared_array) -> None:
+    def update_control_values_for_video_feed(self, telemetry: Telemetry) -> None:
+        values: TelemetryValues = self._telemetryValues
+
         if self._servo:
-            shared_array[self._arrayDict["horizontal servo"]] = self._servo.get_current_servo_angle("horizontal")
-            shared_array[self._arrayDict["vertical servo"]] = self._servo.get_current_servo_angle("vertical")
+            values.horizontalAngle = int(self._servo.get_current_servo_angle("horizontal"))
+            values.verticalAngle = int(self._servo.get_current_servo_angle("vertical"))
 
         if self._car:
-            shared_array[self._arrayDict["speed"]] = self._car.current_speed
-            shared_array[self._arrayDict["direction"]] = self._directionValue_to_number[self._car.current_turn_value]
+            values.speed = int(self._car.current_speed)
+            values.direction = Direction.from_label(self._car.current_turn_value)
+
+        values.hudActive = self._hudActive
+        values.zoom = self._zoomValue
+        values.recording = self._recording
+
+        telemetry.publish(values)
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
+
+    def get_template_dispatch(self) -> list[tuple]:
+        return self._templateDispatch
+
+    def _get_command_dispatch(self) -> dict[str: tuple]:
+        commandDispatch: dict[str: tuple] = {}
+        for command, values in self._hudCommands.items():
+            commandDispatch[command] = ("hud",
+                                        partial(self._get_hud_validity, values["hudValue"]),
+                                        partial(self._set_hud_value, values["hudValue"]))
+
+        for command, values in self._recordingCommands.items():
+            commandDispatch[command] = ("recording",
+                                        partial(self._get_recording_validity, values["recordingValue"]),
+                                        partial(self._set_recording_value, values["recordingValue"]))
 
-        shared_array[self._arrayDict["HUD"]] = float(self._hudActive)
-        shared_array[self._arrayDict["Zoom"]] = self._zoomValue
+        # zoom steps have no channel, so "zoom in and zoom in" zooms in twice
+        zoomCommands: dict = self._userCommands["zoomCommands"]
+        for command, zoomIncrement in [(zoomCommands["zoomInCommand"], self._zoomIncrement),
+                                       (zoomCommands["zoomOutCommand"], -self._zoomIncrement)]:
+            commandDispatch[command] = (None,
+                                        partial(self._get_zoom_increment_validity, zoomIncrement),
+                                        partial(self._increment_zoom_value, zoomIncrement))
 
-    def get_voice_commands(self) -> list:
-        return RobocarHelper.chain_together_dict_keys([
-            self._hudCommands,
-            self._zoomExactCommands,
-            self._zoomIncrementCommands
-        ])
+        return commandDispatch
 
-    def set_array_dict(self, arrayDict: dict[str: int]) -> None:
-        self._arrayDict = arrayDict
+    def _get_hud_validity(self, hudValue: bool) -> str:
+        # check if display is already on or off
+        return "partially valid" if self._hudActive == hudValue else "valid"
 
-    def _set_hud_value(self, command: str) -> None:
-        self._hudActive = self._hudCommands[command]["hudValue"]
+    def _get_recording_validity(self, recordingValue: bool) -> str:
+        # check if recording is already started or stopped
+        return "partially valid" if self._recording == recordingValue else "valid"
 
-    def _set_zoom_value(self, command: str) -> None:
-        self._zoomValue = self._zoomExactCommands[command]
+    def _get_zoom_increment_validity(self, zoomIncrement: float) -> str:
+        newZoomValue: float = self._zoomValue + zoomIncrement
+        return "partially valid" if newZoomValue < self._minZoomValue or newZoomValue > self._maxZoomValue else "valid"
 
-    def _increment_zoom_value(self, command: str) -> None:
-        if command == self._userCommands["zoomCommands"]["zoomOutCommand"]:
-            self._zoomValue -= self._zoomIncrement
-        elif command == self._userCommands["zoomCommands"]["zoomInCommand"]:
-            self._zoomValue += self._zoomIncrement
+    def _get_zoom_validity(self, zoomValue: float) -> str:
+        # check if zoom value is unchanged
+        return "partially valid" if self._zoomValue == zoomValue else "valid"
 
-        self._zoomValue = round(self._zoomValue, 1) # round to nearest decimal to avoid rounding errors on camera feed
+    def _set_hud_value(self, hudValue: bool) -> None:
+        self._hudActive = hudValue
 
-    def _set_zoom_commands(self, userCommand: str) -> dict:
-        zoomValue: float = self._minZoomValue
-        stepValue: float = 0.1
-        zoomCommands: dict = {}
-        while zoomValue <= (self._maxZoomValue + stepValue):
-            command: str = self._format_command(userCommand, str(round(zoomValue, 1)))
-            zoomCommands[command] = round(zoomValue, 1) # round zoomValue to avoid floating numbers with many decimals
+    def _set_recording_value(self, recordingValue: bool) -> None:
+        self._recording = recordingValue
 
-            zoomValue += stepValue
+    def _set_zoom_value(self, zoomValue: float) -> None:
+        self._zoomValue = zoomValue
 
-        return zoomCommands
+    def _increment_zoom_value(self, zoomIncrement: float) -> None:
+        self._zoomValue = round(self._zoomValue + zoomIncrement, 2) # round to avoid rounding errors on camera feed
 
     def _check_argument_validity(self, pins: list, userCommands: dict, **kwargs) -> None:
         super()._check_argument_validity(pins, userCommands, **kwargs)
@@ -1,7 +1,8 @@
 from servo import Servo
 from roboObject import RoboObject
-from roboCarHelper import RobocarHelper
-from servo import Servo
+from functools import partial
+from commandGrammar import CommandTemplate
+from commandTrace import CommandTrace
 
 class CameraServoHandling(RoboObject):
     def __init__(self, horizontalServo: Servo, verticalServo: Servo, minAngles: list[int], maxAngles: list[int], userCommands: dict):
@@ -60,10 +61,6 @@ class CameraServoHandling(RoboObject):
         }
 
         variableAngleCommands: dict = userCommands["exactAngleCommands"]
-        exactAngleCommands: dict = self._get_exact_angle_commands(variableAngleCommands)
-
-        self._angleCommands: dict = {**self._lookOffsetCommands, **exactAngleCommands}
-
         # mainly for printing at startup
         self._variableCommands: dict = {
             variableAngleCommands["lookRightExact"].replace("param", "angle"): {
@@ -80,20 +77,16 @@ class CameraServoHandling(RoboObject):
             }
         }
 
+        self._commandDispatch: dict[str: tuple] = self._get_command_dispatch()
+        self._templateDispatch: list[tuple] = self._get_template_dispatch(variableAngleCommands)
+        self._register_commands()
+
     def setup(self) -> None:
         for servo in list(self._servos.values()):
             servo.setup()
 
         self._center_servo_positions()
 
-    def handle_voice_command(self, command: str) -> None:
-        if command in self._angleCommands:
-            self._move_servo(self._angleCommands[command]["plane"],
-                             self._angleCommands[command]["angle"]
-                             )
-        elif command in self._lookCenterCommand:
-            self._center_servo_positions()
-
     def get_current_servo_angle(self, plane) -> int:
         return self._servos[plane].current_angle
 
@@ -111,22 +104,11 @@ class CameraServoHandling(RoboObject):
 
         self._print_commands(title, allDictsWithCommands)
 
-    def get_voice_commands(self) -> list[str]:
-        return RobocarHelper.chain_together_dict_keys([self._angleCommands,self._lookCenterCommand])
-
-    def get_command_validity(self, command: str) -> str:
-        # check if angles stay unchanged
-        if command in self._angleCommands:
-            plane = self._angleCommands[command]["plane"]
-
-            if self._servos[plane].current_angle == self._angleCommands[command]["angle"]:
-                return "partially valid"
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
 
-        elif command in self._lookCenterCommand:
-            if self._servos["horizontal"].current_angle == self._neutralAngle and self._servos["vertical"].get_current_angle() == self._neutralAngle:
-                return "partially valid"
-
-        return "valid"
+    def get_template_dispatch(self) -> list[tuple]:
+        return self._templateDispatch
 
     def _center_servo_positions(self) -> None:
         for plane in list(self._servos.keys()):
@@ -134,55 +116,52 @@ class CameraServoHandling(RoboObject):
 
     def _move_servo(self, plane, angle) -> None:
         self._servos[plane].move_to_angle(angle)
+        CommandTrace.mark_active("servo write")
+
+    def _get_command_dispatch(self) -> dict[str: tuple]:
+        commandDispatch: dict[str: tuple] = {
+            command: (values["plane"],
+                      partial(self._get_angle_validity, values["plane"], values["angle"]),
+                      partial(self._move_servo, values["plane"], values["angle"]))
+            for command, values in self._lookOffsetCommands.items()
+        }
 
-    def _get_exact_angle_commands(self, userCommands: dict) -> dict:
-        exactAngleCommands: dict = {}
+        for command in self._lookCenterCommand:
+            commandDispatch[command] = ("center", self._get_center_validity, self._center_servo_positions)
 
-        # looking right commands
-        plane: str = "horizontal"
-        angleRange: range = range(self._minAngles[plane], 0)
-        command: str = userCommands["lookRightExact"]
-        exactAngleCommands.update(
-            self._get_angle_commands_for_given_direction(angleRange, command, plane)
-        )
+        return commandDispatch
 
-        # looking left commands
-        plane: str = "horizontal"
-        angleRange: range = range(1, self._maxAngles[plane] + 1)
-        command: str = userCommands["lookLeftExact"]
-        exactAngleCommands.update(
-            self._get_angle_commands_for_given_direction(angleRange, command, plane)
-        )
+    def _get_template_dispatch(self, userCommands: dict) -> list[tuple]:
+        # the user always says a positive angle, looking right or down turns to a negative angle
+        templates: list[tuple] = [
+            (CommandTemplate(userCommands["lookRightExact"], 1, abs(self._minAngles["horizontal"])), "horizontal", -1),
+            (CommandTemplate(userCommands["lookLeftExact"], 1, self._maxAngles["horizontal"]), "horizontal", 1),
+            (CommandTemplate(userCommands["lookDownExact"], 1, abs(self._minAngles["vertical"])), "vertical", -1),
+            (CommandTemplate(userCommands["lookUpExact"], 1, self._maxAngles["vertical"]), "vertical", 1)
+        ]
 
-        # looking down commands
-        plane: str = "vertical"
-        angleRange: range = range(self._minAngles[plane], 0)
-        command: str = userCommands["lookDownExact"]
-        exactAngleCommands.update(
-            self._get_angle_commands_for_given_direction(angleRange, command, plane)
-        )
+        return [
+            (template, plane, partial(self._get_exact_angle_validity, plane, sign),
+             partial(self._move_servo_exact, plane, sign))
+            for template, plane, sign in templates
+        ]
 
-        # looking up commands
-        plane: str = "vertical"
-        angleRange: range = range(1, self._maxAngles[plane] + 1)
-        command: str = userCommands["lookUpExact"]
-        exactAngleCommands.update(
-            self._get_angle_commands_for_given_direction(angleRange, command, plane)
-        )
+    def _get_angle_validity(self, plane: str, angle: int) -> str:
+        # check if angle stays unchanged
+        return "partially valid" if self._servos[plane].current_angle == angle else "valid"
 
-        return exactAngleCommands
+    def _get_exact_angle_validity(self, plane: str, sign: int, angle: int) -> str:
+        return self._get_angle_validity(plane, sign * angle)
 
-    def _get_angle_commands_for_given_direction(self, range, command, plane) -> dict:
-        exactAngleCommands: dict = {}
+    def _get_center_validity(self) -> str:
+        for servo in self._servos.values():
+            if servo.current_angle != self._neutralAngle:
+                return "valid"
 
-        for angle in range:
-            userCommand: str = self._format_command(command, str(abs(angle))) # take the absolute value, because the user will always say a positive value
-            exactAngleCommands[userCommand] = {
-                "plane": plane,
-                "angle": angle
-            }
+        return "partially valid"
 
-        return exactAngleCommands
+    def _move_servo_exact(self, plane: str, sign: int, angle: int) -> None:
+        self._move_servo(plane, sign * angle)
 
     def _check_argument_validity(self, pins: list, userCommands: dict, **kwargs) -> None:
         super()._check_argument_validity(pins, userCommands, **kwargs)
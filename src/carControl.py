@@ -1,110 +1,149 @@
+import signal
 import subprocess
-from multiprocessing import Process, Array, Value
-import RPi.GPIO as GPIO
 from time import sleep
 from camera import Camera
+from frameRing import FrameRing
+from telemetry import Telemetry
+from shutdownCoordinator import ShutdownCoordinator
+from processSupervisor import ProcessSupervisor
 from commandHandler import CommandHandler
 from audioHandler import AudioHandler
+from roboCarHelper import RobocarHelper
 from exceptions import X11ForwardingException
 
-class CarControl:
-    def __init__(self, camera, commandHandler, audioHandler):
-        self._check_if_X11_connected()
+GPIO = RobocarHelper.lazy_import("RPi.GPIO")
 
+class CarControl:
+    def __init__(self, camera, commandHandler, audioHandler, shutdown, supervisor):
         self._camera: Camera = camera
+
         self._commandHandler: CommandHandler = commandHandler
         self._audioHandler: AudioHandler = audioHandler
 
-        self._processes: list = []
+        # control values shown on the camera feed, written by the command handling process
+        self.telemetry: Telemetry = Telemetry()
+
+        # tells every process to stop and wakes up the command handler blocked on its queue
+        self._shutdown: ShutdownCoordinator = shutdown
+        self._shutdown.add_queue(self._commandHandler.queue)
 
-        self.shared_array = self._get_shared_array(self._camera.array_dict)
+        # restarts the worker processes when they die or stop sending heartbeats
+        self._supervisor: ProcessSupervisor = supervisor
 
-        self.shared_flag = Value('b', False)
+        # frames are handed from the capture process to the display process through shared memory
+        self._frameRing: FrameRing = FrameRing(self._camera.frame_shape)
 
     def start(self) -> None:
         # start processes
         self._activate_camera()
         self._activate_voice_command_handling()
+        self._supervisor.start()
 
         # running this in main thread since I've had issues with running the audio handler in subprocesses
         try:
-            self._audioHandler.set_audio_command(self.shared_flag)
+            self._audioHandler.set_audio_command(self._shutdown)
         except KeyboardInterrupt:
-            self.shared_flag.value = True  # set event to stop all active processes
+            self._shutdown.request("keyboard interrupt")  # stop all active processes
         finally:
             # allow all processes to finish
             self._cleanup()
             print("finished!")
 
     def _cleanup(self) -> None:
-        # close all processes
-        for process in self._processes:
-            process.join()
+        # also covers the audio handler returning without an exit command
+        self._shutdown.request("audio handler stopped")
 
-    def _get_shared_array(self, shared_array_dict) -> Array:
-        # initialize the array list with the same size as the dict that corresponds to the array
-        arrayList: list = [0.0] * len(shared_array_dict.keys())
+        # close all processes, the ones that don't finish in time are terminated
+        self._supervisor.stop()
+        self._shutdown.join_processes(self._supervisor.processes)
+        self._shutdown.print_stop_time()
+        self._supervisor.print_stats()
 
-        # zoom and hud should be initialized to 1.0
-        arrayList[shared_array_dict["HUD"]] = 1.0
-        arrayList[shared_array_dict["Zoom"]] = 1.0
+        self._frameRing.close()
+        self._frameRing.unlink()
 
-        return Array('d', arrayList)
+        # the camera processes write their stage timings to shared memory, so they can be read from here
+        if self._camera.stage_timings:
+            self._camera.stage_timings.print_summary()
 
     def _activate_camera(self) -> None:
-        process = Process(target=self._start_camera, args=(self.shared_array, self.shared_flag))
-        self._processes.append(process)
-        process.start()
+        # capture and display run in separate processes so a slow display never stalls the capture
+        # the camera processes never touch the GPIO pins, so restarting them leaves the car as it is
+        self._supervisor.add_worker(
+            "camera capture",
+            self._start_camera_capture,
+            (self.telemetry, self._shutdown, self._frameRing)
+        )
+        self._supervisor.add_worker(
+            "camera display",
+            self._start_camera,
+            (self.telemetry, self._shutdown, self._frameRing)
+        )
 
     def _activate_voice_command_handling(self) -> None:
-        process = Process(
-            target=self._GPIO_Process,
-            args=(self._start_listening_for_voice_commands, self.shared_flag, self.shared_array)
+        # the motors are stopped from the main process before the command process is restarted
+        self._supervisor.add_worker(
+            "command handler",
+            self._GPIO_Process,
+            (self._start_listening_for_voice_commands, self._shutdown, self.telemetry),
+            onFailure=self._commandHandler.stop_car_after_crash
         )
-        self._processes.append(process)
-        process.start()
 
     def _GPIO_Process(self, func, *args) -> None:
         GPIO.setmode(GPIO.BOARD) # set GPIO mode as BOARD for all classes using GPIO pins
         GPIO.setwarnings(False) # disable GPIO warnings
-        func(*args) # call parameter method
-        GPIO.cleanup() # cleanup all classes using GPIO pins
+        # terminating the process on a missed deadline or a stalled heartbeat still runs the cleanup,
+        # so the motors stop
+        signal.signal(signal.SIGTERM, self._exit_process)
+        try:
+            func(*args) # call parameter method
+        finally:
+            GPIO.cleanup() # cleanup all classes using GPIO pins
 
-    def _start_listening_for_voice_commands(self, flag, shared_array) -> None:
+    def _start_listening_for_voice_commands(self, shutdown, telemetry, heartbeat) -> None:
         self._commandHandler.print_start_up_message()
         try:
-            self._commandHandler.execute_commands(flag, shared_array)
+            self._commandHandler.execute_commands(shutdown, telemetry, heartbeat)
         except KeyboardInterrupt:
-            flag.value = True
+            shutdown.request("keyboard interrupt")
         finally:
-            self._commandHandler.cleanup()
+            self._commandHandler.cleanup(shutdown)
 
-    def _start_camera(self, shared_array, flag) -> None:
+    def _start_camera_capture(self, telemetry, shutdown, frameRing, heartbeat) -> None:
         try:
-            self._camera.show_camera_feed(flag, shared_array)
+            self._camera.capture_frames(shutdown, telemetry, frameRing, heartbeat)
         except KeyboardInterrupt:
-            flag.value = True
+            shutdown.request("keyboard interrupt")
+        finally:
+            self._camera.cleanup_capture()
+
+    def _start_camera(self, telemetry, shutdown, frameRing, heartbeat) -> None:
+        try:
+            self._camera.show_camera_feed(shutdown, telemetry, frameRing, heartbeat)
+        except KeyboardInterrupt:
+            shutdown.request("keyboard interrupt")
         finally:
             self._camera.cleanup()
 
-    def _check_if_X11_connected(self) -> None:
+    def _exit_process(self, signalNumber, frame) -> None:
+        raise SystemExit
+
+    @staticmethod
+    def check_if_X11_connected() -> None:
         treshold: int = 5
         numOfTries: int = 0
         sleepTime: int = 5
-        try:
-            while numOfTries < treshold:
-                result = subprocess.run(["xset", "q"], capture_output=True, text=True)
-                returnCode: int = result.returncode
-                numOfTries += 1
-                if not returnCode:
-                    print("Succesful connection to forwarded X11 server\n")
-                    return
-                else:
-                    print(f"Failed to connect to X11 server. Trying again in {sleepTime} seconds...\n"
-                          f"Number of retries: {treshold - numOfTries}\n")
-                    sleep(sleepTime)
-        except KeyboardInterrupt:
-            raise X11ForwardingException("User aborted connecting to forwarded X11 server")
+        while numOfTries < treshold:
+            result = subprocess.run(["xset", "q"], capture_output=True, text=True)
+            returnCode: int = result.returncode
+            numOfTries += 1
+            if not returnCode:
+                print("Succesful connection to forwarded X11 server\n")
+                return
+            else:
+                print(f"Failed to connect to X11 server. Trying again in {sleepTime} seconds...\n"
+                      f"Number of retries: {treshold - numOfTries}\n")
+                sleep(sleepTime)
 
         raise X11ForwardingException("X11 forwarding not detected.")
 
@@ -1,6 +1,8 @@
-from roboCarHelper import RobocarHelper
+from functools import partial
 from roboObject import RoboObject
 from motorDriver import MotorDriver
+from commandGrammar import CommandTemplate
+from commandTrace import CommandTrace
 
 
 class CarHandling(RoboObject):
@@ -52,7 +54,9 @@ class CarHandling(RoboObject):
                                                     "commandDescription": "decreaseSpeedCommand"}
         }
 
-        self._exact_speed_commands: dict = self._set_exact_speed_commands(speedCommands["exactSpeedCommand"])
+        self._exactSpeedTemplate: CommandTemplate = CommandTemplate(
+            speedCommands["exactSpeedCommand"], self._pwmMinTT, self._pwmMaxTT
+        )
 
         # mainly for printing at startup
         self._variableCommands: dict[str: dict] = {
@@ -61,15 +65,23 @@ class CarHandling(RoboObject):
             }
         }
 
+        self._directionActions: dict[str: object] = {
+            "Forward": self._motorDriver.drive,
+            "Reverse": self._motorDriver.reverse,
+            "Left": self._motorDriver.turn_left,
+            "Right": self._motorDriver.turn_right,
+            "Stopped": self._motorDriver.stop
+        }
+
+        self._commandDispatch: dict[str: tuple] = self._get_command_dispatch()
+        self._templateDispatch: list[tuple] = [
+            (self._exactSpeedTemplate, "speed", self._get_exact_speed_validity, self._set_speed)
+        ]
+        self._register_commands()
+
     def setup(self) -> None:
         self._motorDriver.setup(self._speed)
 
-    def handle_voice_command(self, command: str) -> None:
-        if command in self._direction_commands:
-            self._adjust_direction(self._direction_commands[command]["direction"])
-        elif command in self._speed_commands or command in self._exact_speed_commands:
-            self._adjust_speed(command)
-
     def print_commands(self) -> None:
         allDictsWithCommands: dict = {}
         allDictsWithCommands.update(self._direction_commands)
@@ -79,35 +91,21 @@ class CarHandling(RoboObject):
 
         self._print_commands(title, allDictsWithCommands)
 
-    def get_command_validity(self, command: str) -> str:
-        # check if direction remains unchanged
-        if command in self._direction_commands:
-            if self._direction == self._direction_commands[command]["direction"]:
-                return "partially valid"
-
-        # check if speed remains unchanged
-        elif command in self._exact_speed_commands:
-            if self._speed == self._exact_speed_commands[command]:
-                return "partially valid"
+    def cleanup(self) -> None:
+        self._motorDriver.cleanup()
 
-        # check if new speed increase/decrease is within valid range
-        elif command in self._speed_commands:
-            if command == self._userCommands["speed"]["increaseSpeedCommand"]:
-                if (self._speed + self._speedStep) > self._pwmMaxTT:
-                    return "partially valid"
-            elif command == self._userCommands["speed"]["decreaseSpeedCommand"]:
-                if (self._speed - self._speedStep) < self._pwmMinTT:
-                    return "partially valid"
+    def force_stop(self) -> None:
+        self._motorDriver.force_stop()
 
-        return "valid"
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
 
-    def cleanup(self) -> None:
-        self._motorDriver.cleanup()
+    def get_template_dispatch(self) -> list[tuple]:
+        return self._templateDispatch
 
-    def get_voice_commands(self) -> list[str]:
-        return RobocarHelper.chain_together_dict_keys([self._direction_commands,
-                                                       self._speed_commands,
-                                                       self._exact_speed_commands])
+    @property
+    def stop_command(self) -> str:
+        return self._userCommands["direction"]["stopCommand"]
 
     @property
     def current_speed(self) -> int:
@@ -117,51 +115,57 @@ class CarHandling(RoboObject):
     def current_turn_value(self) -> str:
         return self._direction
 
-    def _set_exact_speed_commands(self, userCommand: str) -> dict:
-        speedCommands: dict = {}
-        for speed in range(self._pwmMinTT, self._pwmMaxTT + 1):
-            command = self._format_command(userCommand, str(speed))
-            speedCommands[command] = speed
-
-        return speedCommands
-
     def _adjust_direction_value(self, direction: str) -> None:
         self._direction = direction
 
-    def _adjust_speed(self, command: str) -> None:
-        adjustSpeed: bool = False
-
-        if command == self._userCommands["speed"]["increaseSpeedCommand"]:
-            self._speed += self._speedStep
-            adjustSpeed = True
-        elif command == self._userCommands["speed"]["decreaseSpeedCommand"]:
-            self._speed -= self._speedStep
-            adjustSpeed = True
-        else:
-            newSpeed = self._exact_speed_commands[command]
-            if newSpeed != self._speed:
-                adjustSpeed = True
-                self._speed = newSpeed
-
-        if adjustSpeed:
+    def _get_command_dispatch(self) -> dict[str: tuple]:
+        commandDispatch: dict[str: tuple] = {
+            command: ("direction",
+                      partial(self._get_direction_validity, values["direction"]),
+                      partial(self._adjust_direction, values["direction"]))
+            for command, values in self._direction_commands.items()
+        }
+
+        # speed steps have no channel, so "go faster and go faster" steps up twice
+        speedCommands: dict[str: str] = self._userCommands["speed"]
+        for command, speedStep in [(speedCommands["increaseSpeedCommand"], self._speedStep),
+                                   (speedCommands["decreaseSpeedCommand"], -self._speedStep)]:
+            commandDispatch[command] = (None,
+                                        partial(self._get_speed_step_validity, speedStep),
+                                        partial(self._step_speed, speedStep))
+
+        return commandDispatch
+
+    def _get_direction_validity(self, direction: str) -> str:
+        # check if direction remains unchanged
+        return "partially valid" if self._direction == direction else "valid"
+
+    def _get_speed_step_validity(self, speedStep: int) -> str:
+        # check if new speed increase/decrease is within valid range
+        newSpeed: int = self._speed + speedStep
+        return "partially valid" if newSpeed > self._pwmMaxTT or newSpeed < self._pwmMinTT else "valid"
+
+    def _get_exact_speed_validity(self, speed: int) -> str:
+        # check if speed remains unchanged
+        return "partially valid" if self._speed == speed else "valid"
+
+    def _step_speed(self, speedStep: int) -> None:
+        self._speed += speedStep
+        self._change_speed()
+
+    def _set_speed(self, speed: int) -> None:
+        if speed != self._speed:
+            self._speed = speed
             self._change_speed()
 
     def _change_speed(self) -> None:
         self._motorDriver.change_speed(self._speed)
+        CommandTrace.mark_active("motor write")
 
     def _adjust_direction(self, direction) -> None:
-        if direction == "Forward":
-            self._motorDriver.drive()
-        elif direction == "Reverse":
-            self._motorDriver.reverse()
-        elif direction == "Left":
-            self._motorDriver.turn_left()
-        elif direction == "Right":
-            self._motorDriver.turn_right()
-        elif direction == "Neutral":
-            self._motorDriver.neutral()
-        elif direction == "Stopped":
-            self._motorDriver.stop()
+        self._directionActions[direction]()
+
+        CommandTrace.mark_active("motor write")
 
         self._adjust_direction_value(direction)
 
@@ -0,0 +1,111 @@
+import re
+
+
+class CommandTemplate:
+    def __init__(self, template: str, minValue: float, maxValue: float, decimals: int = 0):
+        # a command with a {param} placeholder, e.g. "speed {param}", that matches numbers between
+        # minValue and maxValue with at most the given number of decimals
+        self._template: str = template
+        self._minValue: float = minValue
+        self._maxValue: float = maxValue
+        self._decimals: int = decimals
+
+        prefix, suffix = template.split("{param}")
+        numberPattern: str = r"\d+" if not decimals else rf"\d+(?:\.\d{{1,{decimals}}})?"
+        self._regex: str = re.escape(prefix) + f"({numberPattern})" + re.escape(suffix)
+        self._pattern = re.compile(self._regex)
+
+    @property
+    def template(self) -> str:
+        return self._template
+
+    @property
+    def regex(self) -> str:
+        return self._regex
+
+    def parse(self, command: str):
+        # returns the value in the command, or None when the command doesn't match or is out of range
+        match = self._pattern.fullmatch(command)
+        if not match:
+            return None
+
+        return self.convert(match.group(1))
+
+    def convert(self, text: str):
+        value = float(text) if self._decimals else int(text)
+        if value < self._minValue or value > self._maxValue:
+            return None
+
+        return value
+
+    def overlaps(self, other) -> bool:
+        # two templates overlap when a command matches both, when their ranges overlap one of the range ends
+        # is in the other range, so only the commands at the range ends have to be tried
+        rangeEnds: list[float] = [self._minValue, self._maxValue, other._minValue, other._maxValue]
+        for value in rangeEnds:
+            for decimals in {0, self._decimals, other._decimals}:
+                for template in (self, other):
+                    command: str = template.template.replace("{param}", f"{value:.{decimals}f}")
+                    if self.parse(command) is not None and other.parse(command) is not None:
+                        return True
+
+        return False
+
+
+class CommandGrammar:
+    def __init__(self):
+        # commands without parameters are looked up directly, the templates are compiled into one regex
+        self._commands: dict[str: object] = {}
+        self._templates: list[tuple] = []
+        self._pattern = None
+
+    def add_command(self, command: str, owner) -> None:
+        self._commands[command] = owner
+
+    def add_template(self, template: CommandTemplate, owner) -> None:
+        self._templates.append((template, owner))
+        self._pattern = None
+
+    def compile(self) -> None:
+        # every template gets its own named group, so the group that matched tells which template it was
+        alternatives: list[str] = [
+            f"(?P<t{index}>{template.regex})" for index, (template, _) in enumerate(self._templates)
+        ]
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def match(self, command: str):
+        # returns the object that handles the command, or None when no command or template matches
+        found: tuple = self.find(command)
+        return found[0] if found else None
+
+    def find(self, command: str) -> tuple:
+        # returns the owner and the arguments in the command, an empty tuple for commands without a parameter,
+        # or None when no command or template matches
+        owner = self._commands.get(command)
+        if owner is not None:
+            return owner, ()
+
+        if self._pattern is None:
+            if not self._templates:
+                return None
+            self.compile()
+
+        match = self._pattern.fullmatch(command)
+        if not match:
+            return None
+
+        template, owner = self._templates[int(match.lastgroup[1:])]
+        value = template.convert(match.group(match.lastindex + 1))
+        if value is None:
+            # the same template can be added again with another range, the regex only finds the first one
+            return self._find_in_range(command)
+
+        return owner, (value,)
+
+    def _find_in_range(self, command: str) -> tuple:
+        for template, owner in self._templates:
+            value = template.parse(command)
+            if value is not None:
+                return owner, (value,)
+
+        return None
@@ -1,8 +1,16 @@
-from multiprocessing import Queue
+from queue import Empty
+from time import monotonic
+from commandGrammar import CommandGrammar
+from fuzzyMatcher import FuzzyMatcher
+from commandTrace import CommandTrace
+from commandQueue import CommandQueue
+from commandRegistry import CommandRegistry
 from roboObject import RoboObject
+from exceptions import InvalidCommandException
 
 class CommandHandler:
-    def __init__(self, car, servo, cameraHelper, honk, signalLights, exitCommand):
+    def __init__(self, car, servo, cameraHelper, honk, signalLights, exitCommand, fuzzyMaxDistance: int = 0,
+                 commandSeparator: str = "and", traceLog=None, journal=None, macros=None):
         self._car = car
         self._servo = servo
         self._cameraHelper = cameraHelper
@@ -13,10 +21,30 @@ class CommandHandler:
             self._cameraHelper,
             self._honk
         ]
+
+        # macros run several commands one after another from one command, None turns this off
+        self._macros = macros
+        if self._macros:
+            self._roboObjects.append(self._macros)
+
         self._signalLights = signalLights
         self._exitCommand: str = exitCommand
 
-        self._commandToObjects: dict[str: object] = self._get_all_objects_mapped_to_commands()
+        # every command of the robo objects with its robo object, channel, validator and action, registered when
+        # the robo objects were created, so running a command is a lookup and two calls
+        self._commandRegistry: CommandRegistry = RoboObject.get_command_registry()
+        self._commandGrammar: CommandGrammar = self._commandRegistry.grammar
+
+        if self._commandRegistry.find(self._exitCommand):
+            raise InvalidCommandException(f"Exit command {self._exitCommand} is already used by another command")
+        # near misses from the speech recognizer are corrected instead of rejected, 0 turns this off
+        self._fuzzyMatcher: FuzzyMatcher = self._get_fuzzy_matcher(fuzzyMaxDistance) if fuzzyMaxDistance else None
+
+        # one utterance can hold several commands, like "go forward and look left"
+        self._commandSeparator: str = f" {commandSeparator} "
+
+        if self._macros:
+            self._check_macro_steps()
 
         self._commandValidityToSignalColor: dict = {
             "valid": "green",
@@ -24,10 +52,22 @@ class CommandHandler:
             "invalid": "red"
         }
 
-        self._queue = Queue()
+        # stop and exit skip the commands waiting in the queue
+        self._stopCommand: str = self._car.stop_command
+        _, _, self._stopAction = self._car.get_command_dispatch()[self._stopCommand]
+        self._queue: CommandQueue = CommandQueue({self._stopCommand, self._exitCommand})
+
+        # every command gets a trace with the time of each stage from speech to GPIO, None turns this off
+        self._traceLog = traceLog
+
+        # every command and its validity is appended to the journal, None turns this off
+        self._journal = journal
+
+        # how long to wait for a command before sending a heartbeat to the supervisor
+        self._heartbeatInterval: float = 1.0
 
     @property
-    def queue(self) -> Queue:
+    def queue(self) -> CommandQueue:
         return self._queue
 
     def print_start_up_message(self) -> None:
@@ -37,53 +77,238 @@ class CommandHandler:
         print(f"Exit command : {self._exitCommand}")
         print()
 
-    def cleanup(self) -> None:
-        # cleanup objects
+    def cleanup(self, shutdown) -> None:
+        # cleanup objects, the car is first in the list so the motors are stopped before anything else
         for roboObject in self._roboObjects:
             roboObject.cleanup()
 
-    def execute_commands(self, flag, shared_array) -> None:
-        self._setup()
+            if roboObject is self._car:
+                shutdown.set_car_stopped()
 
-        while not flag.value:
-            command: str = self._queue.get()
+        if self._traceLog:
+            self._traceLog.close()
 
-            if command == self._exitCommand:
-                break
-
-            try:
-                commandValidity: str = self._commandToObjects[command].get_command_validity(command)
-            except KeyError:
-                commandValidity: str = "invalid"
-
-            # signal if the command was valid, partially valid or invalid
-            signalColor = self._commandValidityToSignalColor[commandValidity]
-            self._signalLights.blink(signalColor)
+        if self._journal:
+            self._journal.close()
 
-            # execute command if it is valid
-            if commandValidity == "valid":
-                self._commandToObjects[command].handle_voice_command(command)
-                self._cameraHelper.update_control_values_for_video_feed(shared_array)
+    def stop_car_after_crash(self) -> None:
+        # called from the main process when the command process has died
+        self._car.force_stop()
 
-    def _setup(self):
+    def setup(self) -> None:
         # setup objects
         for roboObject in self._roboObjects:
             roboObject.setup()
 
         self._signalLights.setup()
 
-    def _get_all_objects_mapped_to_commands(self) -> dict[str: RoboObject]:
-        objectsToCommands: dict[str: RoboObject] = {}
+        if self._journal:
+            self._journal.start()
 
-        # add commands from all robot objects
-        for roboObject in self._roboObjects:
-            objectsToCommands.update(self._add_object_to_commands(roboObject))
+    def execute_commands(self, shutdown, telemetry, heartbeat) -> None:
+        self.setup()
+
+        # a restarted process starts from a stopped car, so the camera feed should show that
+        self._cameraHelper.update_control_values_for_video_feed(telemetry)
+
+        while not shutdown.is_set():
+            heartbeat.beat()
+
+            try:
+                trace: CommandTrace = self._queue.get(timeout=self._get_wait_time())
+            except Empty:
+                self._run_macro_step(telemetry)
+                continue
+
+            # None is put on the queue to wake this loop up when shutting down
+            if trace is None:
+                continue
+
+            # a new command cancels the macro that is running
+            self._cancel_macro()
+
+            if self.run_command(trace, telemetry) is None:
+                shutdown.request("exit command given")
+                break
+
+    def run_command(self, trace: CommandTrace, telemetry, macroStep: bool = False) -> str:
+        # runs the commands in one utterance and returns their validity, or None when it was the exit command,
+        # a macro step runs like any other command, so a stop in a macro doesn't throw away the commands given
+        receivedTime: float = monotonic()
+        trace.mark("dequeued", receivedTime)
+
+        commands: list[str] = self._split_utterance(trace.command)
+        if self._exitCommand in commands:
+            self._finish_command(trace, "valid", receivedTime, macroStep)
+            return None
+
+        # the robo objects mark the trace when they write to the motors and servos
+        trace.activate()
+
+        if trace.command == self._stopCommand and not macroStep:
+            self._stop_car_now(telemetry, trace)
+            self._finish_command(trace, "valid", receivedTime)
+            return "valid"
+
+        # nothing is run when a command isn't recognised, otherwise the commands are run in order and a command that
+        # wouldn't change anything, like "turn left" while already turning left, is skipped and makes the batch
+        # partially valid
+        batch: list[tuple] = self._get_command_batch(commands)
+        batchValidity: str = self._execute_batch(batch, telemetry, trace)
+
+        # signal once for the whole batch if it was valid, partially valid or invalid
+        signalColor = self._commandValidityToSignalColor[batchValidity]
+        self._signalLights.blink(signalColor)
+        trace.mark("signal light")
+
+        self._finish_command(trace, batchValidity, receivedTime, macroStep)
+        return batchValidity
+
+    def _check_macro_steps(self) -> None:
+        # steps can be any command of the robo objects, but not the exit command or another macro
+        for step in self._macros.get_step_commands():
+            for command in self._split_utterance(step):
+                found: tuple = self._commandRegistry.find(command)
+                if not found or found[0][0] is self._macros:
+                    raise InvalidCommandException(f"Macro step {command} is not a command of the car")
+
+    def _get_wait_time(self) -> float:
+        # wait for new commands until the next macro step has to be run
+        if not self._macros:
+            return self._heartbeatInterval
+
+        return self._macros.scheduler.get_wait_time(self._heartbeatInterval)
+
+    def _run_macro_step(self, telemetry) -> None:
+        if not self._macros:
+            return
+
+        step: tuple = self._macros.scheduler.next_step()
+        if not step:
+            return
+
+        # the trace starts when the step was due, so the time until it was dequeued is the jitter of the step
+        command, dueTime = step
+        trace = CommandTrace(command)
+        trace.mark("step due", dueTime)
+        self.run_command(trace, telemetry, macroStep=True)
+
+        if not self._macros.scheduler.running:
+            jitters: list[float] = self._macros.scheduler.jitters
+            print(f"Macro {self._macros.scheduler.macro_name} finished, {len(jitters)} steps started "
+                  f"{max(jitters):.2f} ms late at most")
+
+    def _cancel_macro(self) -> None:
+        if not self._macros:
+            return
+
+        cancelledMacro: str = self._macros.scheduler.cancel()
+        if cancelledMacro:
+            print(f"Cancelled macro {cancelledMacro}")
+
+    def _get_fuzzy_matcher(self, maxDistance: int) -> FuzzyMatcher:
+        # the exit command is left out so only an exact exit command stops the program
+        fuzzyMatcher = FuzzyMatcher(maxDistance)
+        for command in self._commandRegistry.commands:
+            fuzzyMatcher.add_command(command)
+
+        for template in self._commandRegistry.templates:
+            fuzzyMatcher.add_template(template)
+
+        return fuzzyMatcher
+
+    def _finish_command(self, trace: CommandTrace, validity: str, receivedTime: float, macroStep: bool = False) -> None:
+        CommandTrace.deactivate()
+
+        if self._journal:
+            self._journal.record(trace.command, validity, receivedTime, macroStep)
+
+        if self._traceLog:
+            self._traceLog.write(trace)
+
+    def _stop_car_now(self, telemetry, trace: CommandTrace) -> None:
+        # the stop command skips the validity check and the signal light to reach the motors as fast as possible
+        self._stopAction()
+        trace.mark("handled")
+
+        # honks and blinks are cut short, and commands given before the stop are not run after it
+        for roboObject in [*self._roboObjects, self._signalLights]:
+            roboObject.cancel_timed_actions()
+
+        droppedCommands: int = self._queue.drop_pending()
+        if droppedCommands:
+            print(f"Stopped the car, dropped {droppedCommands} commands given before the stop")
+
+        self._cameraHelper.update_control_values_for_video_feed(telemetry)
+        trace.mark("telemetry published")
+
+    def _execute_batch(self, batch: list[tuple], telemetry, trace: CommandTrace) -> str:
+        # returns the validity of the batch, the whole batch is checked for commands that aren't recognised before
+        # anything is run, after that every command is checked right before it is run, so in
+        # "speed 90 and go faster" the speed step is checked against speed 90
+        if not batch or any(validate is None for _, _, validate, _, _ in batch):
+            return "invalid"
+
+        validities: list[str] = []
+        for _, _, validate, run, args in batch:
+            commandValidity: str = validate(*args)
+            validities.append(commandValidity)
+
+            if commandValidity == "valid":
+                run(*args)
+
+        trace.mark("handled")
+
+        if "valid" in validities:
+            self._cameraHelper.update_control_values_for_video_feed(telemetry)
+            trace.mark("telemetry published")
+
+        return self._get_batch_validity(validities)
+
+    def _split_utterance(self, utterance: str) -> list[str]:
+        return [command.strip() for command in utterance.split(self._commandSeparator) if command.strip()]
+
+    def _get_command_batch(self, commands: list[str]) -> list[tuple]:
+        # returns (command, robo object, validator, action, arguments) in the order spoken, the validator is None
+        # for an invalid command, when several commands set the same channel of a robo object, like
+        # "speed 30 and speed 50", only the last one is kept, commands without a channel, like "go faster",
+        # change the value step by step and are all kept
+        batch: dict = {}
+        for index, spokenCommand in enumerate(commands):
+            command, found = self._match_command(spokenCommand)
+            if not found:
+                batch[index] = (command, None, None, None, ())
+                continue
+
+            (roboObject, channel, validate, run), args = found
+            batchKey = (id(roboObject), channel) if channel is not None else index
+            batch.pop(batchKey, None)
+            batch[batchKey] = (command, roboObject, validate, run, args)
+
+        return list(batch.values())
+
+    def _get_batch_validity(self, validities: list[str]) -> str:
+        if not validities or "invalid" in validities:
+            return "invalid"
+        elif "partially valid" in validities:
+            return "partially valid"
+
+        return "valid"
+
+    def _match_command(self, command: str) -> tuple:
+        # returns the command, corrected when it was a near miss, and what the command grammar found for it
+        found: tuple = self._commandGrammar.find(command)
+        if found or not self._fuzzyMatcher:
+            return command, found
 
-        return objectsToCommands
+        fuzzyMatch: tuple = self._fuzzyMatcher.match(command)
+        if not fuzzyMatch:
+            return command, None
 
-    def _add_object_to_commands(self, roboObject) -> dict[str: RoboObject]:
-        objectToCommands: dict[str: RoboObject] = {}
-        for command in roboObject.get_voice_commands():
-            objectToCommands[command] = roboObject
+        # the corrected command still has to pass the range check of its template
+        correctedCommand, confidence = fuzzyMatch
+        found = self._commandGrammar.find(correctedCommand)
+        if found:
+            print(f"Heard '{command}', using '{correctedCommand}' (confidence {confidence:.2f})")
 
-        return objectToCommands
\ No newline at end of file
+        return correctedCommand, found
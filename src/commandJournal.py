@@ -0,0 +1,100 @@
+import os
+import struct
+from queue import Full, Queue
+from threading import Thread
+from time import monotonic, time
+
+
+class CommandJournal:
+    # every record is the header followed by the command in UTF-8: time received, monotonic time received,
+    # ms spent handling the command, validity and the length of the command, the highest bit of the validity
+    # is set for the steps of a macro, so journals written before it was added are read the same
+    _fileStart: bytes = b"RCJ1"
+    _recordHeader = struct.Struct("<ddfBH")
+    _validities: list[str] = ["valid", "partially valid", "invalid"]
+    _macroStepFlag: int = 0x80
+
+    def __init__(self, filePath: str, queueSize: int = 256):
+        # the command loop only puts records on a queue, a thread appends them to the file
+        self._filePath: str = filePath
+        self._queueSize: int = queueSize
+
+        self._queue: Queue = None
+        self._writerThread: Thread = None
+        self._droppedRecords: int = 0
+
+    @property
+    def file_path(self) -> str:
+        return self._filePath
+
+    def start(self) -> None:
+        # must be called in the process that records the commands, threads don't survive a fork
+        if self._writerThread:
+            return
+
+        self._queue = Queue(maxsize=self._queueSize)
+        self._writerThread = Thread(target=self._write_records, daemon=True)
+        self._writerThread.start()
+
+    def record(self, command: str, validity: str, receivedTime: float, macroStep: bool = False) -> None:
+        # receivedTime is monotonic, records are dropped rather than making the command loop wait for the disk
+        timeSinceReceived: float = monotonic() - receivedTime
+        handleTime: float = timeSinceReceived * 1000
+        wallTime: float = time() - timeSinceReceived
+        validityIndex: int = self._validities.index(validity) | (self._macroStepFlag if macroStep else 0)
+        try:
+            self._queue.put_nowait((wallTime, receivedTime, handleTime, validityIndex, command))
+        except Full:
+            self._droppedRecords += 1
+
+    def close(self) -> None:
+        if not self._writerThread:
+            return
+
+        self._queue.put(None)
+        self._writerThread.join()
+        self._writerThread = None
+
+        if self._droppedRecords:
+            print(f"Command journal dropped {self._droppedRecords} records")
+
+    @staticmethod
+    def read(filePath: str):
+        # yields (time, monotonic time, handle time in ms, macro step, validity, command) for every record,
+        # a record cut short by a crash ends the journal
+        with open(filePath, "rb") as file:
+            if file.read(len(CommandJournal._fileStart)) != CommandJournal._fileStart:
+                raise ValueError(f"{filePath} is not a command journal")
+
+            headerSize: int = CommandJournal._recordHeader.size
+            while True:
+                header: bytes = file.read(headerSize)
+                if len(header) < headerSize:
+                    return
+
+                wallTime, receivedTime, handleTime, validity, length = CommandJournal._recordHeader.unpack(header)
+                command: bytes = file.read(length)
+                if len(command) < length:
+                    return
+
+                macroStep: bool = bool(validity & CommandJournal._macroStepFlag)
+                validity = CommandJournal._validities[validity & ~CommandJournal._macroStepFlag]
+                yield wallTime, receivedTime, handleTime, macroStep, validity, command.decode()
+
+    def _write_records(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self._filePath)), exist_ok=True)
+
+        with open(self._filePath, "ab", buffering=0) as file:
+            if file.tell() == 0:
+                file.write(self._fileStart)
+
+            while True:
+                record: tuple = self._queue.get()
+                if record is None:
+                    return
+
+                *values, command = record
+                commandBytes: bytes = command.encode()[:0xFFFF]
+
+                # one write per record, so a crash can only cut the last record short
+                file.write(self._recordHeader.pack(*values, len(commandBytes)) + commandBytes)
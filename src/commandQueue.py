@@ -0,0 +1,42 @@
+from multiprocessing import Lock, Pipe
+from multiprocessing.connection import wait
+from queue import Empty
+
+
+class CommandQueue:
+    def __init__(self, priorityCommands: set[str]):
+        # safety commands like stop go on their own lane, which is always read first,
+        # so they don't wait behind commands that were given earlier
+        self._priorityCommands: set[str] = set(priorityCommands)
+        self._priorityReader, self._priorityWriter = Pipe(duplex=False)
+        self._reader, self._writer = Pipe(duplex=False)
+
+        # commands are put from the audio handler and None from the shutdown coordinator, in different processes
+        self._writeLock = Lock()
+
+    def is_priority(self, trace) -> bool:
+        # None wakes up the reader when shutting down, so it goes on the priority lane as well
+        return trace is None or trace.command in self._priorityCommands
+
+    def put(self, trace) -> None:
+        writer = self._priorityWriter if self.is_priority(trace) else self._writer
+        with self._writeLock:
+            writer.send(trace)
+
+    def get(self, timeout: float = None):
+        # raises Empty when nothing was put within timeout, like Queue.get
+        readyReaders: list = wait([self._priorityReader, self._reader], timeout)
+        if not readyReaders:
+            raise Empty
+
+        reader = self._priorityReader if self._priorityReader in readyReaders else self._reader
+        return reader.recv()
+
+    def drop_pending(self) -> int:
+        # throws away the commands waiting on the normal lane and returns how many there were
+        droppedCommands: int = 0
+        while self._reader.poll():
+            self._reader.recv()
+            droppedCommands += 1
+
+        return droppedCommands
@@ -0,0 +1,75 @@
+from commandGrammar import CommandGrammar, CommandTemplate
+from exceptions import InvalidPinException, InvalidCommandException
+
+
+class CommandRegistry:
+    def __init__(self):
+        # every pin and command in use by the robo objects of this process, the concrete commands are kept in a dict
+        # and the templates in the command grammar, so a spoken command is found with one lookup and one regex
+        self._pins: set[int] = set()
+        self._commands: dict[str: object] = {}
+        self._templates: list[CommandTemplate] = []
+        self._grammar: CommandGrammar = CommandGrammar()
+
+    @property
+    def grammar(self) -> CommandGrammar:
+        return self._grammar
+
+    @property
+    def commands(self) -> list[str]:
+        return list(self._commands)
+
+    @property
+    def templates(self) -> list[CommandTemplate]:
+        return list(self._templates)
+
+    def register_pin(self, pin: int) -> None:
+        if pin in self._pins:
+            raise InvalidPinException(f"Pin {pin} is already in use")
+
+        self._pins.add(pin)
+
+    def register_command(self, command: str, owner) -> None:
+        if command in self._commands:
+            raise InvalidCommandException(f"Command {command} already exists")
+
+        # a command like "speed 30" would never be run if a template like "speed {param}" is already registered
+        if self._grammar.find(command):
+            template: CommandTemplate = self._find_template(command)
+            raise InvalidCommandException(f"Command {command} is already covered by the command {template.template}")
+
+        self._commands[command] = owner
+        self._grammar.add_command(command, owner)
+
+    def register_template(self, template: CommandTemplate, owner) -> None:
+        for command in self._commands:
+            if template.parse(command) is not None:
+                raise InvalidCommandException(f"Command {template.template} covers the command {command}")
+
+        # the same template can be used twice as long as the ranges don't overlap
+        for otherTemplate in self._templates:
+            if template.overlaps(otherTemplate):
+                raise InvalidCommandException(
+                    f"Command {template.template} overlaps with the command {otherTemplate.template}"
+                )
+
+        self._templates.append(template)
+        self._grammar.add_template(template, owner)
+
+    def find(self, command: str) -> tuple:
+        # returns the owner and the arguments in the command, or None when the command isn't registered
+        return self._grammar.find(command)
+
+    def reset(self) -> None:
+        # forget every pin and command, e.g. between tests
+        self._pins.clear()
+        self._commands.clear()
+        self._templates.clear()
+        self._grammar = CommandGrammar()
+
+    def _find_template(self, command: str) -> CommandTemplate:
+        for template in self._templates:
+            if template.parse(command) is not None:
+                return template
+
+        return None
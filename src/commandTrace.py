@@ -0,0 +1,63 @@
+import json
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+from time import monotonic, time
+
+
+class CommandTrace:
+    # the trace of the command being handled in this process, so the robo objects can mark when they
+    # write to the motors and servos without the trace being passed to them
+    _activeTrace = None
+
+    def __init__(self, command: str = ""):
+        # timestamps are monotonic, which is the same clock in every process
+        self.command: str = command
+        self.startTime: float = time()
+        self.stamps: list[tuple] = []
+
+    def mark(self, stage: str, timestamp: float = None) -> None:
+        self.stamps.append((stage, monotonic() if timestamp is None else timestamp))
+
+    def activate(self) -> None:
+        CommandTrace._activeTrace = self
+
+    @staticmethod
+    def deactivate() -> None:
+        CommandTrace._activeTrace = None
+
+    @staticmethod
+    def mark_active(stage: str) -> None:
+        if CommandTrace._activeTrace:
+            CommandTrace._activeTrace.mark(stage)
+
+    def to_record(self) -> dict:
+        # the stages are given in ms since the first stage
+        firstTime: float = self.stamps[0][1] if self.stamps else 0.0
+
+        return {
+            "time": round(self.startTime, 3),
+            "command": self.command,
+            "stages": [[stage, round((timestamp - firstTime) * 1000, 3)] for stage, timestamp in self.stamps]
+        }
+
+
+class TraceLog:
+    def __init__(self, filePath: str, maxBytes: int, backupCount: int):
+        # one JSON record per line, the file is rolled over to filePath.1, filePath.2, ... when it gets too large,
+        # it is opened on the first write so it belongs to the process that writes the traces
+        self._filePath: str = filePath
+        os.makedirs(os.path.dirname(os.path.abspath(filePath)), exist_ok=True)
+        self._handler = RotatingFileHandler(filePath, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    @property
+    def file_path(self) -> str:
+        return self._filePath
+
+    def write(self, trace: CommandTrace) -> None:
+        record = logging.makeLogRecord({"msg": json.dumps(trace.to_record())})
+        self._handler.handle(record)
+
+    def close(self) -> None:
+        self._handler.close()
@@ -14,4 +14,10 @@ class X11ForwardingException(Exception):
     pass
 
 class MicrophoneException(Exception):
+    pass
+
+class PigpioDaemonException(Exception):
+    pass
+
+class CameraNotFoundException(Exception):
     pass
\ No newline at end of file
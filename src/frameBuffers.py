@@ -0,0 +1,30 @@
+import numpy as np
+
+
+class FrameBufferPool:
+    def __init__(self):
+        self._buffers: dict = {}
+        self._allocations: int = 0
+
+    @property
+    def allocations(self) -> int:
+        # only the frame buffers of the pool, and results OpenCV didn't write into them, other allocations of the
+        # display loop are measured with tracemalloc in testCamera.py
+        return self._allocations
+
+    def get(self, name: str, shape: tuple, dtype=np.uint8):
+        # buffers are only allocated the first time they are used or when the frame size changes
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+            self._allocations += 1
+
+        return buffer
+
+    def check(self, name: str, array):
+        # OpenCV silently allocates a new array if it can't write into the given dst buffer
+        if array is not self._buffers.get(name):
+            self._allocations += 1
+
+        return array
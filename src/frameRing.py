@@ -0,0 +1,184 @@
+import multiprocessing
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+
+
+class FrameRing:
+    def __init__(self, frameShape: tuple, numOfSlots: int = 3, context=multiprocessing):
+        # frames smaller than this shape also fit, the slots are sized for the largest frame
+        self._frameShape: tuple = tuple(frameShape)
+        self._numOfSlots: int = numOfSlots
+        self._slotSize: int = int(np.prod(self._frameShape))
+
+        # header layout: the latest published sequence number followed by sequence number, height and width
+        # of the frame held by each slot
+        self._numOfSlotFields: int = 3
+        self._headerSize: int = (1 + numOfSlots * self._numOfSlotFields) * np.dtype(np.int64).itemsize
+        # stats layout: capture fps, whether the capture process zooms in the camera pipeline,
+        # frame buffer allocations in the display process, requested capture width and height
+        self._numOfStats: int = 5
+        self._statsSize: int = self._numOfStats * np.dtype(np.float64).itemsize
+
+        self._memory = SharedMemory(create=True, size=self._headerSize + self._statsSize + numOfSlots * self._slotSize)
+        self._isOwner: bool = True
+
+        # the locks have to come from the context that starts the other processes
+        self._slotLocks: list = [context.Lock() for _ in range(numOfSlots)]
+        self._newFrameEvent = context.Event()
+
+        self._attach_views()
+        self._header[:] = 0
+        self._stats[:] = 0.0
+
+        self._writeSeq: int = 0
+
+    def __getstate__(self) -> dict:
+        # only needed when processes are spawned instead of forked, the views are attached again on the other side
+        state: dict = self.__dict__.copy()
+        for name in ["_memory", "_header", "_stats", "_slots"]:
+            del state[name]
+        state["_memoryName"] = self._memory.name
+        state["_isOwner"] = False
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        memoryName: str = state.pop("_memoryName")
+        self.__dict__.update(state)
+        self._memory = SharedMemory(name=memoryName)
+        self._attach_views()
+
+    @property
+    def frame_shape(self) -> tuple:
+        return self._frameShape
+
+    @property
+    def slot_size(self) -> int:
+        return self._slotSize
+
+    @property
+    def capture_fps(self) -> float:
+        return float(self._stats[0])
+
+    @capture_fps.setter
+    def capture_fps(self, fps: float) -> None:
+        self._stats[0] = fps
+
+    @property
+    def hardware_zoom(self) -> bool:
+        return bool(self._stats[1])
+
+    @hardware_zoom.setter
+    def hardware_zoom(self, active: bool) -> None:
+        self._stats[1] = float(active)
+
+    @property
+    def allocations(self) -> int:
+        return int(self._stats[2])
+
+    @allocations.setter
+    def allocations(self, allocations: int) -> None:
+        self._stats[2] = allocations
+
+    @property
+    def requested_resolution(self) -> tuple:
+        # (0, 0) until the display process asks the capture process for another resolution
+        return int(self._stats[3]), int(self._stats[4])
+
+    @requested_resolution.setter
+    def requested_resolution(self, resolution: tuple) -> None:
+        self._stats[3], self._stats[4] = resolution
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self._header[0])
+
+    def resume_writing(self) -> None:
+        # a restarted capture process continues the sequence, so the reader doesn't take new frames for old ones
+        self._writeSeq = self.latest_seq
+
+    def write(self, frame) -> int:
+        # never wait for the reader, if it is busy copying out of a slot we write to the next one,
+        # the sequence only advances when the frame is written, so the reader doesn't count it as dropped
+        seq: int = self._writeSeq + 1
+        for offset in range(self._numOfSlots):
+            slot: int = (seq + offset) % self._numOfSlots
+            lock = self._slotLocks[slot]
+            if lock.acquire(block=False):
+                break
+        else:
+            return self.latest_seq
+
+        self._writeSeq = seq
+
+        try:
+            height, width = frame.shape[:2]
+            np.copyto(self._slots[slot, :frame.size].reshape(frame.shape), frame)
+
+            slotHeader: int = 1 + slot * self._numOfSlotFields
+            self._header[slotHeader] = self._writeSeq
+            self._header[slotHeader + 1] = height
+            self._header[slotHeader + 2] = width
+            self._header[0] = self._writeSeq
+        finally:
+            lock.release()
+
+        self._newFrameEvent.set()
+
+        return self._writeSeq
+
+    def read_latest(self, out, lastSeq: int, timeout: float = 0.1):
+        # out is a flat buffer of slot_size bytes, the returned frame is a view into it
+        # wait until a frame newer than the one the reader already has is published
+        if self.latest_seq <= lastSeq:
+            self._newFrameEvent.clear()
+            if self.latest_seq <= lastSeq and not self._newFrameEvent.wait(timeout):
+                return None, None
+
+        # older frames are simply skipped, the reader always gets the newest one
+        latestSeq: int = self.latest_seq
+        for slot in range(self._numOfSlots):
+            slotHeader: int = 1 + slot * self._numOfSlotFields
+            if self._header[slotHeader] != latestSeq:
+                continue
+
+            # a capture process that was killed while writing never releases its lock
+            lock = self._slotLocks[slot]
+            if not lock.acquire(timeout=timeout):
+                break
+
+            try:
+                if self._header[slotHeader] != latestSeq:
+                    break
+
+                shape: tuple = (int(self._header[slotHeader + 1]), int(self._header[slotHeader + 2]),
+                                *self._frameShape[2:])
+                frameSize: int = int(np.prod(shape))
+                np.copyto(out[:frameSize], self._slots[slot, :frameSize])
+            finally:
+                lock.release()
+
+            return latestSeq, out[:frameSize].reshape(shape)
+
+        return None, None
+
+    def close(self) -> None:
+        self._header = None
+        self._stats = None
+        self._slots = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        if self._isOwner:
+            self._memory.unlink()
+
+    def _attach_views(self) -> None:
+        buffer = self._memory.buf
+        self._header = np.ndarray((1 + self._numOfSlots * self._numOfSlotFields,), dtype=np.int64, buffer=buffer)
+        self._stats = np.ndarray((self._numOfStats,), dtype=np.float64, buffer=buffer, offset=self._headerSize)
+        self._slots = np.ndarray(
+            (self._numOfSlots, self._slotSize),
+            dtype=np.uint8,
+            buffer=buffer,
+            offset=self._headerSize + self._statsSize
+        )
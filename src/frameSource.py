@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from time import monotonic, sleep
+
+
+class FrameSource:
+    def __init__(self, resolution: tuple, fps: float = 0.0):
+        self._width, self._height = resolution
+
+        # sources that aren't paced by camera hardware deliver frames at this rate, as fast as possible when zero
+        self._frameInterval: float = 1 / fps if fps else 0.0
+        self._nextFrameTime: float = 0.0
+
+    @property
+    def resolution(self) -> tuple:
+        return self._width, self._height
+
+    def check_if_available(self) -> None:
+        # raises an exception when the source can't deliver frames, run as a startup probe
+        pass
+
+    def start(self) -> None:
+        self._nextFrameTime = monotonic()
+
+    @contextmanager
+    def capture_frame(self):
+        # the frame is only valid inside the with block, since sources may reuse the underlying buffer
+        self._wait_for_next_frame()
+        yield self._read_frame()
+
+    def set_resolution(self, resolution: tuple) -> None:
+        self._width, self._height = resolution
+
+    def use_hardware_zoom(self, zoomEngine) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
+
+    def _read_frame(self):
+        raise NotImplementedError
+
+    def _wait_for_next_frame(self) -> None:
+        if not self._frameInterval:
+            return
+
+        waitTime: float = self._nextFrameTime - monotonic()
+        if waitTime > 0:
+            sleep(waitTime)
+
+        # don't try to catch up on frames when we fall behind
+        self._nextFrameTime = max(self._nextFrameTime + self._frameInterval, monotonic())
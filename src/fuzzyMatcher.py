@@ -0,0 +1,122 @@
+import re
+from commandGrammar import CommandTemplate
+
+
+class FuzzyMatcher:
+    def __init__(self, maxDistance: int = 2):
+        # commands the speech recognizer got slightly wrong, like "look lefts", are matched to the closest command
+        # within maxDistance edits, the commands are kept in a BK-tree so only a few of them have to be compared
+        self._maxDistance: int = maxDistance
+
+        # a node is [command, {distance: child node}]
+        self._root: list = None
+        self._size: int = 0
+
+        # numbers are replaced with a placeholder before matching, so "speed 55" and "speeds 40" are one edit apart
+        # no matter the value, the template is kept to put the spoken number back in
+        self._numberPattern = re.compile(r"\d+(?:\.\d+)?")
+        self._placeholder: str = "#"
+        self._templates: dict[str: str] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def add_command(self, command: str) -> None:
+        self._add(command)
+
+    def add_template(self, template: CommandTemplate) -> None:
+        normalizedTemplate: str = template.template.replace("{param}", self._placeholder)
+        self._templates[normalizedTemplate] = template.template
+        self._add(normalizedTemplate)
+
+    def match(self, command: str) -> tuple:
+        # returns the corrected command and how confident the match is from 0 to 1,
+        # or None when no command is close enough or several commands are equally close
+        numbers: list[str] = self._numberPattern.findall(command)
+        normalizedCommand: str = self._numberPattern.sub(self._placeholder, command)
+
+        candidates: list[tuple] = self._find_within_distance(normalizedCommand)
+        if not candidates:
+            return None
+
+        bestDistance: int = min(distance for distance, _ in candidates)
+        bestCandidates: list[str] = [candidate for distance, candidate in candidates if distance == bestDistance]
+        if len(bestCandidates) > 1:
+            return None
+
+        correctedCommand: str = bestCandidates[0]
+        if correctedCommand in self._templates:
+            if len(numbers) != 1:
+                return None
+            correctedCommand = self._templates[correctedCommand].replace("{param}", numbers[0])
+
+        confidence: float = 1 - bestDistance / max(len(normalizedCommand), len(bestCandidates[0]))
+
+        return correctedCommand, confidence
+
+    def _add(self, command: str) -> None:
+        if self._root is None:
+            self._root = [command, {}]
+            self._size = 1
+            return
+
+        node: list = self._root
+        while True:
+            distance: int = self._get_edit_distance(command, node[0])
+            if distance == 0:
+                return
+
+            child: list = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [command, {}]
+                self._size += 1
+                return
+
+            node = child
+
+    def _find_within_distance(self, command: str) -> list[tuple]:
+        if self._root is None:
+            return []
+
+        # by the triangle inequality only children whose distance to the node is within maxDistance
+        # of the command's distance to the node can be close enough
+        candidates: list[tuple] = []
+        nodes: list[list] = [self._root]
+        while nodes:
+            nodeCommand, children = nodes.pop()
+            distance: int = self._get_edit_distance(command, nodeCommand)
+            if distance <= self._maxDistance:
+                candidates.append((distance, nodeCommand))
+
+            for childDistance, child in children.items():
+                if abs(childDistance - distance) <= self._maxDistance:
+                    nodes.append(child)
+
+        return candidates
+
+    @staticmethod
+    def _get_edit_distance(first: str, second: str) -> int:
+        # levenshtein distance, keeping only the previous row and avoiding min() since this is the hot loop
+        if len(first) < len(second):
+            first, second = second, first
+
+        previousRow: list[int] = list(range(len(second) + 1))
+        for i, firstChar in enumerate(first, 1):
+            currentRow: list[int] = [i]
+            left: int = i
+            diagonal: int = i - 1
+            for j, secondChar in enumerate(second, 1):
+                above: int = previousRow[j]
+                distance: int = diagonal if firstChar == secondChar else diagonal + 1
+                if above + 1 < distance:
+                    distance = above + 1
+                if left + 1 < distance:
+                    distance = left + 1
+
+                currentRow.append(distance)
+                left = distance
+                diagonal = above
+            previousRow = currentRow
+
+        return previousRow[-1]
@@ -0,0 +1,151 @@
+import numpy as np
+from time import monotonic
+from roboCarHelper import RobocarHelper
+
+cv2 = RobocarHelper.lazy_import("cv2")
+
+
+class HudTile:
+    def __init__(self, origin: tuple, tileWidth: int, font, scale: int, thickness: int, colour: tuple):
+        self._font = font
+        self._scale: int = scale
+        self._thickness: int = thickness
+
+        # the tile must fit everything above and below the text baseline
+        (_, textHeight), baseline = cv2.getTextSize("Ag", font, scale, thickness)
+        self._ascent: int = textHeight + thickness
+        self._height: int = self._ascent + baseline + thickness
+        self._width: int = tileWidth
+
+        # top left corner of the tile in the frame
+        self._x: int = origin[0]
+        self._y: int = origin[1] - self._ascent
+
+        self._mask = np.zeros((self._height, self._width), dtype=np.uint8)
+        self._colourTile = np.empty((self._height, self._width, 3), dtype=np.uint8)
+        self._colourTile[:] = colour
+
+        # OpenCV 4 draws the text without anti-aliasing, so the mask is binary and the text pixels are copied onto
+        # the frame, newer versions anti-alias every font and the text is blended in by how much of a pixel it covers
+        cv2.putText(self._mask, "Ag", (0, self._ascent), font, scale, 255, thickness)
+        self._antiAliased: bool = bool(np.any((self._mask > 0) & (self._mask < 255)))
+        if self._antiAliased:
+            self._colourScale: tuple = tuple(channel / 255 for channel in colour)
+            self._coverage = np.empty((self._height, self._width, 3), dtype=np.uint8)
+            self._inverseCoverage = np.empty((self._height, self._width, 3), dtype=np.float32)
+            self._colourCoverage = np.empty((self._height, self._width, 3), dtype=np.float32)
+            self._blendBuffer = np.empty((self._height, self._width, 3), dtype=np.float32)
+
+        self._text: str = None
+        self._usedWidth: int = 0
+
+    def update(self, text: str) -> bool:
+        if text == self._text:
+            return False
+
+        # the same pixels putText would draw onto the frame
+        self._mask.fill(0)
+        cv2.putText(self._mask, text, (0, self._ascent), self._font, self._scale, 255, self._thickness)
+        if self._antiAliased:
+            # OpenCV does the conversions to float in place, numpy would allocate a buffer for them
+            cv2.cvtColor(self._mask, cv2.COLOR_GRAY2BGR, dst=self._coverage)
+            cv2.multiply(self._coverage, self._colourScale, dst=self._colourCoverage, dtype=cv2.CV_32F)
+            cv2.bitwise_not(self._coverage, dst=self._coverage)
+            cv2.multiply(self._coverage, (1 / 255,) * 3, dst=self._inverseCoverage, dtype=cv2.CV_32F)
+
+        (textWidth, _), _ = cv2.getTextSize(text, self._font, self._scale, self._thickness)
+        self._usedWidth = min(textWidth + self._thickness, self._width)
+        self._text = text
+
+        return True
+
+    def blend(self, image) -> None:
+        frameHeight, frameWidth = image.shape[:2]
+
+        # clip the tile to the part that is inside the frame
+        top: int = max(self._y, 0)
+        bottom: int = min(self._y + self._height, frameHeight)
+        right: int = min(self._x + self._usedWidth, frameWidth)
+        if top >= bottom or self._x >= right:
+            return
+
+        tileTop: int = top - self._y
+        tileBottom: int = tileTop + (bottom - top)
+        tileRight: int = right - self._x
+
+        region = image[top:bottom, self._x:right]
+        if self._antiAliased:
+            blendBuffer = self._blendBuffer[tileTop:tileBottom, :tileRight]
+            cv2.multiply(region, self._inverseCoverage[tileTop:tileBottom, :tileRight], dst=blendBuffer, dtype=cv2.CV_32F)
+            cv2.add(blendBuffer, self._colourCoverage[tileTop:tileBottom, :tileRight], dst=blendBuffer)
+            # the blended values are never negative, so this only rounds them back into the frame
+            cv2.convertScaleAbs(blendBuffer, dst=region)
+            return
+
+        # copy the rendered text pixels straight into the frame region under the tile
+        cv2.copyTo(self._colourTile[tileTop:tileBottom, :tileRight], self._mask[tileTop:tileBottom, :tileRight], region)
+
+
+class HudOverlay:
+    def __init__(self, frameWidth: int, font, scale: int, thickness: int, colour: tuple):
+        self._frameWidth: int = frameWidth
+        self._font = font
+        self._scale: int = scale
+        self._thickness: int = thickness
+        self._colour: tuple = colour
+
+        self._tiles: dict[str: HudTile] = {}
+
+        # counters for how often tiles are re-rendered compared to reused
+        self._rendered: int = 0
+        self._reused: int = 0
+        self._totalRendered: int = 0
+        self._totalReused: int = 0
+        self._windowStart: float = monotonic()
+        self._renderedPerSecond: float = 0.0
+        self._reusedPerSecond: float = 0.0
+
+    def add_line(self, name: str, origin: tuple) -> None:
+        tileWidth: int = max(self._frameWidth - origin[0], 1)
+        self._tiles[name] = HudTile(origin, tileWidth, self._font, self._scale, self._thickness, self._colour)
+
+    def draw(self, image, name: str, text: str) -> None:
+        tile: HudTile = self._tiles[name]
+        if tile.update(text):
+            self._rendered += 1
+        else:
+            self._reused += 1
+
+        tile.blend(image)
+
+        self._update_rates()
+
+    @property
+    def tile_rates(self) -> tuple[float, float]:
+        # re-rendered and reused tiles per second over the last whole second
+        return self._renderedPerSecond, self._reusedPerSecond
+
+    def print_stats(self) -> None:
+        totalTiles: int = self._totalRendered + self._rendered + self._totalReused + self._reused
+        if not totalTiles:
+            return
+
+        renderedPerSecond, reusedPerSecond = self.tile_rates
+        print(f"HUD tiles re-rendered: {self._totalRendered + self._rendered}, "
+              f"reused: {self._totalReused + self._reused}, "
+              f"last second: {renderedPerSecond:.1f} re-rendered/s, {reusedPerSecond:.1f} reused/s")
+
+    def _update_rates(self) -> None:
+        now: float = monotonic()
+        elapsedTime: float = now - self._windowStart
+        if elapsedTime < 1.0:
+            return
+
+        self._renderedPerSecond = self._rendered / elapsedTime
+        self._reusedPerSecond = self._reused / elapsedTime
+
+        self._totalRendered += self._rendered
+        self._totalReused += self._reused
+        self._rendered = 0
+        self._reused = 0
+        self._windowStart = now
@@ -0,0 +1,70 @@
+import re
+from functools import partial
+from roboObject import RoboObject
+from macroScheduler import MacroScheduler
+from exceptions import InvalidCommandException
+
+class MacroHandling(RoboObject):
+    # a step is a command, optionally followed by how many seconds to wait before the next step, e.g. "turn left 0.5s"
+    _stepPattern = re.compile(r"(.+?)(?:\s+(\d+(?:\.\d+)?)s)?")
+
+    def __init__(self, userCommands: dict[str: str], macroSteps: dict[str: str]):
+        super().__init__([], userCommands, macroSteps=macroSteps)
+
+        self._macroSteps: dict[str: list[tuple]] = {
+            macroName: self._parse_steps(macroSteps[macroName]) for macroName in userCommands
+        }
+
+        # the steps are run by the command handler, which waits for new commands in between
+        self._macroScheduler: MacroScheduler = MacroScheduler()
+
+        self._macroCommands: dict[str: dict] = {
+            command: {"description": f"Runs {macroSteps[macroName]}", "macroName": macroName}
+            for macroName, command in userCommands.items()
+        }
+
+        self._commandDispatch: dict[str: tuple] = {
+            command: ("macro", self._get_macro_validity, partial(self._start_macro, values["macroName"]))
+            for command, values in self._macroCommands.items()
+        }
+        self._register_commands()
+
+    @property
+    def scheduler(self) -> MacroScheduler:
+        return self._macroScheduler
+
+    def print_commands(self) -> None:
+        if self._macroCommands:
+            self._print_commands("Macro commands:", self._macroCommands)
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
+
+    def get_step_commands(self) -> list[str]:
+        return [command for steps in self._macroSteps.values() for command, _ in steps]
+
+    def _get_macro_validity(self) -> str:
+        # a running macro is cancelled by the command that starts the next one
+        return "valid"
+
+    def _start_macro(self, macroName: str) -> None:
+        self._macroScheduler.start(macroName, self._macroSteps[macroName])
+
+    def _parse_steps(self, stepsText: str) -> list[tuple]:
+        steps: list[tuple] = []
+        for stepText in stepsText.split(","):
+            match = self._stepPattern.fullmatch(stepText.strip())
+            if not match:
+                raise InvalidCommandException(f"Macro {stepsText} has an empty step")
+
+            command, delay = match.groups()
+            steps.append((command, float(delay) if delay else 0.0))
+
+        return steps
+
+    def _check_argument_validity(self, pins: list, userCommands: dict, **kwargs) -> None:
+        super()._check_argument_validity(pins, userCommands, **kwargs)
+
+        for macroName in userCommands:
+            if not kwargs["macroSteps"].get(macroName, "").strip():
+                raise InvalidCommandException(f"Macro {macroName} has no steps")
@@ -0,0 +1,73 @@
+from collections import deque
+from time import monotonic
+
+
+class MacroScheduler:
+    def __init__(self, spinTime: float = 0.002):
+        # every step is due at a fixed time from the start of the macro, so a late step doesn't push the next ones
+        # back, the command loop waits for new commands until spinTime before a step is due and then spins on the
+        # monotonic clock, since waking up from a wait can be a few ms late
+        self._spinTime: float = spinTime
+
+        self._macroName: str = ""
+        self._steps: deque = deque()
+
+        # ms every step of the last macro started later than it was due
+        self._jitters: list[float] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._steps)
+
+    @property
+    def macro_name(self) -> str:
+        return self._macroName
+
+    @property
+    def jitters(self) -> list[float]:
+        return self._jitters
+
+    def start(self, macroName: str, steps: list[tuple]) -> None:
+        # steps are (command, seconds to wait before the next step), the first step is due right away
+        self.cancel()
+
+        dueTime: float = monotonic()
+        for command, delay in steps:
+            self._steps.append((dueTime, command))
+            dueTime += delay
+
+        self._macroName = macroName
+        self._jitters = []
+
+    def cancel(self) -> str:
+        # returns the name of the macro that was cancelled, or "" when none was running
+        if not self._steps:
+            return ""
+
+        self._steps.clear()
+        return self._macroName
+
+    def get_wait_time(self, maxWaitTime: float) -> float:
+        # how long the command loop can wait for new commands before it has to spin for the next step
+        if not self._steps:
+            return maxWaitTime
+
+        dueTime, _ = self._steps[0]
+        return max(0.0, min(maxWaitTime, dueTime - self._spinTime - monotonic()))
+
+    def next_step(self) -> tuple:
+        # returns (command, due time) of the next step once it is due, or None when it isn't due within the spin time
+        if not self._steps:
+            return None
+
+        dueTime, command = self._steps[0]
+        if dueTime - monotonic() > self._spinTime:
+            return None
+
+        while monotonic() < dueTime:
+            pass
+
+        self._steps.popleft()
+        self._jitters.append((monotonic() - dueTime) * 1000)
+
+        return command, dueTime
@@ -11,8 +11,20 @@ from motorDriver import MotorDriver
 from os import path
 from signalLights import SignalLights
 from audioHandler import AudioHandler
+from videoRecorder import VideoRecorder
+from frameSource import FrameSource
+from picameraSource import PicameraSource
+from syntheticSource import SyntheticSource
+from replaySource import ReplaySource
 from buzzer import Buzzer
-from exceptions import OutOfRangeException, InvalidCommandException, InvalidPinException, X11ForwardingException, MicrophoneException
+from shutdownCoordinator import ShutdownCoordinator
+from processSupervisor import ProcessSupervisor
+from startupTimeline import StartupTimeline
+from startupProbes import StartupProbes
+from commandTrace import TraceLog
+from commandJournal import CommandJournal
+from macroHandling import MacroHandling
+from exceptions import OutOfRangeException, InvalidCommandException, InvalidPinException, MicrophoneException
 
 
 def print_error_message_and_exit(errorMessage):
@@ -46,15 +58,99 @@ def setup_camera(parser):
     try:
         resolutionWidth: int = cameraSpecs.getint("Resolution_width")
         resolutionHeight: int = cameraSpecs.getint("Resolution_height")
+        streamPort: int = cameraSpecs.getint("stream_port")
+        targetFps: float = cameraSpecs.getfloat("target_fps")
+        stageTimings: bool = cameraSpecs.getboolean("stage_timings")
     except ValueError as e:
         print_error_message_and_exit(e)
 
+    output: str = cameraSpecs["output"]
+    if output not in ("window", "stream"):
+        print_error_message_and_exit(f"Camera output should be window or stream, not {output}")
+
+    recorder: VideoRecorder = setup_video_recorder(parser)
+
     resolution: tuple = (resolutionWidth, resolutionHeight)
-    camera = Camera(resolution)
+    frameSource: FrameSource = setup_frame_source(parser, resolution)
+
+    camera = Camera(resolution, output=output, streamPort=streamPort, targetFps=targetFps, stageTimings=stageTimings,
+                    recorder=recorder, frameSource=frameSource)
 
     return camera
 
 
+def setup_frame_source(parser, resolution: tuple) -> FrameSource:
+    cameraSpecs = parser["Camera.specs"]
+    source: str = cameraSpecs["source"]
+
+    # None lets the camera use the pi camera
+    if source == "camera":
+        return None
+
+    try:
+        sourceFps: float = cameraSpecs.getfloat("source_fps")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    if source == "synthetic":
+        return SyntheticSource(resolution, sourceFps)
+
+    if source == "replay":
+        replayFile: str = path.join(path.dirname(__file__), cameraSpecs["replay_file"])
+        if not path.isfile(replayFile):
+            print_error_message_and_exit(f"Replay file {replayFile} does not exist")
+
+        return ReplaySource(resolution, replayFile, sourceFps)
+
+    print_error_message_and_exit(f"Camera source should be camera, synthetic or replay, not {source}")
+
+
+def setup_video_recorder(parser) -> VideoRecorder:
+    recordingSpecs = parser["Recording.specs"]
+
+    try:
+        segmentSeconds: float = recordingSpecs.getfloat("segment_seconds")
+        segmentMaxBytes: int = recordingSpecs.getint("segment_max_mb") * 1024 * 1024
+        queueSize: int = recordingSpecs.getint("queue_size")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    folder: str = path.join(path.dirname(__file__), recordingSpecs["folder"])
+
+    return VideoRecorder(folder, segmentSeconds, segmentMaxBytes, queueSize)
+
+
+def setup_trace_log(parser) -> TraceLog:
+    traceSpecs = parser["Trace.specs"]
+    if not traceSpecs["trace_file"]:
+        return None
+
+    try:
+        maxBytes: int = traceSpecs.getint("max_kb") * 1024
+        backupCount: int = traceSpecs.getint("backups")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    traceFile: str = path.join(path.dirname(__file__), traceSpecs["trace_file"])
+
+    return TraceLog(traceFile, maxBytes, backupCount)
+
+
+def setup_command_journal(parser) -> CommandJournal:
+    journalSpecs = parser["Journal.specs"]
+    if not journalSpecs["journal_file"]:
+        return None
+
+    try:
+        queueSize: int = journalSpecs.getint("queue_size")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    journalFile: str = path.join(path.dirname(__file__), journalSpecs["journal_file"])
+
+    return CommandJournal(journalFile, queueSize)
+
+
 def setup_camera_helper(parser, *args):
     cameraCommands = parser["Camera.commands"]
 
@@ -69,9 +165,15 @@ def setup_camera_helper(parser, *args):
         "zoomOutCommand": cameraCommands["zoom_out"]
     }
 
+    recordingCommands: dict = {
+        "startRecordingCommand": cameraCommands["start_recording"],
+        "stopRecordingCommand": cameraCommands["stop_recording"]
+    }
+
     commands: dict = {
         "hudCommands": hudCommands,
-        "zoomCommands": zoomCommands
+        "zoomCommands": zoomCommands,
+        "recordingCommands": recordingCommands
     }
 
     cameraSpecs = parser["Camera.specs"]
@@ -185,6 +287,22 @@ def setup_audio_handler(parser):
     return audioHandler
 
 
+def setup_startup_probes(parser, camera, timeline) -> StartupProbes:
+    probes = StartupProbes(timeline)
+
+    microphoneName: str = parser["Audio.specs"]["microphone_name"]
+    probes.add_probe("bluetooth headset", lambda: AudioHandler.check_if_headphones_connected(microphoneName))
+    probes.add_probe("speech recognition import", AudioHandler.load_speech_modules)
+    probes.add_probe("pigpio daemon", Servo.check_if_daemon_running)
+    probes.add_probe("camera", camera.check_if_source_available)
+
+    # no X11 server is needed when the camera feed is streamed over HTTP
+    if camera.output != "stream":
+        probes.add_probe("X11 display", CarControl.check_if_X11_connected)
+
+    return probes
+
+
 def setup_car(parser):
     carHandlingSpecs = parser["Car.handling.specs"]
 
@@ -250,7 +368,48 @@ def setup_car(parser):
     return car
 
 
-def setup_command_handler(parser, camera):
+def setup_shutdown_coordinator(parser) -> ShutdownCoordinator:
+    shutdownSpecs = parser["Shutdown.specs"]
+
+    try:
+        deadline: float = shutdownSpecs.getfloat("deadline")
+        carStopTarget: float = shutdownSpecs.getfloat("car_stop_target")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    return ShutdownCoordinator(deadline, carStopTarget)
+
+
+def setup_process_supervisor(parser, shutdown) -> ProcessSupervisor:
+    supervisorSpecs = parser["Supervisor.specs"]
+
+    try:
+        heartbeatTimeout: float = supervisorSpecs.getfloat("heartbeat_timeout")
+        minBackoff: float = supervisorSpecs.getfloat("min_restart_backoff")
+        maxBackoff: float = supervisorSpecs.getfloat("max_restart_backoff")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    return ProcessSupervisor(shutdown, heartbeatTimeout, minBackoff=minBackoff, maxBackoff=maxBackoff)
+
+
+def setup_macros(parser) -> MacroHandling:
+    # macros are optional, a config file without them runs without macros
+    if not parser.has_section("Macro.commands"):
+        return None
+
+    macroCommands: dict = dict(parser["Macro.commands"])
+    macroSteps: dict = dict(parser["Macro.steps"]) if parser.has_section("Macro.steps") else {}
+
+    try:
+        macros = MacroHandling(macroCommands, macroSteps)
+    except InvalidCommandException as e:
+        print_error_message_and_exit(e)
+
+    return macros
+
+
+def setup_command_handler(parser, recordCommands: bool = True):
     # setup car
     car = setup_car(parser)
 
@@ -260,43 +419,103 @@ def setup_command_handler(parser, camera):
     # setup honk
     honk = setup_buzzer(parser)
 
-    # enable objects in camera class
-    camera.set_car_enabled()
-    camera.set_servo_enabled()
-
     # setup camerahelper
     cameraHelper = setup_camera_helper(parser, car, servo)
-    cameraHelper.set_array_dict(camera.array_dict)
 
     # setup signal lights
     signalLights = setup_signal_lights(parser)
 
+    # setup macros
+    macros = setup_macros(parser)
+
     exitCommand = parser["Global.commands"]["exit"]
 
+    commandSpecs = parser["Command.specs"]
+    try:
+        fuzzyMaxDistance: int = commandSpecs.getint("fuzzy_max_distance")
+    except ValueError as e:
+        print_error_message_and_exit(e)
+
+    commandSeparator: str = commandSpecs["command_separator"]
+
+    # the traces and the journal are left out when replaying a journal
+    traceLog: TraceLog = setup_trace_log(parser) if recordCommands else None
+    journal: CommandJournal = setup_command_journal(parser) if recordCommands else None
+
     # set up command handler
-    commandHandler = CommandHandler(car, servo, cameraHelper, honk, signalLights, exitCommand)
+    try:
+        commandHandler = CommandHandler(
+            car, servo, cameraHelper, honk, signalLights, exitCommand, fuzzyMaxDistance, commandSeparator, traceLog,
+            journal, macros
+        )
+    except InvalidCommandException as e:
+        print_error_message_and_exit(e)
 
     return commandHandler
 
 
-# set up parser to read input values
-parser = ConfigParser()
-parser.read(path.join(path.dirname(__file__), 'config.ini'))
+def read_config():
+    # set up parser to read input values
+    parser = ConfigParser()
+    parser.read(path.join(path.dirname(__file__), 'config.ini'))
+
+    return parser
+
+
+def load_heavy_modules() -> None:
+    # used by the prefork launcher in run.py so every launch starts with these already loaded,
+    # nothing here opens the camera, audio devices, GPIO or pigpio
+    RobocarHelper.load_module("numpy")
+    RobocarHelper.load_module("cv2")
+    RobocarHelper.load_module("speech_recognition")
+    PicameraSource.load_modules()
+
+
+def main(parser=None, startTime: float = None) -> None:
+    if parser is None:
+        parser = read_config()
+
+    # time every startup phase until the car is ready for voice commands
+    launchLog: str = path.join(path.dirname(__file__), parser["Start.button"]["launch_log"])
+    timeline = StartupTimeline(startTime, launchLog)
+    timeline.mark("imports and config")
+
+    # setup camera
+    camera = setup_camera(parser)
+
+    # check the hardware in the background while the rest is set up
+    probes = setup_startup_probes(parser, camera, timeline)
+    probes.start()
+
+    # setup command handler
+    commandHandler = setup_command_handler(parser)
+
+    # enable objects in camera class
+    camera.set_car_enabled()
+    camera.set_servo_enabled()
+
+    shutdown = setup_shutdown_coordinator(parser)
+    supervisor = setup_process_supervisor(parser, shutdown)
+    timeline.mark("setup from config")
+
+    # the probes run in threads, so ctrl+c while they retry only reaches the main thread waiting for them
+    try:
+        probeErrors: list = probes.wait()
+    except KeyboardInterrupt:
+        print_error_message_and_exit("User aborted the startup checks")
+    if probeErrors:
+        print_error_message_and_exit("\n".join(str(error) for error in probeErrors))
 
-# setup camera
-camera = setup_camera(parser)
+    audioHandler = setup_audio_handler(parser)
+    audioHandler.setup(commandHandler.queue, timeline)
+    timeline.mark("audio handler setup")
 
-# setup command handler
-commandHandler = setup_command_handler(parser, camera)
+    # setup car controller
+    carController = CarControl(camera, commandHandler, audioHandler, shutdown, supervisor)
 
-audioHandler = setup_audio_handler(parser)
-audioHandler.setup(commandHandler.queue)
+    # start car
+    carController.start()
 
-# setup car controller
-try:
-    carController = CarControl(camera, commandHandler, audioHandler)
-except X11ForwardingException as e:
-    print_error_message_and_exit(e)
 
-# start car
-carController.start()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Thread
+from roboCarHelper import RobocarHelper
+
+cv2 = RobocarHelper.lazy_import("cv2")
+
+
+class FrameBroadcaster:
+    def __init__(self):
+        self._condition = Condition()
+        self._jpeg: bytes = b""
+        self._seq: int = 0
+        self._running: bool = True
+
+        self._numOfClients: int = 0
+        self._droppedFrames: int = 0
+
+    @property
+    def num_of_clients(self) -> int:
+        return self._numOfClients
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._droppedFrames
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def publish(self, jpeg: bytes) -> None:
+        with self._condition:
+            self._jpeg = jpeg
+            self._seq += 1
+            self._condition.notify_all()
+
+    def wait_for_frame(self, lastSeq: int, timeout: float = 1.0):
+        with self._condition:
+            self._condition.wait_for(lambda: self._seq > lastSeq or not self._running, timeout)
+            if not self._running or self._seq <= lastSeq:
+                return lastSeq, None
+
+            # clients that fall behind jump straight to the newest frame
+            if lastSeq:
+                self._droppedFrames += self._seq - lastSeq - 1
+
+            return self._seq, self._jpeg
+
+    def add_client(self) -> None:
+        with self._condition:
+            self._numOfClients += 1
+
+    def remove_client(self) -> None:
+        with self._condition:
+            self._numOfClients -= 1
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+
+class MjpegRequestHandler(BaseHTTPRequestHandler):
+    boundary: str = "frame"
+
+    def do_GET(self) -> None:
+        if self.path not in ("/", "/stream"):
+            self.send_error(404)
+            return
+
+        broadcaster: FrameBroadcaster = self.server.broadcaster
+
+        self.send_response(200)
+        self.send_header("Cache-Control", "no-cache, private")
+        self.send_header("Pragma", "no-cache")
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={self.boundary}")
+        self.end_headers()
+
+        broadcaster.add_client()
+        try:
+            lastSeq: int = 0
+            while broadcaster.running:
+                lastSeq, jpeg = broadcaster.wait_for_frame(lastSeq)
+                if jpeg is None:
+                    continue
+
+                self.wfile.write(
+                    f"--{self.boundary}\r\n"
+                    f"Content-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass # client disconnected
+        finally:
+            broadcaster.remove_client()
+
+    def log_message(self, format, *args) -> None:
+        pass # don't print a line for every request
+
+
+class MjpegStreamer:
+    def __init__(self, port: int, host: str = "", jpegQuality: int = 80):
+        self._host: str = host
+        self._port: int = port
+        self._encodeParams: list = [cv2.IMWRITE_JPEG_QUALITY, jpegQuality]
+
+        self._broadcaster: FrameBroadcaster = FrameBroadcaster()
+        self._server: ThreadingHTTPServer = None
+        self._serverThread: Thread = None
+
+        self._encodedFrames: int = 0
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server else self._port
+
+    @property
+    def encoded_frames(self) -> int:
+        return self._encodedFrames
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._broadcaster.dropped_frames
+
+    @property
+    def num_of_clients(self) -> int:
+        return self._broadcaster.num_of_clients
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self._host, self._port), MjpegRequestHandler)
+        self._server.daemon_threads = True
+        self._server.broadcaster = self._broadcaster
+
+        self._serverThread = Thread(target=self._server.serve_forever, daemon=True)
+        self._serverThread.start()
+
+        print(f"Streaming camera feed on http://<pi address>:{self.port}/stream\n")
+
+    def publish_frame(self, frame) -> None:
+        # encoding is skipped when nobody is watching
+        if not self._broadcaster.num_of_clients:
+            return
+
+        # every frame is encoded once and shared by all connected clients
+        success, jpeg = cv2.imencode(".jpg", frame, self._encodeParams)
+        if not success:
+            return
+
+        self._encodedFrames += 1
+        self._broadcaster.publish(jpeg.tobytes())
+
+    def stop(self) -> None:
+        self._broadcaster.stop()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
@@ -71,6 +71,15 @@ class MotorDriver:
         GPIO.output(self._leftBackward, GPIO.LOW)
         GPIO.output(self._rightBackward, GPIO.LOW)
 
+    def force_stop(self) -> None:
+        # drives every motor pin low without relying on the setup done in the command process,
+        # used when that process has died and might have left the motors running, the pins are kept as outputs
+        # so the motor driver inputs don't float until the restarted command process sets them up again
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setwarnings(False)
+        for pin in self.pins:
+            GPIO.setup(pin, GPIO.OUT, initial=GPIO.LOW)
+
     def cleanup(self) -> None:
         self._pwmA.stop()
         self._pwmB.stop()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import subprocess
+from contextlib import contextmanager
+from frameSource import FrameSource
+from exceptions import CameraNotFoundException
+
+
+class PicameraSource(FrameSource):
+    def __init__(self, resolution: tuple, rotation: bool = True):
+        super().__init__(resolution)
+        self._rotation: bool = rotation
+
+        self._picam2 = None
+        self._MappedArray = None
+
+    @staticmethod
+    def load_modules() -> None:
+        # only imports the modules, the camera is not opened until start is called
+        os.environ["LIBCAMERA_LOG_LEVELS"] = "3" #disable info and warning logging
+        import picamera2
+        import libcamera
+
+    def check_if_available(self) -> None:
+        # the cameras are listed by a separate program since libcamera can't be used in this process
+        # before the capture process is forked from it
+        command: str = shutil.which("rpicam-hello") or shutil.which("libcamera-hello")
+        if not command:
+            return
+
+        result = subprocess.run([command, "--list-cameras"], capture_output=True, text=True)
+        if result.returncode or "No cameras available" in result.stdout:
+            raise CameraNotFoundException("No camera detected. Check that the camera cable is connected")
+
+    def start(self) -> None:
+        # imported here so the rest of the camera pipeline also runs on machines without a camera
+        self.load_modules()
+        from picamera2 import Picamera2, MappedArray
+
+        self._MappedArray = MappedArray
+        self._picam2 = Picamera2()
+
+        self._picam2.configure(self._get_camera_config())
+        self._picam2.start()
+
+    @contextmanager
+    def capture_frame(self):
+        # the frame is read straight from the camera buffer, flipping is already done by the camera
+        request = self._picam2.capture_request()
+        try:
+            with self._MappedArray(request, "main") as mappedArray:
+                yield mappedArray.array
+        finally:
+            request.release()
+
+    def set_resolution(self, resolution: tuple) -> None:
+        super().set_resolution(resolution)
+
+        self._picam2.stop()
+        self._picam2.configure(self._get_camera_config())
+        self._picam2.start()
+
+    def use_hardware_zoom(self, zoomEngine) -> bool:
+        return zoomEngine.use_camera_controls(self._picam2)
+
+    def close(self) -> None:
+        if self._picam2:
+            self._picam2.close()
+
+    def _get_camera_config(self):
+        from libcamera import Transform
+
+        # set resolution, format and rotation of camera feed
+        return self._picam2.create_preview_configuration(
+            {"size": (self._width, self._height), "format": "RGB888"},
+            transform=Transform(hflip=int(self._rotation), vflip=int(self._rotation))
+        )
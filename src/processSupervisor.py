@@ -0,0 +1,148 @@
+from multiprocessing import Process
+from multiprocessing.sharedctypes import RawValue
+from threading import Thread
+from time import monotonic
+
+
+class Heartbeat:
+    def __init__(self):
+        # monotonic time of the last beat, shared so the supervisor in the main process can read it
+        self._time = RawValue('d', 0.0)
+
+    @property
+    def time(self) -> float:
+        return self._time.value
+
+    def beat(self) -> None:
+        self._time.value = monotonic()
+
+    def reset(self) -> None:
+        self._time.value = 0.0
+
+
+class ProcessSupervisor:
+    def __init__(self, shutdown, heartbeatTimeout: float = 5.0, checkInterval: float = 0.5, minBackoff: float = 0.5,
+                 maxBackoff: float = 10.0, stableTime: float = 30.0):
+        self._shutdown = shutdown
+
+        # a worker is restarted when it dies or hasn't sent a heartbeat for heartbeatTimeout seconds
+        self._heartbeatTimeout: float = heartbeatTimeout
+        self._checkInterval: float = checkInterval
+
+        # the wait before a restart doubles for every failure in a row, a worker that has run for
+        # stableTime seconds starts over at minBackoff
+        self._minBackoff: float = minBackoff
+        self._maxBackoff: float = maxBackoff
+        self._stableTime: float = stableTime
+
+        self._workers: list[dict] = []
+        self._monitorThread: Thread = None
+
+    @property
+    def processes(self) -> list[Process]:
+        return [worker["process"] for worker in self._workers if worker["process"]]
+
+    @property
+    def stats(self) -> dict[str: dict]:
+        return {
+            worker["name"]: {"restarts": worker["restarts"], "recoveryTimes": list(worker["recoveryTimes"])}
+            for worker in self._workers
+        }
+
+    def add_worker(self, name: str, target, args: tuple = (), onFailure=None) -> None:
+        # the worker gets its heartbeat as the last argument and should beat at least every heartbeatTimeout,
+        # onFailure is called in the main process before the worker is restarted
+        self._workers.append({
+            "name": name,
+            "target": target,
+            "args": args,
+            "onFailure": onFailure,
+            "heartbeat": Heartbeat(),
+            "process": None,
+            "startTime": 0.0,
+            "restartTime": 0.0,
+            "failureTime": 0.0,
+            "failuresInARow": 0,
+            "restarts": 0,
+            "recoveryTimes": []
+        })
+
+    def start(self) -> None:
+        for worker in self._workers:
+            self._start_worker(worker)
+
+        self._monitorThread = Thread(target=self._monitor_workers, daemon=True)
+        self._monitorThread.start()
+
+    def stop(self) -> None:
+        # the monitor stops on its own when shutting down, this waits for a restart in progress to finish
+        if self._monitorThread:
+            self._monitorThread.join()
+
+    def print_stats(self) -> None:
+        for name, stats in self.stats.items():
+            if not stats["restarts"]:
+                continue
+
+            recoveryTimes: str = ", ".join(f"{recoveryTime:.1f}" for recoveryTime in stats["recoveryTimes"])
+            print(f"Process {name} was restarted {stats['restarts']} times, time to recover (s): {recoveryTimes}")
+
+    def _monitor_workers(self) -> None:
+        while not self._shutdown.wait(self._checkInterval):
+            for worker in self._workers:
+                self._check_worker(worker)
+
+    def _check_worker(self, worker: dict) -> None:
+        now: float = monotonic()
+
+        # waiting for the backoff to pass before restarting
+        if worker["restartTime"]:
+            if now >= worker["restartTime"]:
+                self._start_worker(worker)
+            return
+
+        heartbeatTime: float = worker["heartbeat"].time
+        if worker["failureTime"] and heartbeatTime > worker["startTime"]:
+            worker["recoveryTimes"].append(heartbeatTime - worker["failureTime"])
+            worker["failureTime"] = 0.0
+
+        process: Process = worker["process"]
+        lastSignOfLife: float = max(heartbeatTime, worker["startTime"])
+        if process.is_alive() and now - lastSignOfLife < self._heartbeatTimeout:
+            if now - worker["startTime"] > self._stableTime:
+                worker["failuresInARow"] = 0
+            return
+
+        # the process might have stopped because we are shutting down
+        if self._shutdown.is_set():
+            return
+
+        if process.is_alive():
+            print(f"Process {worker['name']} has not responded for {now - lastSignOfLife:.1f} seconds, restarting it")
+            process.terminate()
+            process.join(1.0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        else:
+            print(f"Process {worker['name']} stopped with exit code {process.exitcode}, restarting it")
+
+        if worker["onFailure"]:
+            worker["onFailure"]()
+
+        backoff: float = min(self._minBackoff * 2 ** worker["failuresInARow"], self._maxBackoff)
+        worker["failuresInARow"] += 1
+        worker["failureTime"] = now
+        worker["restartTime"] = now + backoff
+
+    def _start_worker(self, worker: dict) -> None:
+        if worker["process"]:
+            worker["restarts"] += 1
+
+        worker["heartbeat"].reset()
+        worker["startTime"] = monotonic()
+        worker["restartTime"] = 0.0
+
+        process = Process(target=worker["target"], args=(*worker["args"], worker["heartbeat"]), name=worker["name"])
+        process.start()
+        worker["process"] = process
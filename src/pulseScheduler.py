@@ -0,0 +1,93 @@
+import heapq
+from threading import Condition, Thread
+from time import monotonic
+
+
+class PulseScheduler:
+    def __init__(self, output):
+        # output(pin, value) sets a pin high or low, e.g. GPIO.output
+        self._output = output
+
+        # pins that are high and when they should be turned off, the heap holds the off times in order,
+        # entries that were replaced by a longer pulse on the same pin are skipped when they come up
+        self._offTimes: dict[int: float] = {}
+        self._heap: list[tuple] = []
+
+        self._condition = Condition()
+        self._thread: Thread = None
+        self._running: bool = False
+
+    @property
+    def active_pins(self) -> list[int]:
+        with self._condition:
+            return list(self._offTimes)
+
+    def start(self) -> None:
+        # must be called in the process that pulses the pins, threads don't survive a fork
+        if self._thread:
+            return
+
+        self._running = True
+        self._thread = Thread(target=self._turn_off_pins, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        # don't leave a light or the horn on
+        self.cancel()
+
+    def cancel(self) -> None:
+        # turns off every pin that is pulsing right away
+        with self._condition:
+            for pin in self._offTimes:
+                self._output(pin, False)
+
+            self._offTimes.clear()
+            self._heap.clear()
+
+    def pulse(self, pins, duration: float) -> None:
+        # sets the pins high right away and returns, the pins are turned off after duration seconds,
+        # a pulse on a pin that is already high only extends it
+        if isinstance(pins, int):
+            pins = [pins]
+
+        with self._condition:
+            offTime: float = monotonic() + duration
+            for pin in pins:
+                currentOffTime: float = self._offTimes.get(pin)
+                if currentOffTime is None:
+                    self._output(pin, True)
+                elif currentOffTime >= offTime:
+                    continue
+
+                self._offTimes[pin] = offTime
+                heapq.heappush(self._heap, (offTime, pin))
+
+            self._condition.notify()
+
+    def _turn_off_pins(self) -> None:
+        with self._condition:
+            while self._running:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                offTime, pin = self._heap[0]
+                timeLeft: float = offTime - monotonic()
+                if timeLeft > 0:
+                    self._condition.wait(timeLeft)
+                    continue
+
+                heapq.heappop(self._heap)
+                if self._offTimes.get(pin) != offTime:
+                    continue
+
+                del self._offTimes[pin]
+                self._output(pin, False)
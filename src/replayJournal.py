@@ -0,0 +1,71 @@
+import simulatedGpio
+simulatedGpio.install() # before anything imports RPi.GPIO or pigpio
+
+import argparse
+from time import monotonic, sleep
+from commandJournal import CommandJournal
+from commandTrace import CommandTrace
+from shutdownCoordinator import ShutdownCoordinator
+from telemetry import Telemetry
+import main
+
+# run with python replayJournal.py <journal file> to run the commands in a journal through the command handler
+# against a simulated GPIO, e.g. to reproduce a crash or to benchmark the command handling on any machine
+
+
+def replay_journal(commandHandler, records: list[tuple], originalSpeed: bool) -> tuple:
+    # returns the time it took and the commands that got a different validity than when they were journaled
+    telemetry = Telemetry()
+    mismatches: list[tuple] = []
+
+    firstReceivedTime: float = records[0][1]
+    tStart: float = monotonic()
+    for _, receivedTime, _, macroStep, validity, command in records:
+        # wait until the command is due when replaying at the original pace
+        if originalSpeed:
+            waitTime: float = (receivedTime - firstReceivedTime) - (monotonic() - tStart)
+            if waitTime > 0:
+                sleep(waitTime)
+
+        # macro steps are run like they were during the drive, a stop step doesn't take the stop fast path
+        replayedValidity: str = commandHandler.run_command(CommandTrace(command), telemetry, macroStep=macroStep)
+        if replayedValidity is None:
+            break
+
+        if replayedValidity != validity:
+            mismatches.append((command, validity, replayedValidity))
+
+    return monotonic() - tStart, mismatches
+
+
+def main_replay() -> None:
+    argParser = argparse.ArgumentParser(description="Replay a command journal against a simulated GPIO")
+    argParser.add_argument("journal_file")
+    argParser.add_argument("--max-speed", action="store_true", help="run the commands back to back")
+    args = argParser.parse_args()
+
+    records: list[tuple] = list(CommandJournal.read(args.journal_file))
+    if not records:
+        print(f"No commands in {args.journal_file}")
+        return
+
+    parser = main.read_config()
+    simulatedGpio.setmode(simulatedGpio.BOARD)
+    commandHandler = main.setup_command_handler(parser, recordCommands=False)
+    commandHandler.setup()
+    simulatedGpio.reset()
+
+    try:
+        replayTime, mismatches = replay_journal(commandHandler, records, not args.max_speed)
+    finally:
+        commandHandler.cleanup(ShutdownCoordinator())
+
+    print(f"Replayed {len(records)} commands in {replayTime:.3f} s ({len(records) / replayTime:.0f} commands/s), "
+          f"{simulatedGpio.stats['writes']} GPIO writes")
+
+    for command, validity, replayedValidity in mismatches:
+        print(f"'{command}' was {validity} when journaled but {replayedValidity} when replayed")
+
+
+if __name__ == "__main__":
+    main_replay()
@@ -0,0 +1,67 @@
+import numpy as np
+from frameSource import FrameSource
+from roboCarHelper import RobocarHelper
+
+cv2 = RobocarHelper.lazy_import("cv2")
+
+
+class ReplaySource(FrameSource):
+    def __init__(self, resolution: tuple, filePath: str, fps: float = 30.0):
+        super().__init__(resolution, fps)
+        self._filePath: str = filePath
+
+        # .npy stacks of frames are memory mapped, anything else is decoded with OpenCV
+        self._frames = None
+        self._frameIndex: int = 0
+        self._videoCapture = None
+
+        self._readBuffer = None
+        self._resizeBuffer = None
+
+    def start(self) -> None:
+        super().start()
+
+        if self._filePath.endswith(".npy"):
+            # pages are only read from disk when a frame is used
+            self._frames = np.load(self._filePath, mmap_mode="r")
+        else:
+            self._videoCapture = cv2.VideoCapture(self._filePath)
+            if not self._videoCapture.isOpened():
+                raise FileNotFoundError(f"Could not open {self._filePath} for replay")
+
+    def close(self) -> None:
+        if self._videoCapture:
+            self._videoCapture.release()
+
+        self._frames = None
+
+    def _read_frame(self):
+        frame = self._read_next_frame()
+
+        # frames are scaled to the requested resolution, e.g. when the governor lowers it
+        if frame.shape[:2] != (self._height, self._width):
+            if self._resizeBuffer is None or self._resizeBuffer.shape[:2] != (self._height, self._width):
+                self._resizeBuffer = np.empty((self._height, self._width, 3), dtype=np.uint8)
+            frame = cv2.resize(frame, (self._width, self._height), dst=self._resizeBuffer,
+                               interpolation=cv2.INTER_LINEAR)
+
+        return frame
+
+    def _read_next_frame(self):
+        if self._frames is not None:
+            frame = self._frames[self._frameIndex]
+            self._frameIndex = (self._frameIndex + 1) % len(self._frames)
+
+            return frame
+
+        # decode into the same buffer every time and start over at the end of the video
+        success, frame = self._videoCapture.read(self._readBuffer)
+        if not success:
+            self._videoCapture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self._videoCapture.read(self._readBuffer)
+            if not success:
+                raise ValueError(f"No frames could be read from {self._filePath}")
+
+        self._readBuffer = frame
+
+        return frame
@@ -1,5 +1,14 @@
+import importlib.util
+import sys
+import types
 from raspberryPiPins import RaspberryPiPins
 
+class MissingModule(types.ModuleType):
+    # stands in for a module that isn't installed, the error is raised where the module is first used,
+    # so tools like replayJournal.py run without the speech and camera modules
+    def __getattr__(self, name: str):
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name=self.__name__)
+
 class RobocarHelper:
     def __init__(self):
         pass
@@ -42,6 +51,38 @@ class RobocarHelper:
         print("Something went wrong during startup. Exiting...")
         print(error)
 
+    @staticmethod
+    def lazy_import(moduleName: str):
+        # the module is only executed when one of its attributes is first used, so heavy modules are
+        # only loaded by the processes that actually use them
+        if moduleName in sys.modules:
+            return sys.modules[moduleName]
+
+        # a submodule like RPi.GPIO raises instead when its package isn't installed
+        try:
+            spec = importlib.util.find_spec(moduleName)
+        except ModuleNotFoundError:
+            spec = None
+        if spec is None:
+            return MissingModule(moduleName)
+
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[moduleName] = module
+        loader.exec_module(module)
+
+        return module
+
+    @staticmethod
+    def load_module(moduleName: str) -> None:
+        # any attribute access runs a lazily imported module
+        module = RobocarHelper.lazy_import(moduleName)
+        if isinstance(module, MissingModule):
+            raise ModuleNotFoundError(f"No module named '{moduleName}'", name=moduleName)
+
+        module.__name__
+
     @staticmethod
     def round_nearest(x, a) -> float:
         return round(x / a) * a
@@ -1,9 +1,10 @@
 from exceptions import InvalidPinException, OutOfRangeException, InvalidCommandException
 from raspberryPiPins import RaspberryPiPins
+from commandRegistry import CommandRegistry
 
 class RoboObject:
-    _boardPinsInUse: list[int] = []
-    _commandsInUse: list[str] = []
+    # pins and commands in use by all robo objects, shared with the command handler
+    _commandRegistry: CommandRegistry = CommandRegistry()
 
     def __init__(self, pins: list, commands: dict, **kwargs):
         piPins = RaspberryPiPins()
@@ -17,18 +18,65 @@ class RoboObject:
         pass
 
     def get_command_validity(self, command: str) -> str:
-        pass
+        dispatch: tuple = self._find_command_dispatch(command)
+        if not dispatch:
+            return "invalid"
+
+        _, validate, _, args = dispatch
+        return validate(*args)
 
     def print_commands(self) -> None:
         pass
 
     def handle_voice_command(self, command: str) -> None:
+        dispatch: tuple = self._find_command_dispatch(command)
+        if dispatch:
+            _, _, run, args = dispatch
+            run(*args)
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        # every command mapped to (channel, validator, action), built once so running a command needs no branching,
+        # the validator returns "valid" or "partially valid" and both are called without arguments
+        return {}
+
+    def get_template_dispatch(self) -> list[tuple]:
+        # (template, channel, validator, action) for commands with a {param} placeholder,
+        # the validator and the action are called with the value in the command
+        return []
+
+    def get_voice_commands(self) -> list[str]:
+        return list(self.get_command_dispatch())
+
+    def get_command_templates(self) -> list:
+        # commands with a {param} placeholder, matched by the command grammar instead of listing every value
+        return [template for template, _, _, _ in self.get_template_dispatch()]
+
+    def cancel_timed_actions(self) -> None:
+        # called when a stop command is given, to end actions that would otherwise go on for a while
         pass
 
+    def get_command_channel(self, command: str) -> str:
+        # commands on the same channel overwrite each other, so only the last one in a batch of commands is run,
+        # commands that change a value step by step, like "go faster", have None as channel and are all run
+        dispatch: tuple = self._find_command_dispatch(command)
+        return dispatch[0] if dispatch else ""
+
+    def _find_command_dispatch(self, command: str) -> tuple:
+        # returns (channel, validator, action, arguments) for the command, or None when it isn't one of ours
+        commandDispatch: dict[str: tuple] = self.get_command_dispatch()
+        if command in commandDispatch:
+            return (*commandDispatch[command], ())
+
+        for template, channel, validate, run in self.get_template_dispatch():
+            value = template.parse(command)
+            if value is not None:
+                return channel, validate, run, (value,)
+
+        return None
+
     def _check_argument_validity(self, pins: list[int], commands: dict[str, str], **kwargs) -> None:
         self._check_if_pins_are_valid(pins)
         self._check_command_length(commands)
-        self._check_if_command_already_exists(commands)
 
     def _check_if_num_is_in_interval(self, num: int, lowerBound: int, upperBound: int, variableName: str) -> None:
         if num < lowerBound or num > upperBound:
@@ -41,17 +89,7 @@ class RoboObject:
                 raise InvalidPinException(f"Pin argument '{pin}' is not a valid pin number")
 
             # check that pin has not already been specified by another robo object class
-            if pin in self._boardPinsInUse:
-                raise InvalidPinException(f"Pin {pin} is already in use")
-
-            self._add_pin_to_board_pins_in_use(pin)
-
-    def _check_if_command_already_exists(self, commands: dict[str, str]) -> None:
-        for command in list(commands.keys()):
-            if command in self._commandsInUse:
-                raise InvalidCommandException(f"Command {command} already exists")
-
-            self._add_command_to_commands_in_use(command)
+            self._commandRegistry.register_pin(pin)
 
     def _check_if_num_is_greater_than_or_equal_to_number(self, num: int, lowerBound: int, variableName: str) -> None:
         if num <= lowerBound:
@@ -78,14 +116,20 @@ class RoboObject:
     def _format_command(self, command: str, param: str) -> str:
         return command.format(param=param)
 
-    @classmethod
-    def _add_pin_to_board_pins_in_use(cls, pin: int) -> None:
-        cls._boardPinsInUse.append(pin)
-
-    @classmethod
-    def _add_command_to_commands_in_use(cls, command: str) -> None:
-        cls._commandsInUse.append(command)
-
+    def _register_commands(self) -> None:
+        # called at the end of __init__ once the dispatch table is built, every command and template is checked
+        # against the ones other robo objects already registered
+        for command, (channel, validate, run) in self.get_command_dispatch().items():
+            self._commandRegistry.register_command(command, (self, channel, validate, run))
 
+        for template, channel, validate, run in self.get_template_dispatch():
+            self._commandRegistry.register_template(template, (self, channel, validate, run))
 
+    @classmethod
+    def get_command_registry(cls) -> CommandRegistry:
+        return cls._commandRegistry
 
+    @classmethod
+    def reset_command_registry(cls) -> None:
+        # forgets the pins and commands of every robo object created so far
+        cls._commandRegistry.reset()
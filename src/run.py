@@ -1,11 +1,12 @@
 import RPi.GPIO as GPIO
+import os
 import subprocess
-from time import sleep
+import sys
+import traceback
+from time import monotonic, sleep
 from configparser import ConfigParser
 from os import path
 
-GPIO.setmode(GPIO.BOARD)
-
 # set up parser to read input values
 parser = ConfigParser()
 parser.read(path.join(path.dirname(__file__), 'config.ini'))
@@ -17,22 +18,76 @@ except ValueError:
     print("Invalid start button pin value")
     exit()
 
-# get full path to run file
-repoPath = parser["Repo.path"]["path"]
-runFileFullPath: str = path.join(repoPath, "RoboCar_3.0/src/main.py")
-if not path.exists(runFileFullPath):
-    print("Invalid repo path")
+launcher: str = parser["Start.button"]["launcher"]
+if launcher not in ("subprocess", "prefork"):
+    print("Invalid launcher, should be subprocess or prefork")
     exit()
 
-GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+if launcher == "prefork":
+    # keep the modules loaded in this process, so a launch only has to set up the hardware
+    import main
+    main.load_heavy_modules()
+else:
+    # get full path to run file
+    repoPath = parser["Repo.path"]["path"]
+    runFileFullPath: str = path.join(repoPath, "RoboCar_3.0/src/main.py")
+    if not path.exists(runFileFullPath):
+        print("Invalid repo path")
+        exit()
 
-try:
-    while True:
+
+def wait_for_button_press() -> float:
+    GPIO.setmode(GPIO.BOARD)
+    GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+
+    try:
         print("Waiting for button press...")
         GPIO.wait_for_edge(pin, GPIO.FALLING)
+        buttonPressTime: float = monotonic()
         sleep(0.3) # wait for a little while to avoid double registrations of button press
-        subprocess.run(['python', runFileFullPath])
+    finally:
+        # release the pin so every launch starts without GPIO state from this process
+        GPIO.cleanup()
+
+    return buttonPressTime
+
+
+def launch_subprocess(buttonPressTime: float) -> None:
+    # main.py reports its startup timeline from the moment the button was pressed
+    subprocess.run(['python', runFileFullPath], env={**os.environ, "ROBOCAR_START_TIME": str(buttonPressTime)})
+
+
+def launch_prefork(buttonPressTime: float) -> None:
+    sys.stdout.flush() # avoid printing buffered output twice
+    pid: int = os.fork()
+    if pid == 0:
+        exitCode: int = 0
+        try:
+            main.main(parser, buttonPressTime)
+        except SystemExit as e:
+            exitCode = e.code if isinstance(e.code, int) else 0
+        except BaseException:
+            traceback.print_exc()
+            exitCode = 1
+        finally:
+            # never return to the launcher loop in the child
+            sys.stdout.flush()
+            os._exit(exitCode)
+
+    try:
+        os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        # ctrl+c also reaches the child, let it stop the car before exiting
+        os.waitpid(pid, 0)
+        raise
+
+
+try:
+    while True:
+        pressTime: float = wait_for_button_press()
+        if launcher == "prefork":
+            launch_prefork(pressTime)
+        else:
+            launch_subprocess(pressTime)
 except KeyboardInterrupt:
     pass
-finally:
-    GPIO.cleanup()
\ No newline at end of file
@@ -1,8 +1,11 @@
-import pigpio
 from roboCarHelper import RobocarHelper
+from exceptions import PigpioDaemonException
+
+pigpio = RobocarHelper.lazy_import("pigpio")
 
 class Servo:
-    pi = pigpio.pi()
+    # shared connection to the pigpio daemon, opened on first use in the process that drives the servos
+    _pi = None
 
     def __init__(self, pin: int):
         self._servoPin: int = RobocarHelper.get_board_to_bcm_pins()[pin]
@@ -14,6 +17,15 @@ class Servo:
 
         self._current_angle: int = 0
 
+    @staticmethod
+    def check_if_daemon_running() -> None:
+        pi = pigpio.pi()
+        connected: bool = pi.connected
+        pi.stop()
+
+        if not connected:
+            raise PigpioDaemonException("pigpio daemon not running. Start it with 'sudo pigpiod'")
+
     def setup(self) -> None:
         self.pi.set_mode(self._servoPin, pigpio.OUTPUT)
         self.move_to_angle(0)
@@ -25,6 +37,13 @@ class Servo:
         self.pi.set_servo_pulsewidth(self._servoPin, self._angleToPwm[angle])
         self._current_angle = angle
 
+    @property
+    def pi(self):
+        if Servo._pi is None:
+            Servo._pi = pigpio.pi()
+
+        return Servo._pi
+
     @property
     def servoPin(self) -> int:
         return RobocarHelper.get_bcm_to_board_pins()[self._servoPin]
@@ -0,0 +1,77 @@
+from multiprocessing import Event
+from multiprocessing.sharedctypes import RawValue
+from time import monotonic
+
+
+class ShutdownCoordinator:
+    def __init__(self, deadline: float = 3.0, carStopTarget: float = 0.5, terminateTimeout: float = 1.0):
+        # every process waits on the same event, so no loop has to poll a flag to notice the shutdown
+        self._event = Event()
+
+        # processes get this long to clean up before they are terminated
+        self._deadline: float = deadline
+        self._terminateTimeout: float = terminateTimeout
+
+        # time from the shutdown request until the motors are stopped, warned about when above the target
+        self._carStopTarget: float = carStopTarget
+        self._requestTime = RawValue('d', 0.0)
+        self._carStoppedTime = RawValue('d', 0.0)
+
+        # queues that processes block on, they get a wake up value so readers notice the shutdown right away
+        self._queues: list = []
+
+    @property
+    def deadline(self) -> float:
+        return self._deadline
+
+    def add_queue(self, queue) -> None:
+        # must be called before the processes are started
+        self._queues.append(queue)
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._event.wait(timeout)
+
+    def request(self, reason: str) -> None:
+        if self._event.is_set():
+            return
+
+        self._requestTime.value = monotonic()
+        self._event.set()
+        print(f"Shutting down: {reason}")
+
+        for queue in self._queues:
+            queue.put(None)
+
+    def set_car_stopped(self) -> None:
+        if self._event.is_set() and not self._carStoppedTime.value:
+            self._carStoppedTime.value = monotonic()
+
+    def join_processes(self, processes: list) -> None:
+        # join every process within the same deadline and escalate to terminate and kill for the ones that miss it
+        deadlineTime: float = monotonic() + self._deadline
+        for process in processes:
+            process.join(max(deadlineTime - monotonic(), 0.0))
+            if not process.is_alive():
+                continue
+
+            print(f"Process {process.name} did not finish within {self._deadline} seconds, terminating it")
+            process.terminate()
+            process.join(self._terminateTimeout)
+
+            if process.is_alive():
+                print(f"Process {process.name} did not terminate, killing it")
+                process.kill()
+                process.join()
+
+    def print_stop_time(self) -> None:
+        if not self._carStoppedTime.value:
+            print("Car stop time was not recorded")
+            return
+
+        stopTime: float = self._carStoppedTime.value - self._requestTime.value
+        print(f"Time to stopped car after shutdown request: {stopTime * 1000:.0f} ms")
+        if stopTime > self._carStopTarget:
+            print(f"Warning: stopping the car took longer than the target of {self._carStopTarget * 1000:.0f} ms")
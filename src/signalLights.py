@@ -1,6 +1,7 @@
 import RPi.GPIO as GPIO
 from time import sleep
 from roboObject import RoboObject
+from pulseScheduler import PulseScheduler
 
 class SignalLights(RoboObject):
     def __init__(self, greenLightPin: int, yellowLightPin: int, redLightPin: int, blinkTime: float):
@@ -17,6 +18,9 @@ class SignalLights(RoboObject):
         }
         self._blinkTime: float = blinkTime
 
+        # blinks are turned off in the background so commands don't wait for them
+        self._pulseScheduler: PulseScheduler = PulseScheduler(GPIO.output)
+
     def setup(self) -> None:
         for pin in self._lightPins.values():
             GPIO.setup(pin, GPIO.OUT)
@@ -24,18 +28,17 @@ class SignalLights(RoboObject):
         # blink three times in rapid sucession to signal startup
         self._blink_all_lights()
 
+        self._pulseScheduler.start()
+
     def cleanup(self) -> None:
+        self._pulseScheduler.stop()
         self._blink_all_lights() # blink to signal that class is shutting down
 
-    def blink(self, color: str) -> None:
-        pin: int = self._lightPins[color]
+    def cancel_timed_actions(self) -> None:
+        self._pulseScheduler.cancel()
 
-        # turn on light
-        GPIO.output(pin, GPIO.HIGH)
-        sleep(self._blinkTime)
-
-        # turn off light
-        GPIO.output(pin, GPIO.LOW)
+    def blink(self, color: str) -> None:
+        self._pulseScheduler.pulse(self._lightPins[color], self._blinkTime)
 
     def _blink_all_lights(self) -> None:
         timeBetweenBlinks: float = 0.1
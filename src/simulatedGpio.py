@@ -0,0 +1,114 @@
+import sys
+import types
+from time import monotonic
+
+# stands in for RPi.GPIO and pigpio so the command handling can run on any machine, e.g. when replaying a journal,
+# call install() before anything imports RPi.GPIO or pigpio
+
+BOARD = 10
+BCM = 11
+OUT = 0
+IN = 1
+HIGH = 1
+LOW = 0
+PUD_UP = 22
+PUD_DOWN = 21
+RISING = 31
+FALLING = 32
+
+# pigpio
+OUTPUT = 1
+
+# last value written to every pin, PWM pins hold the duty cycle and servo pins (BCM numbers) the pulse width
+pinStates: dict = {}
+servoPulseWidths: dict = {}
+# pins set up as outputs and not cleaned up yet
+claimedPins: set = set()
+stats: dict = {"writes": 0, "lastWriteTime": 0.0}
+
+
+def install() -> None:
+    module = sys.modules[__name__]
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = module
+
+    sys.modules["RPi"] = rpi
+    sys.modules["RPi.GPIO"] = module
+    sys.modules["pigpio"] = module
+
+
+def reset() -> None:
+    pinStates.clear()
+    servoPulseWidths.clear()
+    claimedPins.clear()
+    stats.update(writes=0, lastWriteTime=0.0)
+
+
+def _write(states: dict, pin: int, value: float) -> None:
+    states[pin] = value
+    stats["writes"] += 1
+    stats["lastWriteTime"] = monotonic()
+
+
+# RPi.GPIO
+def setmode(mode: int) -> None:
+    pass
+
+
+def setwarnings(flag: bool) -> None:
+    pass
+
+
+def setup(pin: int, mode: int, pull_up_down: int = None, initial: int = LOW) -> None:
+    if mode == OUT:
+        pinStates[pin] = initial
+        claimedPins.add(pin)
+
+
+def output(pin: int, value) -> None:
+    _write(pinStates, pin, int(value))
+
+
+def input(pin: int) -> int:
+    return pinStates.get(pin, LOW)
+
+
+def wait_for_edge(pin: int, edge: int, timeout: int = None):
+    # there is no button to press
+    return None
+
+
+def cleanup(pins=None) -> None:
+    # releases the given pins, or every pin, the last value written is kept in pinStates
+    if pins is None:
+        claimedPins.clear()
+    else:
+        claimedPins.difference_update([pins] if isinstance(pins, int) else pins)
+
+
+class PWM:
+    def __init__(self, pin: int, frequency: float):
+        self._pin: int = pin
+
+    def start(self, dutyCycle: float) -> None:
+        _write(pinStates, self._pin, dutyCycle)
+
+    def ChangeDutyCycle(self, dutyCycle: float) -> None:
+        _write(pinStates, self._pin, dutyCycle)
+
+    def stop(self) -> None:
+        _write(pinStates, self._pin, 0)
+
+
+# pigpio
+class pi:
+    connected: bool = True
+
+    def set_mode(self, pin: int, mode: int) -> None:
+        pass
+
+    def set_servo_pulsewidth(self, pin: int, pulseWidth: float) -> None:
+        _write(servoPulseWidths, pin, pulseWidth)
+
+    def stop(self) -> None:
+        pass
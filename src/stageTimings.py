@@ -0,0 +1,63 @@
+import numpy as np
+from bisect import bisect_left
+from multiprocessing.sharedctypes import RawArray
+from time import perf_counter
+
+
+class StageTimings:
+    def __init__(self, stages: list[str], numOfBins: int = 64, minTime: float = 1e-5, maxTime: float = 1.0):
+        self._stages: list[str] = stages
+        self._stageIndexes: dict[str: int] = {stage: index for index, stage in enumerate(stages)}
+        self._numOfBins: int = numOfBins
+
+        # logarithmically spaced bins, anything outside the range ends up in the first or last bin
+        self._binEdges: list[float] = [float(edge) for edge in np.geomspace(minTime, maxTime, numOfBins - 1)]
+
+        # one histogram per stage in shared memory, each stage is only written by the process running it,
+        # so no lock is needed and readers in other processes never slow down the camera loop
+        self._counts = RawArray('Q', len(stages) * numOfBins)
+
+        self._lapStart: float = 0.0
+
+    def start(self) -> None:
+        self._lapStart = perf_counter()
+
+    def lap(self, stage: str) -> None:
+        # records the time since the previous lap, or since start, as the duration of the given stage
+        now: float = perf_counter()
+        self.record(stage, now - self._lapStart)
+        self._lapStart = now
+
+    def record(self, stage: str, duration: float) -> None:
+        self._counts[self._stageIndexes[stage] * self._numOfBins + bisect_left(self._binEdges, duration)] += 1
+
+    def get_percentiles(self, stage: str, percentiles: tuple = (50, 95, 99)) -> dict[int: float]:
+        start: int = self._stageIndexes[stage] * self._numOfBins
+        counts = np.array(self._counts[start:start + self._numOfBins], dtype=np.uint64)
+
+        total: int = int(counts.sum())
+        if not total:
+            return {percentile: None for percentile in percentiles}
+
+        cumulativeCounts = np.cumsum(counts)
+        upperEdges: list[float] = self._binEdges + [float("inf")]
+
+        # report the upper edge of the bin where the percentile falls
+        return {
+            percentile: upperEdges[int(np.searchsorted(cumulativeCounts, total * percentile / 100))]
+            for percentile in percentiles
+        }
+
+    def print_summary(self) -> None:
+        print("Camera stage timings (ms):")
+        maxStageLength: int = max(len(stage) for stage in self._stages) + 1
+        for stage in self._stages:
+            percentiles: dict = self.get_percentiles(stage)
+            if percentiles[50] is None:
+                continue
+
+            formattedPercentiles: str = ", ".join(
+                f"p{percentile}: {duration * 1000:.2f}" for percentile, duration in percentiles.items()
+            )
+            print(f"{stage.ljust(maxStageLength)}: {formattedPercentiles}")
+        print()
@@ -0,0 +1,39 @@
+from threading import Thread
+from time import monotonic
+from startupTimeline import StartupTimeline
+
+
+class StartupProbes:
+    def __init__(self, timeline: StartupTimeline):
+        self._timeline: StartupTimeline = timeline
+        self._probes: list[tuple] = []
+        self._threads: list[Thread] = []
+        self._errors: list[Exception] = []
+
+    def add_probe(self, name: str, check) -> None:
+        # check raises an exception when the probe fails
+        self._probes.append((name, check))
+
+    def start(self) -> None:
+        # the probes wait on hardware and retry with long sleeps, so they run at the same time instead of
+        # adding up, daemon threads make sure ctrl+c isn't held up by a sleeping probe
+        self._threads = [Thread(target=self._run_probe, args=probe, daemon=True) for probe in self._probes]
+        for thread in self._threads:
+            thread.start()
+
+    def wait(self) -> list[Exception]:
+        for thread in self._threads:
+            thread.join()
+
+        self._timeline.mark("waiting for startup probes")
+
+        return self._errors
+
+    def _run_probe(self, name: str, check) -> None:
+        startTime: float = monotonic()
+        try:
+            check()
+        except Exception as e:
+            self._errors.append(e)
+        finally:
+            self._timeline.add_phase(f"  {name}", startTime, monotonic())
@@ -0,0 +1,39 @@
+import os
+from time import monotonic, strftime
+
+
+class StartupTimeline:
+    def __init__(self, startTime: float = None, logFile: str = None):
+        # run.py passes the time the start button was pressed, monotonic time is shared by all processes
+        if startTime is None:
+            startTime = float(os.environ.get("ROBOCAR_START_TIME", monotonic()))
+        self._startTime: float = startTime
+        self._lastMarkTime: float = self._startTime
+
+        # time to ready is appended to this file for every launch when set
+        self._logFile: str = logFile
+
+        self._phases: list[tuple] = []
+
+    def mark(self, phase: str) -> None:
+        # the phase lasted from the previous mark until now
+        now: float = monotonic()
+        self.add_phase(phase, self._lastMarkTime, now)
+        self._lastMarkTime = now
+
+    def add_phase(self, phase: str, startTime: float, endTime: float) -> None:
+        self._phases.append((phase, startTime, endTime))
+
+    def print_report(self) -> None:
+        print("Startup timeline (s):")
+        maxPhaseLength: int = max(len(phase) for phase, _, _ in self._phases) + 1
+        for phase, startTime, endTime in self._phases:
+            print(f"{phase.ljust(maxPhaseLength)}: {startTime - self._startTime:6.2f} -> "
+                  f"{endTime - self._startTime:6.2f} ({endTime - startTime:.2f})")
+
+        timeToReady: float = self._lastMarkTime - self._startTime
+        print(f"Time to ready: {timeToReady:.2f}\n")
+
+        if self._logFile:
+            with open(self._logFile, "a") as file:
+                file.write(f"{strftime('%Y-%m-%d %H:%M:%S')} time to ready: {timeToReady:.2f} s\n")
@@ -0,0 +1,39 @@
+import numpy as np
+from frameSource import FrameSource
+
+
+class SyntheticSource(FrameSource):
+    def __init__(self, resolution: tuple, fps: float = 30.0, scrollSpeed: int = 4):
+        super().__init__(resolution, fps)
+        self._scrollSpeed: int = scrollSpeed
+
+        self._pattern = None
+        self._offset: int = 0
+
+    def start(self) -> None:
+        super().start()
+        self._pattern = self._get_pattern()
+
+    def set_resolution(self, resolution: tuple) -> None:
+        super().set_resolution(resolution)
+        self._pattern = self._get_pattern()
+        self._offset = 0
+
+    def _read_frame(self):
+        # the pattern repeats every frame width, so a scrolling view of it looks like a moving image
+        # without drawing or allocating anything per frame
+        frame = self._pattern[:, self._offset:self._offset + self._width]
+        self._offset = (self._offset + self._scrollSpeed) % self._width
+
+        return frame
+
+    def _get_pattern(self):
+        x = np.arange(self._width * 2) % self._width
+        y = np.arange(self._height)
+
+        pattern = np.empty((self._height, self._width * 2, 3), dtype=np.uint8)
+        pattern[:, :, 0] = (x * 255 // self._width)[np.newaxis, :]
+        pattern[:, :, 1] = (y * 255 // self._height)[:, np.newaxis]
+        pattern[:, :, 2] = ((x[np.newaxis, :] // 32 + y[:, np.newaxis] // 32) % 2) * 255
+
+        return pattern
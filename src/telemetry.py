@@ -0,0 +1,89 @@
+from ctypes import Structure, addressof, c_bool, c_double, c_int32, c_uint32, c_uint64, memmove, sizeof
+from enum import IntEnum
+from multiprocessing.sharedctypes import RawValue
+from time import sleep
+from zlib import crc32
+
+
+class Direction(IntEnum):
+    STOPPED = 0
+    LEFT = 1
+    RIGHT = 2
+    FORWARD = 3
+    REVERSE = 4
+
+    @classmethod
+    def from_label(cls, label: str) -> "Direction":
+        # the car reports its direction as "Stopped", "Left", ...
+        return cls[label.upper()]
+
+    @property
+    def label(self) -> str:
+        return self.name.capitalize()
+
+
+class TelemetryValues(Structure):
+    _fields_ = [
+        ("hudActive", c_bool),
+        ("recording", c_bool),
+        ("zoom", c_double),
+        ("horizontalAngle", c_int32),
+        ("verticalAngle", c_int32),
+        ("speed", c_int32),
+        ("direction", c_int32)
+    ]
+
+
+class _SharedTelemetry(Structure):
+    # the values are copied in and out together with their checksum
+    _fields_ = [
+        ("values", TelemetryValues),
+        ("checksum", c_uint32)
+    ]
+
+
+class Telemetry:
+    def __init__(self):
+        # seqlock: the version is odd while the values are being written and is bumped again when done,
+        # so readers never take a lock and only retry in the rare case they raced the writer,
+        # the reader and the writer are separate processes on cores that may reorder stores, so the version alone
+        # can't tell a torn copy, the values are stored with their checksum and a copy that doesn't match it is retried
+        self._version = RawValue(c_uint64, 0)
+        self._shared = RawValue(_SharedTelemetry)
+        self._size: int = sizeof(_SharedTelemetry)
+
+        initialValues = TelemetryValues(hudActive=True, zoom=1.0, direction=Direction.STOPPED)
+        self._shared.values = initialValues
+        self._shared.checksum = crc32(bytes(initialValues))
+
+    @property
+    def version(self) -> int:
+        return self._version.value
+
+    def publish(self, values: TelemetryValues) -> None:
+        # only the command handling process writes, so there is no need to guard against other writers
+        if bytes(values) == bytes(self._shared.values):
+            return
+
+        update = _SharedTelemetry(values, crc32(bytes(values)))
+        self._version.value += 1
+        memmove(addressof(self._shared), addressof(update), self._size)
+        self._version.value += 1
+
+    def read(self, values: TelemetryValues, lastVersion: int = -1) -> int:
+        # copies a consistent snapshot into values and returns its version,
+        # values are left untouched when nothing was published since lastVersion
+        snapshot = _SharedTelemetry()
+        while True:
+            version: int = self._version.value
+            if version == lastVersion:
+                return version
+            if version % 2:
+                # the writer was preempted in the middle of publishing, give it the core instead of spinning
+                sleep(0)
+                continue
+
+            memmove(addressof(snapshot), addressof(self._shared), self._size)
+            if crc32(bytes(snapshot.values)) == snapshot.checksum and self._version.value == version:
+                memmove(addressof(values), addressof(snapshot.values), sizeof(TelemetryValues))
+                return version
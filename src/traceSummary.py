@@ -0,0 +1,88 @@
+import argparse
+import glob
+import json
+from configparser import ConfigParser
+from os import path
+
+# run with python traceSummary.py to print how long each stage of the command traces took,
+# every stage is measured from the stage before it
+
+
+def get_default_trace_file() -> str:
+    parser = ConfigParser()
+    parser.read(path.join(path.dirname(__file__), 'config.ini'))
+
+    return path.join(path.dirname(__file__), parser["Trace.specs"]["trace_file"])
+
+
+def read_traces(traceFile: str) -> list[dict]:
+    # the rolled over files are older, so they are read first
+    rolledFiles: list[str] = [
+        file for file in glob.glob(f"{glob.escape(traceFile)}.*") if file.rsplit(".", 1)[-1].isdigit()
+    ]
+    rolledFiles.sort(key=lambda file: int(file.rsplit(".", 1)[-1]), reverse=True)
+
+    traces: list[dict] = []
+    for file in [*rolledFiles, traceFile]:
+        if not path.exists(file):
+            continue
+
+        with open(file) as traceLines:
+            traces.extend(json.loads(line) for line in traceLines if line.strip())
+
+    return traces
+
+
+def get_stage_durations(traces: list[dict]) -> dict[str: list[float]]:
+    # stages are kept in the order they first appear
+    stageDurations: dict[str: list[float]] = {}
+    for trace in traces:
+        if not trace["stages"]:
+            continue
+
+        # the first stage is always at 0, and not every kind of trace starts with the same stage
+        previousTime: float = 0.0
+        for stage, stageTime in trace["stages"][1:]:
+            stageDurations.setdefault(stage, []).append(stageTime - previousTime)
+            previousTime = stageTime
+
+        stageDurations.setdefault("total", []).append(trace["stages"][-1][1])
+
+    return stageDurations
+
+
+def get_percentile(sortedValues: list[float], percentile: float) -> float:
+    # nearest rank
+    index: int = max(0, min(len(sortedValues) - 1, round(percentile / 100 * len(sortedValues)) - 1))
+
+    return sortedValues[index]
+
+
+def print_summary(stageDurations: dict[str: list[float]], numOfTraces: int) -> None:
+    print(f"{numOfTraces} commands traced, times in ms since the stage before")
+    print(f"{'stage':<22}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+
+    for stage, durations in stageDurations.items():
+        sortedDurations: list[float] = sorted(durations)
+        percentiles: list[float] = [get_percentile(sortedDurations, percentile) for percentile in (50, 95, 99)]
+
+        print(f"{stage:<22}{len(durations):>7}" + "".join(f"{value:>10.1f}" for value in percentiles) +
+              f"{sortedDurations[-1]:>10.1f}")
+
+
+def main() -> None:
+    argParser = argparse.ArgumentParser(description="Print per stage percentiles of the command traces")
+    argParser.add_argument("trace_file", nargs="?", help="defaults to trace_file in config.ini")
+    args = argParser.parse_args()
+
+    traceFile: str = args.trace_file or get_default_trace_file()
+    traces: list[dict] = read_traces(traceFile)
+    if not traces:
+        print(f"No traces found in {traceFile}")
+        return
+
+    print_summary(get_stage_durations(traces), len(traces))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import os
+from multiprocessing import Process, Queue, Value
+from queue import Full
+from threading import Thread
+from time import monotonic, strftime
+from roboCarHelper import RobocarHelper
+
+cv2 = RobocarHelper.lazy_import("cv2")
+
+
+class VideoRecorder:
+    def __init__(self, folder: str, segmentSeconds: float, segmentMaxBytes: int, queueSize: int):
+        self._folder: str = folder
+        self._segmentSeconds: float = segmentSeconds
+        self._segmentMaxBytes: int = segmentMaxBytes
+        self._queueSize: int = queueSize
+
+        self._queue: Queue = None
+        self._worker: Process = None
+        self._stats: tuple = None
+        self._finishingThreads: list[Thread] = []
+
+        self._droppedFrames: int = 0
+        self._queuedFrames: int = 0
+
+    @property
+    def recording(self) -> bool:
+        return self._worker is not None
+
+    def start(self, fps: float) -> None:
+        os.makedirs(self._folder, exist_ok=True)
+
+        self._droppedFrames = 0
+        self._queuedFrames = 0
+
+        # written by the encoder process: encoded frames, encoding time and number of segments
+        stats: tuple = (Value('Q', 0), Value('d', 0.0), Value('I', 0))
+
+        self._queue = Queue(maxsize=self._queueSize)
+        self._worker = Process(target=self._encode_frames, args=(self._queue, fps, stats), daemon=True)
+        self._worker.start()
+        self._stats = stats
+
+        print(f"Started recording to {self._folder}")
+
+    def add_frame(self, frame) -> None:
+        # the camera loop must never wait on the encoder, so frames are dropped when the queue is full
+        try:
+            self._queue.put_nowait(frame.copy()) # copy since the camera reuses the buffer
+            self._queuedFrames += 1
+        except Full:
+            self._droppedFrames += 1
+
+    def stop(self) -> None:
+        if not self._worker:
+            return
+
+        # let the encoder finish the queued frames in the background so the camera loop can carry on
+        thread = Thread(
+            target=self._finish_recording,
+            args=(self._worker, self._queue, self._stats, self._queuedFrames, self._droppedFrames)
+        )
+        thread.start()
+        self._finishingThreads.append(thread)
+
+        self._worker = None
+        self._queue = None
+
+    def cleanup(self) -> None:
+        self.stop()
+        for thread in self._finishingThreads:
+            thread.join()
+
+    def _finish_recording(self, worker: Process, queue: Queue, stats: tuple, queuedFrames: int,
+                          droppedFrames: int) -> None:
+        queue.put(None) # tell the encoder that no more frames are coming
+        worker.join()
+
+        encodedFrames, encodeTime, numOfSegments = (stat.value for stat in stats)
+        encodeFps: float = encodedFrames / encodeTime if encodeTime else 0.0
+
+        print(f"Stopped recording: {encodedFrames} frames encoded at {encodeFps:.1f} FPS "
+              f"into {numOfSegments} segments, {droppedFrames} of {queuedFrames + droppedFrames} frames dropped\n")
+
+    def _encode_frames(self, queue: Queue, fps: float, stats: tuple) -> None:
+        encodedFrames, encodeTime, numOfSegments = stats
+
+        writer = None
+        segmentPath: str = ""
+        segmentStart: float = 0.0
+        frameSize: tuple = None
+
+        try:
+            while True:
+                frame = queue.get()
+                if frame is None:
+                    break
+
+                tStart: float = monotonic()
+
+                # start a new segment when the current one is too long, too large or the resolution changed,
+                # the writer flushes to the file in blocks of a few hundred KB, so a segment can be that much larger
+                currentFrameSize: tuple = (frame.shape[1], frame.shape[0])
+                if (writer is None or currentFrameSize != frameSize or
+                        tStart - segmentStart > self._segmentSeconds or
+                        os.path.getsize(segmentPath) > self._segmentMaxBytes):
+                    if writer:
+                        writer.release()
+
+                    frameSize = currentFrameSize
+                    segmentStart = tStart
+                    segmentPath = self._get_segment_path(numOfSegments.value)
+                    writer = cv2.VideoWriter(segmentPath, cv2.VideoWriter_fourcc(*"MJPG"), fps, frameSize)
+                    numOfSegments.value += 1
+
+                writer.write(frame)
+
+                encodedFrames.value += 1
+                encodeTime.value += monotonic() - tStart
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if writer:
+                writer.release()
+
+    def _get_segment_path(self, segmentNumber: int) -> str:
+        # a recording started in the same second as the last one continues its segment numbers
+        timestamp: str = strftime('%Y%m%d_%H%M%S')
+        while True:
+            segmentPath: str = os.path.join(self._folder, f"drive_{timestamp}_{segmentNumber:03d}.avi")
+            if not os.path.exists(segmentPath):
+                return segmentPath
+
+            segmentNumber += 1
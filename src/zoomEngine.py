@@ -0,0 +1,114 @@
+import numpy as np
+from collections import OrderedDict
+from roboCarHelper import RobocarHelper
+
+cv2 = RobocarHelper.lazy_import("cv2")
+
+
+class ZoomEngine:
+    def __init__(self, frameSize: tuple, cacheSize: int = 8):
+        self._width, self._height = frameSize
+        self._cacheSize: int = cacheSize
+
+        self._zoomValue: float = 1.0
+
+        # only set when the camera can crop in the sensor pipeline
+        self._picam2 = None
+        self._maxScalerCrop: tuple = None
+
+        # remap maps for the most recently used zoom values, so a zoomed frame is a single cv2.remap
+        self._mapCache: OrderedDict = OrderedDict()
+
+    @property
+    def hardware_zoom(self) -> bool:
+        return self._picam2 is not None
+
+    @property
+    def zoom_value(self) -> float:
+        return self._zoomValue
+
+    def set_frame_size(self, frameSize: tuple) -> None:
+        # the crop rectangles and zoom centre depend on the frame size
+        self._width, self._height = frameSize
+        self._mapCache.clear()
+
+    def reset(self) -> None:
+        # forget the applied zoom so the next zoom value is applied again, e.g. after the camera is reconfigured
+        self._zoomValue = None
+
+    def use_camera_controls(self, picam2) -> bool:
+        # zoom through picamera2's ScalerCrop control so the zoomed frame comes directly from the camera
+        if "ScalerCrop" not in picam2.camera_controls:
+            return False
+
+        self._picam2 = picam2
+        self._maxScalerCrop = tuple(picam2.camera_properties["ScalerCropMaximum"])
+
+        return True
+
+    def set_zoom_value(self, zoomValue: float) -> None:
+        # only reconfigure when the zoom value actually changes
+        if zoomValue == self._zoomValue:
+            return
+
+        self._zoomValue = zoomValue
+
+        if self._picam2:
+            self._picam2.set_controls({"ScalerCrop": self._get_scaler_crop(zoomValue)})
+
+    def get_zoomed_image(self, image, dst=None):
+        if self._picam2 or self._zoomValue == 1.0:
+            return image
+
+        mapXY, mapInterpolation = self._get_maps(self._zoomValue)
+
+        return cv2.remap(image, mapXY, mapInterpolation, cv2.INTER_LINEAR, dst=dst)
+
+    def _get_maps(self, zoomValue: float) -> tuple:
+        if zoomValue in self._mapCache:
+            self._mapCache.move_to_end(zoomValue)
+            return self._mapCache[zoomValue]
+
+        rows, columns = self._get_crop(zoomValue)
+        cropWidth: int = columns.stop - columns.start
+        cropHeight: int = rows.stop - rows.start
+
+        # every pixel of the zoomed frame samples the crop at the same position cv2.resize would, the crop edge is
+        # repeated rather than blending in the pixels around the crop
+        mapX = (np.arange(self._width, dtype=np.float32) + 0.5) * (cropWidth / self._width) - 0.5
+        mapY = (np.arange(self._height, dtype=np.float32) + 0.5) * (cropHeight / self._height) - 0.5
+        mapX, mapY = np.meshgrid(
+            np.clip(mapX, 0, cropWidth - 1) + columns.start, np.clip(mapY, 0, cropHeight - 1) + rows.start
+        )
+
+        # the fixed point maps are smaller and remap faster than the float ones
+        maps: tuple = cv2.convertMaps(mapX, mapY, cv2.CV_16SC2)
+
+        self._mapCache[zoomValue] = maps
+        if len(self._mapCache) > self._cacheSize:
+            self._mapCache.popitem(last=False) # drop the least recently used zoom value
+
+        return maps
+
+    def _get_crop(self, zoomValue: float) -> tuple[slice, slice]:
+        centerX: int = int(self._width / 2)
+        centerY: int = int(self._height / 2)
+        halfZoomDisplayWidth: int = int(self._width / (2 * zoomValue))
+        halfZoomDisplayHeight: int = int(self._height / (2 * zoomValue))
+
+        return (
+            slice(centerY - halfZoomDisplayHeight, centerY + halfZoomDisplayHeight),
+            slice(centerX - halfZoomDisplayWidth, centerX + halfZoomDisplayWidth)
+        )
+
+    def _get_scaler_crop(self, zoomValue: float) -> tuple:
+        offsetX, offsetY, maxWidth, maxHeight = self._maxScalerCrop
+
+        width: int = int(maxWidth / zoomValue)
+        height: int = int(maxHeight / zoomValue)
+
+        # keep the crop centered in the sensor area
+        x: int = offsetX + (maxWidth - width) // 2
+        y: int = offsetY + (maxHeight - height) // 2
+
+        return x, y, width, height
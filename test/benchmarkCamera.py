@@ -0,0 +1,144 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import argparse
+import json
+import platform
+import cv2
+import numpy as np
+from time import perf_counter, strftime
+from camera import Camera
+from syntheticSource import SyntheticSource
+from telemetry import Telemetry, TelemetryValues, Direction
+
+# run with python test/benchmarkCamera.py, results are written as JSON so runs can be compared
+
+RESOLUTIONS: list[tuple] = [(640, 480), (764, 576), (1280, 720), (1920, 1080)]
+ZOOM_VALUES: list[float] = [1.0, 2.5, 5.0]
+
+
+def get_camera(resolution: tuple) -> Camera:
+    # the camera is used without starting any processes, frames come from a synthetic source
+    camera = Camera(resolution, frameSource=SyntheticSource(resolution, fps=0))
+    camera.set_servo_enabled()
+    camera.set_car_enabled()
+
+    telemetry = Telemetry()
+    telemetry.publish(TelemetryValues(hudActive=True, zoom=1.0, speed=50, direction=Direction.FORWARD))
+
+    camera._setup_capture()
+    camera._set_display_resolution(resolution)
+    camera._read_telemetry(telemetry)
+    camera._set_hud_texts()
+
+    return camera
+
+
+def run_benchmark(camera: Camera, step, numOfFrames: int, warmupFrames: int) -> dict:
+    frameBuffer = np.empty(camera.frame_shape, dtype=np.uint8)
+    durations = np.empty(numOfFrames)
+
+    for count in range(warmupFrames + numOfFrames):
+        # copy the frame out of the source like the display process copies it out of the frame ring
+        with camera._frameSource.capture_frame() as frame:
+            np.copyto(frameBuffer, frame)
+
+        tStart: float = perf_counter()
+        step(camera, frameBuffer)
+        duration: float = perf_counter() - tStart
+
+        if count >= warmupFrames:
+            durations[count - warmupFrames] = duration
+
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99]) * 1000
+
+    return {
+        "fps": round(numOfFrames / durations.sum(), 1),
+        "p50_ms": round(p50, 4),
+        "p95_ms": round(p95, 4),
+        "p99_ms": round(p99, 4)
+    }
+
+
+def get_zoom_step(zoomValue: float):
+    def zoom(camera: Camera, frame) -> None:
+        camera._zoomValue = zoomValue
+        camera._get_zoomed_image(frame)
+
+    return zoom
+
+
+def get_hud_step(hudActive: bool):
+    frameCount: list[int] = [0]
+
+    def hud(camera: Camera, frame) -> None:
+        # the fps text changes from frame to frame in the display loop, so its tile is re-rendered every frame here
+        frameCount[0] += 1
+        camera._fps = 20.0 + frameCount[0] % 10
+        camera._hudActive = hudActive
+        camera._add_text_to_cam_feed(frame)
+
+    return hud
+
+
+def get_flip_step():
+    # the camera flips in hardware, this is what a software flip would cost on sources without a transform
+    flipBuffer: dict = {}
+
+    def flip(camera: Camera, frame) -> None:
+        if flipBuffer.get("shape") != frame.shape:
+            flipBuffer.update(shape=frame.shape, buffer=np.empty_like(frame))
+        cv2.flip(frame, -1, dst=flipBuffer["buffer"])
+
+    return flip
+
+
+def get_benchmarks() -> list[tuple]:
+    benchmarks: list = [("zoom", {"zoom": zoomValue}, get_zoom_step(zoomValue)) for zoomValue in ZOOM_VALUES]
+    benchmarks.extend(("HUD", {"hud": hudActive}, get_hud_step(hudActive)) for hudActive in (True, False))
+    benchmarks.append(("flip", {}, get_flip_step()))
+
+    return benchmarks
+
+
+def main() -> None:
+    argParser = argparse.ArgumentParser(description="Benchmark the camera frame path without a camera")
+    argParser.add_argument("--frames", type=int, default=300, help="measured frames per benchmark")
+    argParser.add_argument("--warmup", type=int, default=30, help="frames run before measuring")
+    argParser.add_argument("--output", default=f"camera_benchmark_{strftime('%Y%m%d_%H%M%S')}.json")
+    args = argParser.parse_args()
+
+    results: list = []
+    for resolution in RESOLUTIONS:
+        camera = get_camera(resolution)
+
+        for name, parameters, step in get_benchmarks():
+            result: dict = run_benchmark(camera, step, args.frames, args.warmup)
+            results.append({"benchmark": name, "resolution": f"{resolution[0]}x{resolution[1]}", **parameters,
+                            **result})
+
+            formattedParameters: str = ", ".join(f"{key}={value}" for key, value in parameters.items())
+            print(f"{resolution[0]}x{resolution[1]} {name} {formattedParameters}".ljust(32) +
+                  f"{result['fps']:>10.1f} FPS, p50: {result['p50_ms']:.3f} ms, p95: {result['p95_ms']:.3f} ms, "
+                  f"p99: {result['p99_ms']:.3f} ms")
+
+        camera.cleanup_capture()
+
+    report: dict = {
+        "time": strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "frames": args.frames,
+        "results": results
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
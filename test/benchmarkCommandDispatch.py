@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import simulatedGpio
+simulatedGpio.install() # before anything imports RPi.GPIO or pigpio
+
+import argparse
+import random
+from time import perf_counter
+from commandTrace import CommandTrace
+from shutdownCoordinator import ShutdownCoordinator
+from telemetry import Telemetry
+import main
+
+# run with python test/benchmarkCommandDispatch.py, measures how many commands per second the command handler
+# runs, from looking the command up to the GPIO write, with the robo objects set up from config.ini
+
+COMMANDS: list[str] = ["go forward", "turn left", "turn right", "go backward", "stop now", "go faster", "go slower",
+                       "speed 30", "speed 45", "look up", "look left", "look center", "30 degrees left",
+                       "20 degrees down", "zoom in", "zoom out", "zoom 2.5", "turn on display", "turn off display"]
+
+
+def measure_commands_per_second(commandHandler, commands: list[str], telemetry: Telemetry) -> float:
+    tStart: float = perf_counter()
+    for command in commands:
+        commandHandler.run_command(CommandTrace(command), telemetry)
+
+    return len(commands) / (perf_counter() - tStart)
+
+
+def main_benchmark() -> None:
+    argParser = argparse.ArgumentParser(description="Benchmark the command dispatch against a simulated GPIO")
+    argParser.add_argument("--commands", type=int, default=100000, help="commands run per round")
+    argParser.add_argument("--rounds", type=int, default=5)
+    args = argParser.parse_args()
+
+    parser = main.read_config()
+    commandHandler = main.setup_command_handler(parser, recordCommands=False)
+    commandHandler.setup()
+
+    telemetry = Telemetry()
+    commands: list[str] = random.Random(1).choices(COMMANDS, k=args.commands)
+
+    try:
+        rates: list[float] = [
+            measure_commands_per_second(commandHandler, commands, telemetry) for _ in range(args.rounds)
+        ]
+    finally:
+        commandHandler.cleanup(ShutdownCoordinator())
+
+    print(f"{max(rates):,.0f} commands/s (best of {args.rounds} rounds of {args.commands} commands)")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,104 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+from commandGrammar import CommandGrammar, CommandTemplate
+
+# run with python test/benchmarkCommandGrammar.py, compares the compiled command grammar with
+# expanding every numeric command into its own string like the robo objects used to do
+
+COMMANDS: list[str] = ["drive", "reverse", "turn left", "turn right", "stop", "increase speed", "decrease speed",
+                       "look up", "look down", "look left", "look right", "look center", "start horn",
+                       "zoom in", "zoom out", "turn on display", "turn off display"]
+
+# template, min value, max value, decimals, the step the old expansion used
+TEMPLATES: list[tuple] = [
+    ("speed {param}", 0, 100, 0, 1),
+    ("{param} degrees up", 1, 90, 0, 1),
+    ("{param} degrees down", 1, 90, 0, 1),
+    ("{param} degrees left", 1, 90, 0, 1),
+    ("{param} degrees right", 1, 90, 0, 1),
+    ("zoom {param}", 1.0, 5.0, 1, 0.1),
+    ("start horn {param}", 0.1, 3.0, 1, 0.1)
+]
+
+
+def build_expanded() -> dict:
+    # same loops as the old _set_*_commands methods
+    commandToObjects: dict = {command: "owner" for command in COMMANDS}
+    for template, minValue, maxValue, decimals, step in TEMPLATES:
+        value = minValue
+        while value <= maxValue + (step if decimals else 0):
+            text: str = str(round(value, decimals)) if decimals else str(value)
+            commandToObjects[template.replace("{param}", text)] = "owner"
+            value += step
+
+    return commandToObjects
+
+
+def build_grammar() -> CommandGrammar:
+    commandGrammar = CommandGrammar()
+    for command in COMMANDS:
+        commandGrammar.add_command(command, "owner")
+    for template, minValue, maxValue, decimals, _ in TEMPLATES:
+        commandGrammar.add_template(CommandTemplate(template, minValue, maxValue, decimals), "owner")
+    commandGrammar.compile()
+
+    return commandGrammar
+
+
+def get_spoken_commands(numOfCommands: int) -> list[str]:
+    # mostly valid commands with some the recognizer got wrong, like a real session
+    commands: list[str] = [*COMMANDS, "speed 55", "30 degrees left", "45 degrees down", "zoom 2.5", "start horn 1.5",
+                           "speed 150", "zoom 7.5", "turn lefts", "hello there"]
+    return random.Random(1).choices(commands, k=numOfCommands)
+
+
+def measure_startup(build, repeats: int) -> tuple:
+    tStart: float = perf_counter()
+    for _ in range(repeats):
+        build()
+    startupTime: float = (perf_counter() - tStart) / repeats
+
+    tracemalloc.start()
+    result = build()
+    memory: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return startupTime, memory, result
+
+
+def measure_matching(match, commands: list[str]) -> float:
+    tStart: float = perf_counter()
+    for command in commands:
+        match(command)
+
+    return len(commands) / (perf_counter() - tStart)
+
+
+def main() -> None:
+    argParser = argparse.ArgumentParser(description="Benchmark the command grammar against expanded commands")
+    argParser.add_argument("--commands", type=int, default=200000, help="commands matched per benchmark")
+    argParser.add_argument("--repeats", type=int, default=200, help="builds timed for the startup cost")
+    args = argParser.parse_args()
+
+    commands: list[str] = get_spoken_commands(args.commands)
+
+    expandedTime, expandedMemory, commandToObjects = measure_startup(build_expanded, args.repeats)
+    grammarTime, grammarMemory, commandGrammar = measure_startup(build_grammar, args.repeats)
+
+    expandedRate: float = measure_matching(commandToObjects.get, commands)
+    grammarRate: float = measure_matching(commandGrammar.match, commands)
+
+    print(f"Expanded: {len(commandToObjects)} strings, startup {expandedTime * 1000:.3f} ms, "
+          f"{expandedMemory / 1024:.1f} KiB, {expandedRate:,.0f} matches/s")
+    print(f"Grammar:  {len(COMMANDS)} strings and {len(TEMPLATES)} templates, startup {grammarTime * 1000:.3f} ms, "
+          f"{grammarMemory / 1024:.1f} KiB, {grammarRate:,.0f} matches/s")
+
+
+if __name__ == "__main__":
+    main()
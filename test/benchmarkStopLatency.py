@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import argparse
+from functools import partial
+from multiprocessing import Process
+from multiprocessing.sharedctypes import RawValue
+from time import monotonic, sleep
+from commandHandler import CommandHandler
+from commandQueue import CommandQueue
+from commandTrace import CommandTrace
+from processSupervisor import Heartbeat
+from roboObject import RoboObject
+from shutdownCoordinator import ShutdownCoordinator
+from telemetry import Telemetry
+
+# run with python test/benchmarkStopLatency.py, measures the time from a stop command being put on the queue
+# until the car is stopped, with a backlog of servo commands in front of it, with and without the priority lane
+
+class FakeRoboObject(RoboObject):
+    stop_command: str = "stop now"
+
+    def __init__(self, commands: list[str], handleTime: float = 0.0):
+        # skips the pin and command checks of RoboObject, every command takes handleTime to run
+        self._commands: list[str] = commands
+        self._handleTime: float = handleTime
+        self.stopTime = RawValue('d', 0.0)
+        self._register_commands()
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return {command: ("", self._get_validity, partial(self._handle, command)) for command in self._commands}
+
+    def _get_validity(self) -> str:
+        return "valid"
+
+    def _handle(self, command: str) -> None:
+        sleep(self._handleTime)
+        if command == self.stop_command:
+            self.stopTime.value = monotonic()
+
+    def update_control_values_for_video_feed(self, telemetry: Telemetry) -> None:
+        pass
+
+    def blink(self, color: str) -> None:
+        pass
+
+
+def measure_stop_latency(backlog: int, servoTime: float, priorityLane: bool) -> float:
+    RoboObject.reset_command_registry()
+    car = FakeRoboObject(["stop now", "go forward"])
+    servo = FakeRoboObject(["look left", "look right"], servoTime)
+    commandHandler = CommandHandler(car, servo, FakeRoboObject([]), FakeRoboObject([]), FakeRoboObject([]),
+                                    "cancel program")
+    if not priorityLane:
+        commandHandler._queue = CommandQueue({"cancel program"})
+
+    shutdown = ShutdownCoordinator()
+    shutdown.add_queue(commandHandler.queue)
+    process = Process(target=commandHandler.execute_commands, args=(shutdown, Telemetry(), Heartbeat()))
+    process.start()
+
+    for count in range(backlog):
+        commandHandler.queue.put(CommandTrace("look left" if count % 2 else "look right"))
+
+    # give the command handler time to start on the backlog
+    sleep(servoTime / 2)
+    stopGiven: float = monotonic()
+    commandHandler.queue.put(CommandTrace("stop now"))
+
+    while not car.stopTime.value:
+        sleep(0.001)
+
+    shutdown.request("benchmark finished")
+    shutdown.join_processes([process])
+
+    return car.stopTime.value - stopGiven
+
+
+def main() -> None:
+    argParser = argparse.ArgumentParser(description="Benchmark stop latency with commands queued before the stop")
+    argParser.add_argument("--backlog", type=int, default=10, help="servo commands queued before the stop")
+    argParser.add_argument("--servo-time", type=float, default=0.05, help="seconds each servo command takes")
+    args = argParser.parse_args()
+
+    for priorityLane in (False, True):
+        stopLatency: float = measure_stop_latency(args.backlog, args.servo_time, priorityLane)
+        print(f"{'Priority lane' if priorityLane else 'Single queue'}: stopped after {stopLatency * 1000:.1f} ms "
+              f"with {args.backlog} commands queued")
+
+
+if __name__ == "__main__":
+    main()
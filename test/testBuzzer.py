@@ -12,18 +12,23 @@ def buzzer():
     return Buzzer(38, 0.3, 4, {"buzzCommand": "start honking", "buzzForSpecifiedTimeCommand": "honk {param}"})
 
 def test_get_command_validity(buzzer):
-    assert buzzer.get_command_validity("my command") == "valid"
+    assert buzzer.get_command_validity("start honking") == "valid"
+    assert buzzer.get_command_validity("honk 1.5") == "valid"
+    assert buzzer.get_command_validity("my command") == "invalid"
 
 @pytest.fixture(autouse=True)
 def reset_robo_object():
     yield
-    RoboObject._boardPinsInUse.clear()
-    RoboObject._commandsInUse.clear()
+    RoboObject.reset_command_registry()
 
-@patch("RPi.GPIO.output")
-@patch("buzzer.sleep")
-def test_buzz_time(mockSleep, mockGpioOutput, buzzer):
+@patch("buzzer.PulseScheduler.pulse")
+def test_buzz_time(mockPulse, buzzer):
     buzzer.handle_voice_command("start honking")
 
-    mockGpioOutput.assert_called()
-    mockSleep.assert_called_once_with(0.3)
\ No newline at end of file
+    mockPulse.assert_called_once_with(38, 0.3)
+
+@patch("buzzer.PulseScheduler.pulse")
+def test_buzz_for_specified_time(mockPulse, buzzer):
+    buzzer.handle_voice_command("honk 1.5")
+
+    mockPulse.assert_called_once_with(38, 1.5)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import tracemalloc
+import numpy as np
+import pytest
+from camera import Camera
+from frameRing import FrameRing
+from syntheticSource import SyntheticSource
+from telemetry import Telemetry, TelemetryValues, Direction
+
+RESOLUTION: tuple = (320, 240)
+
+class FrameFeeder:
+    def __init__(self, camera: Camera, frameRing: FrameRing, warmupFrames: int, numOfFrames: int):
+        # stands in for the shutdown event of the display loop, every check captures the next frame into the ring,
+        # so the loop runs in this thread without a capture process, the allocations are traced after the warmup
+        self._camera: Camera = camera
+        self._frameRing: FrameRing = frameRing
+        self._warmupFrames: int = warmupFrames
+        self._numOfFrames: int = numOfFrames
+        self._count: int = 0
+
+        self.bufferAllocations: int = 0
+        self.peakAllocated: int = 0
+
+    def is_set(self) -> bool:
+        if self._count == self._warmupFrames:
+            self.bufferAllocations = self._camera._frameBuffers.allocations
+            tracemalloc.start()
+        elif self._count == self._warmupFrames + self._numOfFrames:
+            # memory allocated before the warmup isn't traced, so the peak is the most allocated at once since then
+            _, self.peakAllocated = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return True
+
+        self._count += 1
+        with self._camera._frameSource.capture_frame() as frame:
+            self._frameRing.write(frame)
+
+        return False
+
+@pytest.fixture
+def frameRing():
+    frameRing = FrameRing((RESOLUTION[1], RESOLUTION[0], 3))
+    yield frameRing
+    frameRing.close()
+    frameRing.unlink()
+
+@pytest.mark.parametrize("zoom", [1.0, 2.5])
+def test_display_loop_allocates_no_frames_in_steady_state(frameRing, monkeypatch, zoom):
+    camera = Camera(RESOLUTION, frameSource=SyntheticSource(RESOLUTION, fps=0))
+    camera.set_servo_enabled()
+    camera.set_car_enabled()
+    camera._setup_capture()
+
+    # there is no display to show the frames on
+    monkeypatch.setattr(camera, "_show_frame", lambda frame: None)
+
+    telemetry = Telemetry()
+    telemetry.publish(TelemetryValues(hudActive=True, zoom=zoom, speed=50, direction=Direction.FORWARD))
+
+    feeder = FrameFeeder(camera, frameRing, warmupFrames=20, numOfFrames=200)
+    camera.show_camera_feed(feeder, telemetry, frameRing)
+
+    # the fps text changes every frame, so the HUD is rendered again, but only small objects like the text are
+    # allocated, a single temporary frame would be RESOLUTION[0] * RESOLUTION[1] * 3 bytes
+    frameBytes: int = int(np.prod(camera.frame_shape))
+    assert feeder.peakAllocated < frameBytes // 8
+    assert camera._frameBuffers.allocations == feeder.bufferAllocations
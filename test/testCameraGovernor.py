@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+import cameraGovernor
+from cameraGovernor import CameraGovernor
+
+RESOLUTIONS: list[tuple] = CameraGovernor.get_resolution_levels((800, 600))
+
+class FakeClock:
+    def __init__(self):
+        self.now: float = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cameraGovernor, "monotonic", clock)
+    return clock
+
+@pytest.fixture
+def governor(clock):
+    return CameraGovernor(20, RESOLUTIONS, holdTime=2.0, settleTime=3.0)
+
+def run(governor, clock, getFps, seconds: float, interval: float = 0.1) -> list[tuple]:
+    # feeds the governor one fps reading per interval, returns the resolutions it stepped to
+    steps: list[tuple] = []
+    for _ in range(round(seconds / interval)):
+        clock.now += interval
+        newResolution: tuple = governor.update(getFps())
+        if newResolution:
+            steps.append(newResolution)
+
+    return steps
+
+def get_simulated_fps(governor, fpsAtHighest: float):
+    # fps of a pi that takes the same time for every pixel
+    width, height = RESOLUTIONS[0]
+    return lambda: fpsAtHighest * width * height / (governor.resolution[0] * governor.resolution[1])
+
+def test_resolution_levels_are_even():
+    assert RESOLUTIONS == [(800, 600), (600, 450), (400, 300)]
+    assert all(width % 2 == 0 and height % 2 == 0 for width, height in CameraGovernor.get_resolution_levels((765, 577)))
+
+def test_no_step_before_settling(governor, clock):
+    assert run(governor, clock, lambda: 5, 2.9) == []
+
+def test_steps_down_after_holding_below_target(governor, clock):
+    assert run(governor, clock, lambda: 5, 3.0) == []
+    assert run(governor, clock, lambda: 5, 1.8) == []
+    assert run(governor, clock, lambda: 5, 0.5) == [RESOLUTIONS[1]]
+
+def test_short_dip_does_not_step(governor, clock):
+    run(governor, clock, lambda: 20, 3.0)
+
+    assert run(governor, clock, lambda: 10, 1.5) == []
+    assert run(governor, clock, lambda: 20, 1.0) == []
+    assert run(governor, clock, lambda: 10, 1.5) == []
+
+def test_fps_within_margins_keeps_resolution(governor, clock):
+    assert run(governor, clock, lambda: 18.5, 30) == []
+
+def test_steps_down_to_lowest_and_stays(governor, clock):
+    assert run(governor, clock, lambda: 1, 60) == [RESOLUTIONS[1], RESOLUTIONS[2]]
+    assert governor.resolution == RESOLUTIONS[-1]
+
+def test_stays_at_highest_with_headroom(governor, clock):
+    assert run(governor, clock, lambda: 100, 60) == []
+    assert governor.resolution == RESOLUTIONS[0]
+
+def test_steps_up_when_higher_resolution_keeps_headroom(governor, clock):
+    run(governor, clock, lambda: 1, 60)
+
+    assert run(governor, clock, get_simulated_fps(governor, 30), 60) == [RESOLUTIONS[1], RESOLUTIONS[0]]
+
+def test_waits_for_settling_between_steps(governor, clock):
+    steps: list[tuple] = run(governor, clock, lambda: 1, 7.0)
+
+    # settle, hold, step down, then settle again before the next hold can start
+    assert steps == [RESOLUTIONS[1]]
+
+@pytest.mark.parametrize("fpsAtHighest", [5, 12, 15, 17, 19, 25, 40])
+def test_does_not_oscillate(governor, clock, fpsAtHighest):
+    steps: list[tuple] = run(governor, clock, get_simulated_fps(governor, fpsAtHighest), 120)
+
+    # it finds its level and keeps it
+    assert len(steps) <= len(RESOLUTIONS) - 1
+    assert len(set(steps)) == len(steps)
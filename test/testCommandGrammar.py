@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from commandGrammar import CommandGrammar, CommandTemplate
+
+@pytest.fixture
+def commandGrammar():
+    commandGrammar = CommandGrammar()
+    commandGrammar.add_command("drive", "car")
+    commandGrammar.add_template(CommandTemplate("speed {param}", 0, 100), "car")
+    commandGrammar.add_template(CommandTemplate("{param} degrees left", 1, 45), "servo")
+    commandGrammar.add_template(CommandTemplate("zoom {param}", 1.0, 5.0, decimals=2), "camera")
+    commandGrammar.compile()
+    return commandGrammar
+
+def test_template_parses_typed_values():
+    assert CommandTemplate("speed {param}", 0, 100).parse("speed 40") == 40
+    assert isinstance(CommandTemplate("speed {param}", 0, 100).parse("speed 40"), int)
+    assert CommandTemplate("zoom {param}", 1.0, 5.0, decimals=2).parse("zoom 2.35") == 2.35
+
+def test_template_rejects_out_of_range_and_extra_decimals():
+    template = CommandTemplate("zoom {param}", 1.0, 5.0, decimals=2)
+
+    assert template.parse("zoom 0.5") is None
+    assert template.parse("zoom 5.01") is None
+    assert template.parse("zoom 2.355") is None
+    assert template.parse("zoom 2.35x") is None
+
+def test_template_escapes_command_text():
+    template = CommandTemplate("zoom (x{param})", 1, 5)
+
+    assert template.parse("zoom (x2)") == 2
+    assert template.parse("zoom x2") is None
+
+def test_match_returns_owner(commandGrammar):
+    assert commandGrammar.match("drive") == "car"
+    assert commandGrammar.match("speed 100") == "car"
+    assert commandGrammar.match("45 degrees left") == "servo"
+    assert commandGrammar.match("zoom 2.35") == "camera"
+
+def test_find_returns_owner_and_arguments(commandGrammar):
+    assert commandGrammar.find("drive") == ("car", ())
+    assert commandGrammar.find("speed 40") == ("car", (40,))
+    assert commandGrammar.find("zoom 2.35") == ("camera", (2.35,))
+    assert commandGrammar.find("speed 101") is None
+
+def test_match_rejects_unknown_and_out_of_range(commandGrammar):
+    assert commandGrammar.match("reverse") is None
+    assert commandGrammar.match("speed 101") is None
+    assert commandGrammar.match("46 degrees left") is None
+    assert commandGrammar.match("zoom") is None
+
+def test_match_compiles_added_templates():
+    commandGrammar = CommandGrammar()
+    assert commandGrammar.match("start horn 1.5") is None
+
+    commandGrammar.add_template(CommandTemplate("start horn {param}", 0.1, 3.0, decimals=1), "buzzer")
+    assert commandGrammar.match("start horn 1.5") == "buzzer"
@@ -0,0 +1,226 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from functools import partial
+from commandGrammar import CommandTemplate
+from commandHandler import CommandHandler
+from commandTrace import CommandTrace
+from exceptions import InvalidCommandException
+from macroHandling import MacroHandling
+from roboObject import RoboObject
+
+class FakeRoboObject(RoboObject):
+    stop_command: str = "stop now"
+
+    def __init__(self, commands: list[str], templates: list[CommandTemplate] = (), unchangedCommands: list[str] = ()):
+        # skips the pin checks of RoboObject
+        self._unchangedCommands: list[str] = list(unchangedCommands)
+        self.handledCommands: list[str] = []
+
+        self._commandDispatch: dict[str: tuple] = {
+            command: (self._get_channel(command), partial(self._get_validity, command),
+                      partial(self._handle, command))
+            for command in commands
+        }
+        self._templateDispatch: list[tuple] = [
+            (template, self._get_channel(template.template), partial(self._get_template_validity, template),
+             partial(self._handle_template, template))
+            for template in templates
+        ]
+        self._register_commands()
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
+
+    def get_template_dispatch(self) -> list[tuple]:
+        return self._templateDispatch
+
+    def _get_channel(self, command: str) -> str:
+        return "speed" if command.startswith("speed") else "direction"
+
+    def _get_validity(self, command: str) -> str:
+        return "partially valid" if command in self._unchangedCommands else "valid"
+
+    def _get_template_validity(self, template: CommandTemplate, value) -> str:
+        return self._get_validity(template.template.format(param=value))
+
+    def _handle(self, command: str) -> None:
+        self.handledCommands.append(command)
+
+    def _handle_template(self, template: CommandTemplate, value) -> None:
+        self._handle(template.template.format(param=value))
+
+    def update_control_values_for_video_feed(self, telemetry) -> None:
+        pass
+
+    def blink(self, color: str) -> None:
+        pass
+
+class FakeSpeedRoboObject(RoboObject):
+    def __init__(self, speed: int):
+        # a speed that can be set or stepped up, to check commands against the speed left by the ones before
+        self.speed: int = speed
+
+        self._commandDispatch: dict[str: tuple] = {"go faster": (None, self._get_step_validity, self._step_speed)}
+        self._templateDispatch: list[tuple] = [
+            (CommandTemplate("speed {param}", 0, 100), "speed", self._get_speed_validity, self._set_speed)
+        ]
+        self._register_commands()
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
+
+    def get_template_dispatch(self) -> list[tuple]:
+        return self._templateDispatch
+
+    def _get_step_validity(self) -> str:
+        return "partially valid" if self.speed + 10 > 100 else "valid"
+
+    def _get_speed_validity(self, speed: int) -> str:
+        return "partially valid" if self.speed == speed else "valid"
+
+    def _step_speed(self) -> None:
+        self.speed += 10
+
+    def _set_speed(self, speed: int) -> None:
+        self.speed = speed
+
+@pytest.fixture(autouse=True)
+def reset_robo_object():
+    yield
+    RoboObject.reset_command_registry()
+
+@pytest.fixture
+def car():
+    return FakeRoboObject(["go forward", "turn left", "stop now"], [CommandTemplate("speed {param}", 0, 100)],
+                          ["turn left"])
+
+@pytest.fixture
+def servo():
+    return FakeRoboObject(["look left"])
+
+@pytest.fixture
+def commandHandler(car, servo):
+    return CommandHandler(car, servo, FakeRoboObject([]), FakeRoboObject([]), None, "cancel program")
+
+def run_batch(commandHandler: CommandHandler, commands: list[str]) -> str:
+    return commandHandler._execute_batch(commandHandler._get_command_batch(commands), None, CommandTrace())
+
+def get_speed_handler(speedRoboObject: FakeSpeedRoboObject) -> CommandHandler:
+    return CommandHandler(FakeRoboObject(["stop now"]), FakeRoboObject([]), FakeRoboObject([]), speedRoboObject, None,
+                          "cancel program")
+
+def test_utterance_is_split_into_commands(commandHandler):
+    assert commandHandler._split_utterance("go forward and look left and speed 40") == [
+        "go forward", "look left", "speed 40"
+    ]
+
+def test_batch_keeps_spoken_order(commandHandler, car, servo):
+    batch = commandHandler._get_command_batch(["look left", "go forward"])
+
+    assert [(command, roboObject) for command, roboObject, *_ in batch] == [("look left", servo), ("go forward", car)]
+    assert commandHandler._execute_batch(batch, None, CommandTrace()) == "valid"
+
+def test_batch_keeps_last_command_per_channel(commandHandler):
+    batch = commandHandler._get_command_batch(["speed 30", "go forward", "speed 50"])
+
+    assert [command for command, *_ in batch] == ["go forward", "speed 50"]
+
+def test_batch_with_invalid_command_is_invalid(commandHandler, car):
+    assert run_batch(commandHandler, ["go forward", "fly away"]) == "invalid"
+    assert run_batch(commandHandler, []) == "invalid"
+    assert car.handledCommands == []
+
+def test_batch_with_unchanged_command_is_partially_valid(commandHandler, car):
+    assert run_batch(commandHandler, ["look left", "turn left"]) == "partially valid"
+    assert car.handledCommands == []
+
+def test_repeated_relative_commands_are_all_run():
+    speedRoboObject = FakeSpeedRoboObject(50)
+    commandHandler = get_speed_handler(speedRoboObject)
+
+    assert run_batch(commandHandler, ["go faster", "go faster"]) == "valid"
+    assert speedRoboObject.speed == 70
+
+def test_commands_are_checked_after_the_commands_before_them():
+    speedRoboObject = FakeSpeedRoboObject(50)
+    commandHandler = get_speed_handler(speedRoboObject)
+
+    # go faster is checked against speed 95, not the speed before the batch
+    assert run_batch(commandHandler, ["speed 95", "go faster"]) == "partially valid"
+    assert speedRoboObject.speed == 95
+
+def test_batch_invalid_partway_through_runs_nothing(commandHandler, car, servo):
+    assert run_batch(commandHandler, ["go forward", "look left", "fly away"]) == "invalid"
+    assert car.handledCommands == []
+    assert servo.handledCommands == []
+
+def test_unchanged_command_partway_through_is_skipped(commandHandler, car, servo):
+    assert run_batch(commandHandler, ["look left", "turn left", "speed 40"]) == "partially valid"
+    assert car.handledCommands == ["speed 40"]
+    assert servo.handledCommands == ["look left"]
+
+def test_batch_runs_actions_with_arguments(commandHandler, car):
+    batch = commandHandler._get_command_batch(["go forward", "speed 40"])
+    for _, _, _, run, args in batch:
+        run(*args)
+
+    assert car.handledCommands == ["go forward", "speed 40"]
+
+def test_dispatch_handles_single_command(car):
+    assert car.get_command_validity("turn left") == "partially valid"
+    assert car.get_command_validity("fly away") == "invalid"
+
+    car.handle_voice_command("speed 30")
+    assert car.handledCommands == ["speed 30"]
+
+def test_macro_steps_must_be_commands(car, servo):
+    macros = MacroHandling({"park": "start parking"}, {"park": "go forward 0.5s, fly away"})
+
+    with pytest.raises(InvalidCommandException):
+        CommandHandler(car, servo, FakeRoboObject([]), FakeRoboObject([]), None, "cancel program", macros=macros)
+
+def test_new_command_cancels_macro(car, servo):
+    macros = MacroHandling({"park": "start parking"}, {"park": "go forward 0.5s, look left"})
+    commandHandler = CommandHandler(car, servo, FakeRoboObject([]), FakeRoboObject([]), None, "cancel program",
+                                    macros=macros)
+
+    commandHandler._get_command_batch(["start parking"])[0][3]()
+    assert macros.scheduler.running
+    assert commandHandler._get_wait_time() == 0.0
+
+    commandHandler._cancel_macro()
+    assert not macros.scheduler.running
+    assert commandHandler._get_wait_time() == commandHandler._heartbeatInterval
+
+def test_macro_stop_step_keeps_queued_commands(car, servo):
+    macros = MacroHandling({"park": "start parking"}, {"park": "stop now"})
+    commandHandler = CommandHandler(car, servo, FakeRoboObject([]), FakeRoboObject([]), FakeRoboObject([]),
+                                    "cancel program", macros=macros)
+    macros.handle_voice_command("start parking")
+    commandHandler.queue.put(CommandTrace("look left"))
+
+    commandHandler._run_macro_step(None)
+
+    assert car.handledCommands == ["stop now"]
+    assert commandHandler.queue.get(timeout=1).command == "look left"
+
+class FakeJournal:
+    def __init__(self):
+        self.records: list[tuple] = []
+
+    def record(self, command: str, validity: str, receivedTime: float, macroStep: bool = False) -> None:
+        self.records.append((command, validity, macroStep))
+
+def test_macro_steps_are_journaled_as_macro_steps(car, servo):
+    macros = MacroHandling({"park": "start parking"}, {"park": "stop now"})
+    journal = FakeJournal()
+    commandHandler = CommandHandler(car, servo, FakeRoboObject([]), FakeRoboObject([]), FakeRoboObject([]),
+                                    "cancel program", journal=journal, macros=macros)
+
+    commandHandler.run_command(CommandTrace("start parking"), None)
+    commandHandler._run_macro_step(None)
+
+    assert journal.records == [("start parking", "valid", False), ("stop now", "valid", True)]
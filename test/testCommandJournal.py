@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from time import monotonic
+from commandJournal import CommandJournal
+
+@pytest.fixture
+def journalFile(tmp_path):
+    return str(tmp_path / "journals" / "commands.journal")
+
+def write_commands(journalFile: str, commands: list[tuple], macroStep: bool = False) -> None:
+    journal = CommandJournal(journalFile)
+    journal.start()
+    for command, validity in commands:
+        journal.record(command, validity, monotonic(), macroStep)
+    journal.close()
+
+def test_records_are_read_back_in_order(journalFile):
+    write_commands(journalFile, [("go forward", "valid"), ("look left and zoom 2.35", "partially valid"),
+                                 ("fly away", "invalid")])
+
+    records: list[tuple] = list(CommandJournal.read(journalFile))
+
+    assert [(command, validity) for *_, validity, command in records] == [
+        ("go forward", "valid"), ("look left and zoom 2.35", "partially valid"), ("fly away", "invalid")
+    ]
+    assert records[0][1] <= records[1][1] <= records[2][1]
+
+def test_journal_is_appended_to(journalFile):
+    write_commands(journalFile, [("go forward", "valid")])
+    write_commands(journalFile, [("stop now", "valid")])
+
+    assert [record[-1] for record in CommandJournal.read(journalFile)] == ["go forward", "stop now"]
+
+def test_macro_steps_are_marked(journalFile):
+    write_commands(journalFile, [("start parking", "valid")])
+    write_commands(journalFile, [("stop now", "valid"), ("look center", "partially valid")], macroStep=True)
+
+    assert [record[3:] for record in CommandJournal.read(journalFile)] == [
+        (False, "valid", "start parking"), (True, "valid", "stop now"), (True, "partially valid", "look center")
+    ]
+
+def test_record_cut_short_ends_journal(journalFile):
+    write_commands(journalFile, [("go forward", "valid"), ("stop now", "valid")])
+    with open(journalFile, "r+b") as file:
+        file.truncate(os.path.getsize(journalFile) - 3)
+
+    assert [record[-1] for record in CommandJournal.read(journalFile)] == ["go forward"]
+
+def test_other_files_are_rejected(tmp_path):
+    otherFile = tmp_path / "commands.log"
+    otherFile.write_text("go forward")
+
+    with pytest.raises(ValueError):
+        list(CommandJournal.read(str(otherFile)))
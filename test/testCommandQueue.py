@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from multiprocessing import Process
+from queue import Empty
+from commandQueue import CommandQueue
+from commandTrace import CommandTrace
+
+@pytest.fixture
+def commandQueue():
+    return CommandQueue({"stop now", "cancel program"})
+
+def test_priority_command_skips_queued_commands(commandQueue):
+    for command in ["look left", "look right", "stop now"]:
+        commandQueue.put(CommandTrace(command))
+
+    assert [commandQueue.get(timeout=1).command for _ in range(3)] == ["stop now", "look left", "look right"]
+
+def test_none_is_read_first(commandQueue):
+    commandQueue.put(CommandTrace("look left"))
+    commandQueue.put(None)
+
+    assert commandQueue.get(timeout=1) is None
+
+def test_get_raises_empty_after_timeout(commandQueue):
+    with pytest.raises(Empty):
+        commandQueue.get(timeout=0.05)
+
+def test_drop_pending_keeps_priority_lane(commandQueue):
+    for command in ["look left", "go forward", "cancel program"]:
+        commandQueue.put(CommandTrace(command))
+
+    assert commandQueue.drop_pending() == 2
+    assert commandQueue.get(timeout=1).command == "cancel program"
+    with pytest.raises(Empty):
+        commandQueue.get(timeout=0.05)
+
+def put_commands(commandQueue: CommandQueue) -> None:
+    commandQueue.put(CommandTrace("look left"))
+    commandQueue.put(CommandTrace("stop now"))
+
+def test_commands_are_passed_between_processes(commandQueue):
+    process = Process(target=put_commands, args=(commandQueue,))
+    process.start()
+    process.join()
+
+    assert commandQueue.get(timeout=1).command == "stop now"
+    assert commandQueue.get(timeout=1).command == "look left"
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from commandGrammar import CommandTemplate
+from commandRegistry import CommandRegistry
+from exceptions import InvalidPinException, InvalidCommandException
+
+@pytest.fixture
+def commandRegistry():
+    commandRegistry = CommandRegistry()
+    commandRegistry.register_command("go forward", "car")
+    commandRegistry.register_template(CommandTemplate("speed {param}", 0, 100), "car")
+    commandRegistry.register_template(CommandTemplate("zoom {param}", 1.0, 5.0, decimals=2), "camera")
+    return commandRegistry
+
+def test_find_registered_commands(commandRegistry):
+    assert commandRegistry.find("go forward") == ("car", ())
+    assert commandRegistry.find("speed 30") == ("car", (30,))
+    assert commandRegistry.find("zoom 2.5") == ("camera", (2.5,))
+    assert commandRegistry.find("speed 101") is None
+
+def test_duplicate_pin_exception(commandRegistry):
+    commandRegistry.register_pin(3)
+    with pytest.raises(InvalidPinException):
+        commandRegistry.register_pin(3)
+
+def test_duplicate_command_exception(commandRegistry):
+    with pytest.raises(InvalidCommandException):
+        commandRegistry.register_command("go forward", "servo")
+
+def test_command_covered_by_template_exception(commandRegistry):
+    with pytest.raises(InvalidCommandException):
+        commandRegistry.register_command("speed 30", "buzzer")
+
+    # out of the template range, so the template never takes it
+    commandRegistry.register_command("speed 300", "buzzer")
+
+def test_template_covering_command_exception(commandRegistry):
+    commandRegistry.register_command("look 30", "servo")
+    with pytest.raises(InvalidCommandException):
+        commandRegistry.register_template(CommandTemplate("look {param}", 0, 45), "servo")
+
+    commandRegistry.register_template(CommandTemplate("look {param}", 50, 90), "servo")
+
+def test_overlapping_templates_exception(commandRegistry):
+    with pytest.raises(InvalidCommandException):
+        commandRegistry.register_template(CommandTemplate("speed {param}", 50, 200), "servo")
+
+    with pytest.raises(InvalidCommandException):
+        commandRegistry.register_template(CommandTemplate("zoom {param}", 3, 10), "servo")
+
+    # same words but no value in both ranges
+    commandRegistry.register_template(CommandTemplate("speed {param}", 101, 200), "servo")
+    assert commandRegistry.find("speed 150") == ("servo", (150,))
+
+def test_reset(commandRegistry):
+    commandRegistry.register_pin(3)
+    commandRegistry.reset()
+
+    commandRegistry.register_pin(3)
+    commandRegistry.register_command("speed 30", "car")
+    assert commandRegistry.find("go forward") is None
+    assert commandRegistry.commands == ["speed 30"]
+    assert commandRegistry.templates == []
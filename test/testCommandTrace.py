@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import json
+import pytest
+from commandTrace import CommandTrace, TraceLog
+from traceSummary import read_traces, get_stage_durations, get_percentile
+
+@pytest.fixture(autouse=True)
+def deactivate_trace():
+    yield
+    CommandTrace.deactivate()
+
+def get_trace(command: str, stageTimes: list[tuple]) -> CommandTrace:
+    trace = CommandTrace(command)
+    for stage, stageTime in stageTimes:
+        trace.mark(stage, stageTime)
+    return trace
+
+def test_record_has_stages_since_first_stage():
+    record: dict = get_trace("go forward", [("phrase end", 10.0), ("recognized", 10.5), ("handled", 10.75)]).to_record()
+
+    assert record["command"] == "go forward"
+    assert record["stages"] == [["phrase end", 0.0], ["recognized", 500.0], ["handled", 750.0]]
+
+def test_mark_active_marks_activated_trace():
+    trace = CommandTrace("go forward")
+    CommandTrace.mark_active("motor write")
+    trace.activate()
+    CommandTrace.mark_active("motor write")
+    CommandTrace.deactivate()
+    CommandTrace.mark_active("motor write")
+
+    assert [stage for stage, _ in trace.stamps] == ["motor write"]
+
+def test_trace_log_rolls_over(tmp_path):
+    traceFile: str = str(tmp_path / "traces" / "commands.log")
+    traceLog = TraceLog(traceFile, maxBytes=200, backupCount=2)
+    for number in range(10):
+        traceLog.write(get_trace(f"speed {number}", [("phrase end", 0.0), ("handled", 0.1)]))
+    traceLog.close()
+
+    assert os.path.exists(f"{traceFile}.1")
+    assert not os.path.exists(f"{traceFile}.3")
+
+    # the newest traces are kept, oldest first
+    commands: list[str] = [trace["command"] for trace in read_traces(traceFile)]
+    assert commands[-1] == "speed 9"
+    assert commands == sorted(commands)
+
+def test_stage_durations_are_since_the_stage_before(tmp_path):
+    traceFile = tmp_path / "commands.log"
+    traceFile.write_text("\n".join(json.dumps(record) for record in [
+        {"time": 0, "command": "go forward", "stages": [["phrase end", 0.0], ["recognized", 600.0], ["handled", 610.0]]},
+        {"time": 1, "command": "look left", "stages": [["phrase end", 0.0], ["recognized", 400.0], ["handled", 430.0]]}
+    ]))
+
+    stageDurations: dict = get_stage_durations(read_traces(str(traceFile)))
+
+    assert stageDurations == {"recognized": [600.0, 400.0], "handled": [10.0, 30.0], "total": [610.0, 430.0]}
+
+def test_first_stage_is_skipped_for_every_kind_of_trace(tmp_path):
+    traceFile = tmp_path / "commands.log"
+    traceFile.write_text("\n".join(json.dumps(record) for record in [
+        {"time": 0, "command": "go forward", "stages": [["phrase end", 0.0], ["dequeued", 600.0]]},
+        {"time": 1, "command": "look left", "stages": [["step due", 0.0], ["dequeued", 0.2]]}
+    ]))
+
+    stageDurations: dict = get_stage_durations(read_traces(str(traceFile)))
+
+    assert stageDurations == {"dequeued": [600.0, 0.2], "total": [600.0, 0.2]}
+
+def test_percentile_uses_nearest_rank():
+    values: list[float] = [float(value) for value in range(1, 101)]
+
+    assert get_percentile(values, 50) == 50.0
+    assert get_percentile(values, 99) == 99.0
+    assert get_percentile([5.0], 95) == 5.0
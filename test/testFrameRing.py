@@ -0,0 +1,112 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import multiprocessing
+import numpy as np
+import pytest
+from frameRing import FrameRing
+
+FRAME_SHAPE: tuple = (4, 6, 3)
+
+@pytest.fixture
+def frameRing():
+    frameRing = FrameRing(FRAME_SHAPE)
+    yield frameRing
+    frameRing.close()
+    frameRing.unlink()
+
+@pytest.fixture
+def out(frameRing):
+    return np.empty(frameRing.slot_size, dtype=np.uint8)
+
+def get_frame(value: int, shape: tuple = FRAME_SHAPE):
+    return np.full(shape, value, dtype=np.uint8)
+
+def test_reader_gets_the_newest_frame(frameRing, out):
+    for value in range(1, 4):
+        frameRing.write(get_frame(value))
+
+    seq, frame = frameRing.read_latest(out, 0)
+
+    assert seq == 3
+    np.testing.assert_array_equal(frame, get_frame(3))
+
+def test_skipped_frames_show_up_as_a_sequence_gap(frameRing, out):
+    frameRing.write(get_frame(1))
+    lastSeq, _ = frameRing.read_latest(out, 0)
+
+    for value in range(2, 5):
+        frameRing.write(get_frame(value))
+    seq, _ = frameRing.read_latest(out, lastSeq)
+
+    # the display counts seq - lastSeq - 1 frames as dropped
+    assert seq - lastSeq - 1 == 2
+
+def test_no_frame_is_returned_without_a_new_one(frameRing, out):
+    frameRing.write(get_frame(1))
+
+    assert frameRing.read_latest(out, 1, timeout=0.01) == (None, None)
+
+def test_write_skips_a_slot_the_reader_holds(frameRing, out):
+    # the first frame goes to slot 1, as if the reader was copying out of it
+    frameRing._slotLocks[1].acquire()
+    try:
+        assert frameRing.write(get_frame(7)) == 1
+    finally:
+        frameRing._slotLocks[1].release()
+
+    seq, frame = frameRing.read_latest(out, 0)
+
+    assert seq == 1
+    np.testing.assert_array_equal(frame, get_frame(7))
+
+def test_frame_is_dropped_without_a_gap_when_every_slot_is_held(frameRing, out):
+    frameRing.write(get_frame(1))
+    for lock in frameRing._slotLocks:
+        lock.acquire()
+    try:
+        assert frameRing.write(get_frame(2)) == 1
+    finally:
+        for lock in frameRing._slotLocks:
+            lock.release()
+
+    assert frameRing.write(get_frame(3)) == 2
+    seq, frame = frameRing.read_latest(out, 1)
+
+    assert seq == 2
+    np.testing.assert_array_equal(frame, get_frame(3))
+
+def test_smaller_frames_keep_their_shape(frameRing, out):
+    frameRing.write(get_frame(5, (2, 3, 3)))
+
+    _, frame = frameRing.read_latest(out, 0)
+
+    assert frame.shape == (2, 3, 3)
+    np.testing.assert_array_equal(frame, get_frame(5, (2, 3, 3)))
+
+def capture(frameRing) -> None:
+    # the capture process changes its resolution when the display asks for it
+    width, height = frameRing.requested_resolution
+    frameRing.resume_writing()
+    frameRing.write(get_frame(9, (height, width, 3)))
+    frameRing.close()
+
+def test_frames_are_shared_with_a_spawned_process():
+    context = multiprocessing.get_context("spawn")
+    frameRing = FrameRing(FRAME_SHAPE, context=context)
+    out = np.empty(frameRing.slot_size, dtype=np.uint8)
+    frameRing.write(get_frame(1))
+    frameRing.requested_resolution = (3, 2)
+
+    process = context.Process(target=capture, args=(frameRing,))
+    process.start()
+    process.join(30)
+
+    seq, frame = frameRing.read_latest(out, 1)
+    frameRing.close()
+    frameRing.unlink()
+
+    assert process.exitcode == 0
+    assert seq == 2
+    np.testing.assert_array_equal(frame, get_frame(9, (2, 3, 3)))
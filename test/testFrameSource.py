@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+import numpy as np
+from syntheticSource import SyntheticSource
+from replaySource import ReplaySource
+
+def read_frames(source, numOfFrames: int) -> list:
+    frames: list = []
+    for _ in range(numOfFrames):
+        with source.capture_frame() as frame:
+            frames.append(frame.copy())
+
+    return frames
+
+@pytest.fixture
+def npy_file(tmp_path):
+    filePath: str = str(tmp_path / "frames.npy")
+    frames = np.stack([np.full((120, 160, 3), value, dtype=np.uint8) for value in (10, 20, 30)])
+    np.save(filePath, frames)
+
+    return filePath
+
+def test_synthetic_source_moves():
+    source = SyntheticSource((160, 120), fps=0)
+    source.start()
+
+    firstFrame, secondFrame = read_frames(source, 2)
+
+    assert firstFrame.shape == (120, 160, 3)
+    assert not np.array_equal(firstFrame, secondFrame)
+
+def test_synthetic_source_follows_resolution():
+    source = SyntheticSource((160, 120), fps=0)
+    source.start()
+    source.set_resolution((80, 60))
+
+    assert read_frames(source, 1)[0].shape == (60, 80, 3)
+
+def test_replay_source_loops_npy_stack(npy_file):
+    source = ReplaySource((160, 120), npy_file, fps=0)
+    source.start()
+
+    values: list = [int(frame[0, 0, 0]) for frame in read_frames(source, 4)]
+    source.close()
+
+    assert values == [10, 20, 30, 10]
+
+def test_replay_source_resizes_frames(npy_file):
+    source = ReplaySource((80, 60), npy_file, fps=0)
+    source.start()
+
+    frame = read_frames(source, 1)[0]
+    source.close()
+
+    assert frame.shape == (60, 80, 3)
+    assert frame[0, 0, 0] == 10
+
+def test_replay_source_missing_video(tmp_path):
+    source = ReplaySource((160, 120), str(tmp_path / "missing.avi"))
+
+    with pytest.raises(FileNotFoundError):
+        source.start()
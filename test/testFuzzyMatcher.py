@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from commandGrammar import CommandTemplate
+from fuzzyMatcher import FuzzyMatcher
+
+@pytest.fixture
+def fuzzyMatcher():
+    fuzzyMatcher = FuzzyMatcher(maxDistance=2)
+    for command in ["go forward", "go backward", "look left", "look right", "turn on display", "turn off display"]:
+        fuzzyMatcher.add_command(command)
+    fuzzyMatcher.add_template(CommandTemplate("speed {param}", 0, 100))
+    fuzzyMatcher.add_template(CommandTemplate("{param} degrees left", 1, 90))
+    return fuzzyMatcher
+
+def test_near_miss_is_corrected(fuzzyMatcher):
+    command, confidence = fuzzyMatcher.match("go forwards")
+
+    assert command == "go forward"
+    assert confidence == pytest.approx(1 - 1 / 11)
+
+def test_exact_command_has_full_confidence(fuzzyMatcher):
+    assert fuzzyMatcher.match("look left") == ("look left", 1.0)
+
+def test_spoken_number_is_kept_for_templates(fuzzyMatcher):
+    assert fuzzyMatcher.match("speeds 55")[0] == "speed 55"
+    assert fuzzyMatcher.match("30 degree left")[0] == "30 degrees left"
+    assert fuzzyMatcher.match("speeds") is None
+
+def test_too_distant_command_is_rejected(fuzzyMatcher):
+    assert fuzzyMatcher.match("hello there") is None
+
+def test_ambiguous_command_is_rejected(fuzzyMatcher):
+    # one letter from both "turn on display" and "turn off display"
+    assert fuzzyMatcher.match("turn of display") is None
+
+def test_duplicate_commands_are_added_once(fuzzyMatcher):
+    size: int = fuzzyMatcher.size
+    fuzzyMatcher.add_command("look left")
+
+    assert fuzzyMatcher.size == size
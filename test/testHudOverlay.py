@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import cv2
+import numpy as np
+import pytest
+from hudOverlay import HudOverlay
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+COLOUR: tuple = (0, 255, 0)
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(2).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+
+def get_hud_overlay(scale: int = 1, thickness: int = 1) -> HudOverlay:
+    hudOverlay = HudOverlay(320, FONT, scale, thickness, COLOUR)
+    hudOverlay.add_line("fps", (10, 30))
+    hudOverlay.add_line("speed", (10, 225))
+    return hudOverlay
+
+def assert_same_text(image, expected) -> None:
+    # anti-aliased text is blended in with floats, OpenCV uses integers and rounds a few pixels the other way
+    np.testing.assert_allclose(image, expected, rtol=0, atol=1)
+
+def test_tile_is_only_rendered_again_when_text_changes(image):
+    hudOverlay = get_hud_overlay()
+    tile = hudOverlay._tiles["speed"]
+
+    assert tile.update("Speed: 50%")
+    assert not tile.update("Speed: 50%")
+    assert tile.update("Speed: 60%")
+
+    for text in ["Speed: 60%", "Speed: 60%", "Speed: 70%"]:
+        hudOverlay.draw(image, "speed", text)
+
+    assert hudOverlay._rendered == 1
+    assert hudOverlay._reused == 2
+
+@pytest.mark.parametrize("scale, thickness", [(1, 1), (1, 2), (2, 3)])
+@pytest.mark.parametrize("text", ["30 FPS (capture 29)", "Direction: Forward", "Angle: H-45/V20", "gjpqy|"])
+def test_text_matches_put_text(image, text, scale, thickness):
+    hudOverlay = get_hud_overlay(scale, thickness)
+    expected = image.copy()
+
+    for name, origin in [("fps", (10, 30)), ("speed", (10, 225))]:
+        hudOverlay.draw(image, name, text)
+        cv2.putText(expected, text, origin, FONT, scale, COLOUR, thickness)
+
+    assert_same_text(image, expected)
+
+def test_text_is_clipped_at_the_frame_edges(image):
+    hudOverlay = HudOverlay(320, FONT, 1, 1, COLOUR)
+    hudOverlay.add_line("top", (10, 5))
+    hudOverlay.add_line("right", (300, 120))
+    expected = image.copy()
+
+    hudOverlay.draw(image, "top", "Zoom: 2.5x")
+    hudOverlay.draw(image, "right", "Speed: 100%")
+    cv2.putText(expected, "Zoom: 2.5x", (10, 5), FONT, 1, COLOUR, 1)
+    cv2.putText(expected, "Speed: 100%", (300, 120), FONT, 1, COLOUR, 1)
+
+    assert_same_text(image, expected)
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from time import monotonic
+from macroScheduler import MacroScheduler
+from macroHandling import MacroHandling
+from roboObject import RoboObject
+from exceptions import InvalidCommandException
+
+@pytest.fixture(autouse=True)
+def reset_robo_object():
+    yield
+    RoboObject.reset_command_registry()
+
+def run_macro(macroScheduler: MacroScheduler) -> list[tuple]:
+    # the same waiting as the command loop, without commands to wait for
+    steps: list[tuple] = []
+    while macroScheduler.running:
+        waitTime: float = macroScheduler.get_wait_time(1.0)
+        waitEnd: float = monotonic() + waitTime
+        while monotonic() < waitEnd:
+            pass
+
+        step: tuple = macroScheduler.next_step()
+        if step:
+            steps.append((step[0], monotonic()))
+
+    return steps
+
+def test_steps_run_in_order_at_their_due_time():
+    macroScheduler = MacroScheduler()
+    macroScheduler.start("park", [("go backward", 0.05), ("turn left", 0.03), ("stop now", 0.0)])
+    startTime: float = monotonic()
+
+    steps = run_macro(macroScheduler)
+
+    assert [command for command, _ in steps] == ["go backward", "turn left", "stop now"]
+    assert steps[1][1] - startTime == pytest.approx(0.05, abs=0.01)
+    assert steps[2][1] - startTime == pytest.approx(0.08, abs=0.01)
+    assert len(macroScheduler.jitters) == 3
+    assert max(macroScheduler.jitters) < 5.0
+
+def test_wait_time_stops_short_of_next_step():
+    macroScheduler = MacroScheduler(spinTime=0.002)
+    assert macroScheduler.get_wait_time(1.0) == 1.0
+
+    macroScheduler.start("park", [("go backward", 0.5), ("stop now", 0.0)])
+    assert macroScheduler.get_wait_time(1.0) == 0.0
+    assert macroScheduler.next_step()[0] == "go backward"
+
+    assert macroScheduler.get_wait_time(1.0) == pytest.approx(0.498, abs=0.01)
+    assert macroScheduler.get_wait_time(0.1) == 0.1
+    assert macroScheduler.next_step() is None
+
+def test_cancel_drops_remaining_steps():
+    macroScheduler = MacroScheduler()
+    assert macroScheduler.cancel() == ""
+
+    macroScheduler.start("park", [("go backward", 0.5), ("stop now", 0.0)])
+    assert macroScheduler.cancel() == "park"
+    assert not macroScheduler.running
+    assert macroScheduler.next_step() is None
+
+def test_macro_steps_are_parsed():
+    macros = MacroHandling({"park": "start parking"}, {"park": "go backward 0.8s, turn left 0.5s, speed 30, stop now"})
+
+    assert macros.get_step_commands() == ["go backward", "turn left", "speed 30", "stop now"]
+
+    macros.handle_voice_command("start parking")
+    assert macros.scheduler.running
+    assert macros.scheduler.macro_name == "park"
+
+def test_macro_without_steps_exception():
+    with pytest.raises(InvalidCommandException):
+        MacroHandling({"park": "start parking"}, {})
+
+    with pytest.raises(InvalidCommandException):
+        MacroHandling({"dance": "start dancing"}, {"dance": "turn left 0.5s, , turn right"})
@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+import numpy as np
+import cv2
+from threading import Event, Thread
+from time import sleep
+from urllib.request import urlopen
+from mjpegStreamer import MjpegStreamer
+
+@pytest.fixture
+def streamer():
+    streamer = MjpegStreamer(0, "127.0.0.1")
+    streamer.start()
+    yield streamer
+    streamer.stop()
+
+@pytest.fixture
+def frame_source(streamer):
+    stopEvent = Event()
+
+    def publish_frames():
+        count: int = 0
+        while not stopEvent.is_set():
+            frame = np.full((120, 160, 3), count % 256, dtype=np.uint8)
+            streamer.publish_frame(frame)
+            count += 1
+            stopEvent.wait(0.01)
+
+    thread = Thread(target=publish_frames, daemon=True)
+    thread.start()
+    yield
+    stopEvent.set()
+    thread.join()
+
+def read_jpeg(response) -> bytes:
+    contentLength: int = 0
+    while True:
+        line: bytes = response.readline().strip()
+        if line.startswith(b"Content-Length:"):
+            contentLength = int(line.split(b":")[1])
+        elif not line and contentLength:
+            return response.read(contentLength)
+
+def test_stream_serves_jpeg_frames(streamer, frame_source):
+    with urlopen(f"http://127.0.0.1:{streamer.port}/stream", timeout=5) as response:
+        assert response.headers["Content-Type"] == "multipart/x-mixed-replace; boundary=frame"
+
+        jpeg: bytes = read_jpeg(response)
+
+    frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert frame.shape == (120, 160, 3)
+
+def test_frames_are_encoded_once_for_all_clients(streamer):
+    url: str = f"http://127.0.0.1:{streamer.port}/stream"
+    with urlopen(url, timeout=5) as firstResponse, urlopen(url, timeout=5) as secondResponse:
+        while streamer.num_of_clients < 2:
+            sleep(0.01)
+
+        streamer.publish_frame(np.zeros((120, 160, 3), dtype=np.uint8))
+
+        assert read_jpeg(firstResponse) == read_jpeg(secondResponse)
+        assert streamer.encoded_frames == 1
+
+def test_no_encoding_without_clients(streamer):
+    streamer.publish_frame(np.zeros((120, 160, 3), dtype=np.uint8))
+
+    assert streamer.encoded_frames == 0
+
+def test_unknown_path_returns_404(streamer):
+    with pytest.raises(Exception):
+        urlopen(f"http://127.0.0.1:{streamer.port}/unknown", timeout=5)
@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import simulatedGpio
+simulatedGpio.install() # before motorDriver imports RPi.GPIO
+
+import pytest
+from motorDriver import MotorDriver
+
+@pytest.fixture
+def motorDriver():
+    simulatedGpio.reset()
+    return MotorDriver(16, 15, 22, 18, 11, 13)
+
+def test_force_stop_keeps_pins_driven_low(motorDriver):
+    motorDriver.setup(30)
+    motorDriver.drive()
+    simulatedGpio.cleanup() # the command process died without cleaning up
+
+    motorDriver.force_stop()
+
+    assert all(simulatedGpio.pinStates[pin] == simulatedGpio.LOW for pin in motorDriver.pins)
+    assert simulatedGpio.claimedPins.issuperset(motorDriver.pins)
+
+def test_restarted_process_sets_up_force_stopped_pins(motorDriver):
+    motorDriver.force_stop()
+
+    motorDriver.setup(30)
+    motorDriver.drive()
+
+    assert any(simulatedGpio.pinStates[pin] == simulatedGpio.HIGH for pin in motorDriver.pins)
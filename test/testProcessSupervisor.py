@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from multiprocessing import Value
+from time import monotonic, sleep
+from shutdownCoordinator import ShutdownCoordinator
+from processSupervisor import ProcessSupervisor
+
+@pytest.fixture
+def shutdown():
+    return ShutdownCoordinator(deadline=1.0)
+
+@pytest.fixture
+def supervisor(shutdown):
+    supervisor = ProcessSupervisor(shutdown, heartbeatTimeout=0.5, checkInterval=0.05, minBackoff=0.1, maxBackoff=0.2)
+    yield supervisor
+    shutdown.request("test finished")
+    supervisor.stop()
+    shutdown.join_processes(supervisor.processes)
+
+def crash_once(shutdown, numOfStarts, heartbeat) -> None:
+    numOfStarts.value += 1
+    if numOfStarts.value == 1:
+        raise SystemExit(1)
+
+    while not shutdown.is_set():
+        heartbeat.beat()
+        sleep(0.02)
+
+def stall_once(shutdown, numOfStarts, heartbeat) -> None:
+    numOfStarts.value += 1
+    heartbeat.beat()
+    if numOfStarts.value == 1:
+        sleep(60)
+
+    while not shutdown.is_set():
+        heartbeat.beat()
+        sleep(0.02)
+
+def wait_for_recovery(supervisor, name: str, timeout: float = 5.0) -> dict:
+    timeoutTime: float = monotonic() + timeout
+    while monotonic() < timeoutTime:
+        stats: dict = supervisor.stats[name]
+        if stats["recoveryTimes"]:
+            return stats
+        sleep(0.05)
+
+    return supervisor.stats[name]
+
+def test_dead_worker_is_restarted(shutdown, supervisor):
+    numOfStarts = Value('i', 0)
+    failures: list = []
+    supervisor.add_worker("worker", crash_once, (shutdown, numOfStarts), onFailure=lambda: failures.append(True))
+    supervisor.start()
+
+    stats: dict = wait_for_recovery(supervisor, "worker")
+
+    assert stats["restarts"] == 1
+    assert len(stats["recoveryTimes"]) == 1
+    assert numOfStarts.value == 2
+    assert failures == [True]
+
+def test_stalled_worker_is_restarted(shutdown, supervisor):
+    numOfStarts = Value('i', 0)
+    supervisor.add_worker("worker", stall_once, (shutdown, numOfStarts))
+    supervisor.start()
+
+    stats: dict = wait_for_recovery(supervisor, "worker")
+
+    assert stats["restarts"] == 1
+    assert numOfStarts.value == 2
+
+def test_workers_are_not_restarted_when_shutting_down(shutdown, supervisor):
+    supervisor.add_worker("worker", stall_once, (shutdown, Value('i', 1)))
+    supervisor.start()
+
+    shutdown.request("test")
+    supervisor.stop()
+    shutdown.join_processes(supervisor.processes)
+
+    assert supervisor.stats["worker"]["restarts"] == 0
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from time import monotonic, sleep
+from pulseScheduler import PulseScheduler
+
+class FakeOutput:
+    def __init__(self):
+        self.changes: list[tuple] = []
+
+    def __call__(self, pin: int, value: bool) -> None:
+        self.changes.append((pin, value, monotonic()))
+
+@pytest.fixture
+def output():
+    return FakeOutput()
+
+@pytest.fixture
+def pulseScheduler(output):
+    pulseScheduler = PulseScheduler(output)
+    pulseScheduler.start()
+    yield pulseScheduler
+    pulseScheduler.stop()
+
+def test_pulse_returns_right_away(pulseScheduler, output):
+    tStart: float = monotonic()
+    pulseScheduler.pulse(5, 0.2)
+
+    assert monotonic() - tStart < 0.05
+    assert pulseScheduler.active_pins == [5]
+    assert [(pin, value) for pin, value, _ in output.changes] == [(5, True)]
+
+def test_pin_is_turned_off_after_duration(pulseScheduler, output):
+    pulseScheduler.pulse(5, 0.1)
+    sleep(0.2)
+
+    (_, _, onTime), (pin, value, offTime) = output.changes
+    assert (pin, value) == (5, False)
+    assert offTime - onTime == pytest.approx(0.1, abs=0.03)
+    assert not pulseScheduler.active_pins
+
+def test_overlapping_pulses_are_merged(pulseScheduler, output):
+    pulseScheduler.pulse(5, 0.1)
+    pulseScheduler.pulse(5, 0.2)
+    pulseScheduler.pulse(5, 0.05) # ends before the current pulse, so it changes nothing
+    sleep(0.3)
+
+    assert [(pin, value) for pin, value, _ in output.changes] == [(5, True), (5, False)]
+    assert output.changes[1][2] - output.changes[0][2] == pytest.approx(0.2, abs=0.03)
+
+def test_pins_are_turned_off_independently(pulseScheduler, output):
+    pulseScheduler.pulse([5, 6], 0.05)
+    pulseScheduler.pulse(6, 0.2)
+    sleep(0.1)
+
+    assert pulseScheduler.active_pins == [6]
+
+def test_stop_turns_off_active_pins(output):
+    pulseScheduler = PulseScheduler(output)
+    pulseScheduler.start()
+    pulseScheduler.pulse(5, 10)
+    pulseScheduler.stop()
+
+    assert output.changes[-1][:2] == (5, False)
+    assert not pulseScheduler.active_pins
@@ -0,0 +1,35 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from replayJournal import replay_journal
+
+class FakeCommandHandler:
+    def __init__(self, validities: dict[str: str]):
+        self._validities: dict[str: str] = validities
+        self.runCommands: list[tuple] = []
+
+    def run_command(self, trace, telemetry, macroStep: bool = False) -> str:
+        self.runCommands.append((trace.command, macroStep))
+        return self._validities.get(trace.command, "valid")
+
+def get_record(receivedTime: float, command: str, validity: str = "valid", macroStep: bool = False) -> tuple:
+    return 0.0, receivedTime, 1.0, macroStep, validity, command
+
+def test_macro_steps_are_replayed_as_macro_steps():
+    commandHandler = FakeCommandHandler({})
+    records: list[tuple] = [
+        get_record(1.0, "start parking"), get_record(1.1, "stop now", macroStep=True), get_record(1.2, "stop now")
+    ]
+
+    replay_journal(commandHandler, records, originalSpeed=False)
+
+    assert commandHandler.runCommands == [("start parking", False), ("stop now", True), ("stop now", False)]
+
+def test_changed_validities_are_reported():
+    commandHandler = FakeCommandHandler({"turn left": "partially valid"})
+    records: list[tuple] = [get_record(1.0, "turn left"), get_record(1.1, "go forward")]
+
+    _, mismatches = replay_journal(commandHandler, records, originalSpeed=False)
+
+    assert mismatches == [("turn left", "valid", "partially valid")]
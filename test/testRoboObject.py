@@ -6,11 +6,19 @@ import pytest
 from roboObject import RoboObject
 from exceptions import InvalidPinException, InvalidCommandException
 
+class CommandRoboObject(RoboObject):
+    def __init__(self, pins: list, commands: dict):
+        super().__init__(pins, commands)
+        self._commandDispatch: dict[str: tuple] = {command: ("", None, None) for command in commands.values()}
+        self._register_commands()
+
+    def get_command_dispatch(self) -> dict[str: tuple]:
+        return self._commandDispatch
+
 @pytest.fixture(autouse=True)
 def reset_robo_object():
     yield
-    RoboObject._boardPinsInUse.clear()
-    RoboObject._commandsInUse.clear()
+    RoboObject.reset_command_registry()
 
 def test_invalid_board_pin_exception():
     with pytest.raises(InvalidPinException):
@@ -26,7 +34,20 @@ def test_too_short_command_exception():
         RoboObject([3, 5], {"command": "go"})
 
 def test_duplicate_command_exception():
-    RoboObject([3, 5], {"command": "my command"})
+    # only the commands in the dispatch table are registered, so the test needs a robo object that has one
+    CommandRoboObject([3, 5], {"command": "my command"})
     with pytest.raises(InvalidCommandException):
-        RoboObject([7, 11], {"command": "my command"})
+        CommandRoboObject([7, 11], {"otherCommand": "my command"})
+
+def test_config_commands_without_dispatch_are_not_registered():
+    RoboObject([3, 5], {"command": "my command"})
+    RoboObject([7, 11], {"command": "my command"})
+
+    assert RoboObject.get_command_registry().commands == []
+
+def test_reset_frees_pins_and_commands():
+    CommandRoboObject([3, 5], {"command": "my command"})
+    RoboObject.reset_command_registry()
+
+    CommandRoboObject([3, 5], {"command": "my command"})
 
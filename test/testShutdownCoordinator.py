@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from multiprocessing import Process, Queue
+from time import monotonic, sleep
+from shutdownCoordinator import ShutdownCoordinator
+
+@pytest.fixture
+def shutdown():
+    return ShutdownCoordinator(deadline=0.5, carStopTarget=0.5, terminateTimeout=0.5)
+
+def wait_on_queue(queue) -> None:
+    queue.get()
+
+def hang() -> None:
+    while True:
+        sleep(0.1)
+
+def test_request_wakes_blocked_queue_reader(shutdown):
+    queue = Queue()
+    shutdown.add_queue(queue)
+    process = Process(target=wait_on_queue, args=(queue,))
+    process.start()
+
+    shutdown.request("test")
+    process.join(2)
+
+    assert shutdown.is_set()
+    assert not process.is_alive()
+
+def test_request_only_wakes_queues_once(shutdown):
+    queue = Queue()
+    shutdown.add_queue(queue)
+
+    shutdown.request("test")
+    shutdown.request("test again")
+    sleep(0.1)
+
+    assert queue.get(timeout=1) is None
+    assert queue.empty()
+
+def test_processes_missing_the_deadline_are_terminated(shutdown):
+    process = Process(target=hang)
+    process.start()
+
+    tStart: float = monotonic()
+    shutdown.request("test")
+    shutdown.join_processes([process])
+
+    assert not process.is_alive()
+    assert monotonic() - tStart < 2
+
+def test_car_stop_time_is_recorded_after_request(shutdown, capsys):
+    shutdown.set_car_stopped()
+    shutdown.print_stop_time()
+    assert "not recorded" in capsys.readouterr().out
+
+    shutdown.request("test")
+    shutdown.set_car_stopped()
+    shutdown.print_stop_time()
+    assert "Time to stopped car" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from multiprocessing import Process
+from stageTimings import StageTimings
+
+@pytest.fixture
+def stageTimings():
+    # 10 us to 1 s in 64 bins
+    return StageTimings(["capture", "HUD"])
+
+def get_bin(stageTimings: StageTimings, stage: str, duration: float) -> int:
+    stageTimings.record(stage, duration)
+    start: int = stageTimings._stageIndexes[stage] * stageTimings._numOfBins
+    counts: list[int] = stageTimings._counts[start:start + stageTimings._numOfBins]
+    stageTimings._counts[start:start + stageTimings._numOfBins] = [0] * stageTimings._numOfBins
+
+    assert sum(counts) == 1
+    return counts.index(1)
+
+def test_duration_on_an_edge_goes_in_the_bin_below(stageTimings):
+    edges: list[float] = stageTimings._binEdges
+
+    assert get_bin(stageTimings, "capture", edges[10]) == 10
+    assert get_bin(stageTimings, "capture", edges[10] * 1.0001) == 11
+    assert get_bin(stageTimings, "capture", edges[9] * 1.0001) == 10
+
+def test_durations_outside_the_range_go_in_the_outer_bins(stageTimings):
+    assert get_bin(stageTimings, "capture", 0.0) == 0
+    assert get_bin(stageTimings, "capture", 1e-5) == 0
+    assert get_bin(stageTimings, "capture", 1.0) == 62
+    assert get_bin(stageTimings, "capture", 5.0) == 63
+
+def test_stages_have_their_own_histograms(stageTimings):
+    stageTimings.record("HUD", 0.001)
+
+    assert stageTimings.get_percentiles("capture") == {50: None, 95: None, 99: None}
+    assert stageTimings.get_percentiles("HUD")[50] >= 0.001
+
+def test_percentiles_are_the_upper_edge_of_their_bin(stageTimings):
+    edges: list[float] = stageTimings._binEdges
+    for _ in range(90):
+        stageTimings.record("capture", edges[20])
+    for _ in range(9):
+        stageTimings.record("capture", edges[30])
+    stageTimings.record("capture", 2.0)
+
+    assert stageTimings.get_percentiles("capture", (50, 90, 95, 99, 100)) == {
+        50: edges[20], 90: edges[20], 95: edges[30], 99: edges[30], 100: float("inf")
+    }
+
+def test_percentile_error_is_within_one_bin(stageTimings):
+    # consecutive edges are about 20% apart
+    durations: list[float] = [0.001 * (1 + index / 100) for index in range(100)]
+    for duration in durations:
+        stageTimings.record("HUD", duration)
+
+    p50: float = stageTimings.get_percentiles("HUD", (50,))[50]
+
+    assert durations[49] <= p50 < durations[49] * 1.21
+
+def record_laps(stageTimings: StageTimings) -> None:
+    for _ in range(100):
+        stageTimings.record("capture", 0.002)
+    stageTimings.record("HUD", 0.0001)
+
+def test_timings_recorded_in_another_process_are_read(stageTimings):
+    process = Process(target=record_laps, args=(stageTimings,))
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert 0.002 <= stageTimings.get_percentiles("capture")[99] < 0.002 * 1.21
+    assert 0.0001 <= stageTimings.get_percentiles("HUD")[50] < 0.0001 * 1.21
+
+def test_lap_records_time_since_the_previous_lap(stageTimings, monkeypatch):
+    times = iter([1.0, 1.003, 1.004])
+    monkeypatch.setattr("stageTimings.perf_counter", lambda: next(times))
+
+    stageTimings.start()
+    stageTimings.lap("capture")
+    stageTimings.lap("HUD")
+
+    assert 0.003 <= stageTimings.get_percentiles("capture")[50] < 0.003 * 1.21
+    assert 0.001 <= stageTimings.get_percentiles("HUD")[50] < 0.001 * 1.21
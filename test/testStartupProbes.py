@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from time import monotonic, sleep
+from startupTimeline import StartupTimeline
+from startupProbes import StartupProbes
+
+@pytest.fixture
+def timeline():
+    return StartupTimeline()
+
+@pytest.fixture
+def probes(timeline):
+    return StartupProbes(timeline)
+
+def fail() -> None:
+    raise ValueError("probe failed")
+
+def test_probes_run_concurrently(probes):
+    for name in ["first", "second", "third"]:
+        probes.add_probe(name, lambda: sleep(0.3))
+
+    tStart: float = monotonic()
+    probes.start()
+    errors: list = probes.wait()
+
+    assert not errors
+    assert monotonic() - tStart < 0.6
+
+def test_probe_errors_are_returned(probes):
+    probes.add_probe("working", lambda: None)
+    probes.add_probe("failing", fail)
+
+    probes.start()
+    errors: list = probes.wait()
+
+    assert len(errors) == 1
+    assert str(errors[0]) == "probe failed"
+
+def test_timeline_report_includes_probes(probes, timeline, capsys):
+    probes.add_probe("working", lambda: None)
+    probes.start()
+    probes.wait()
+
+    timeline.print_report()
+    report: str = capsys.readouterr().out
+
+    assert "working" in report
+    assert "waiting for startup probes" in report
+    assert "Time to ready" in report
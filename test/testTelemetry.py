@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from multiprocessing import Process, Value
+from threading import Thread
+from telemetry import Telemetry, TelemetryValues, Direction
+
+@pytest.fixture
+def telemetry():
+    return Telemetry()
+
+def test_initial_values(telemetry):
+    values = TelemetryValues()
+    telemetry.read(values)
+
+    assert values.hudActive
+    assert values.zoom == 1.0
+    assert Direction(values.direction) == Direction.STOPPED
+
+def test_read_returns_published_values(telemetry):
+    telemetry.publish(TelemetryValues(hudActive=False, zoom=2.5, speed=40, direction=Direction.LEFT))
+
+    values = TelemetryValues()
+    version: int = telemetry.read(values)
+
+    assert version == telemetry.version
+    assert not values.hudActive
+    assert values.zoom == 2.5
+    assert values.speed == 40
+    assert Direction(values.direction).label == "Left"
+
+def test_read_without_new_version_leaves_values(telemetry):
+    values = TelemetryValues()
+    version: int = telemetry.read(values)
+    values.speed = 99
+
+    assert telemetry.read(values, version) == version
+    assert values.speed == 99
+
+def test_unchanged_values_are_not_published_again(telemetry):
+    values = TelemetryValues(hudActive=True, zoom=1.5)
+    telemetry.publish(values)
+    version: int = telemetry.version
+
+    telemetry.publish(values)
+
+    assert telemetry.version == version
+
+def test_torn_snapshot_is_read_again(telemetry):
+    # the values changed behind an even version, as a reader on another core can see it when stores are reordered
+    telemetry._shared.values.speed = 70
+
+    values = TelemetryValues()
+    reader = Thread(target=telemetry.read, args=(values,))
+    reader.start()
+    reader.join(0.1)
+    assert reader.is_alive()
+
+    telemetry.publish(TelemetryValues(speed=50, zoom=2.0))
+    reader.join(1)
+
+    assert not reader.is_alive()
+    assert values.speed == 50
+    assert values.zoom == 2.0
+
+def test_direction_from_label():
+    assert Direction.from_label("Forward") == Direction.FORWARD
+    assert Direction.REVERSE.label == "Reverse"
+
+def publish_values(telemetry, stopFlag) -> None:
+    values = TelemetryValues()
+    count: int = 0
+    while not stopFlag.value:
+        count += 1
+        values.horizontalAngle = values.verticalAngle = values.speed = count
+        telemetry.publish(values)
+
+def test_reads_are_consistent_while_writing(telemetry):
+    stopFlag = Value('b', False)
+    writer = Process(target=publish_values, args=(telemetry, stopFlag))
+    writer.start()
+
+    try:
+        while not telemetry.version:
+            pass
+
+        values = TelemetryValues()
+        version: int = -1
+        for _ in range(20000):
+            version = telemetry.read(values, version)
+            assert values.horizontalAngle == values.verticalAngle == values.speed
+    finally:
+        stopFlag.value = True
+        writer.join()
@@ -0,0 +1,127 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import cv2
+import pytest
+from multiprocessing import Event
+from time import sleep, monotonic
+from syntheticSource import SyntheticSource
+from videoRecorder import VideoRecorder
+
+RESOLUTION: tuple = (160, 120)
+
+@pytest.fixture
+def source():
+    source = SyntheticSource(RESOLUTION, fps=0)
+    source.start()
+    return source
+
+def add_frames(recorder: VideoRecorder, source: SyntheticSource, numOfFrames: int) -> None:
+    for _ in range(numOfFrames):
+        with source.capture_frame() as frame:
+            recorder.add_frame(frame)
+
+def wait_for_encoded_frames(recorder: VideoRecorder, numOfFrames: int, timeout: float = 10.0) -> None:
+    encodedFrames = recorder._stats[0]
+    endTime: float = monotonic() + timeout
+    while encodedFrames.value < numOfFrames and monotonic() < endTime:
+        sleep(0.01)
+
+def get_segment_frame_counts(folder) -> list[int]:
+    counts: list[int] = []
+    for segment in sorted(os.listdir(folder)):
+        capture = cv2.VideoCapture(os.path.join(folder, segment))
+        counts.append(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)))
+        capture.release()
+
+    return counts
+
+def test_frames_are_encoded_into_one_segment(tmp_path, source, capsys):
+    recorder = VideoRecorder(str(tmp_path), 60, 100 * 1024 * 1024, 100)
+    recorder.start(30)
+    worker = recorder._worker
+
+    add_frames(recorder, source, 10)
+    recorder.cleanup()
+
+    assert not recorder.recording
+    assert not worker.is_alive()
+    assert worker.exitcode == 0
+    assert get_segment_frame_counts(tmp_path) == [10]
+    assert "10 frames encoded" in capsys.readouterr().out
+
+def test_segments_rotate_by_time(tmp_path, source):
+    recorder = VideoRecorder(str(tmp_path), 0.2, 100 * 1024 * 1024, 100)
+    recorder.start(30)
+
+    add_frames(recorder, source, 3)
+    wait_for_encoded_frames(recorder, 3)
+    sleep(0.3)
+    add_frames(recorder, source, 2)
+    recorder.cleanup()
+
+    assert get_segment_frame_counts(tmp_path) == [3, 2]
+
+def test_segments_rotate_by_size(tmp_path):
+    # the writer only flushes every 256 KB, so a segment is over one byte once that much is encoded
+    source = SyntheticSource((640, 480), fps=0, scrollSpeed=97)
+    source.start()
+    recorder = VideoRecorder(str(tmp_path), 60, 1, 100)
+    recorder.start(30)
+
+    add_frames(recorder, source, 60)
+    recorder.cleanup()
+
+    frameCounts: list[int] = get_segment_frame_counts(tmp_path)
+    assert len(frameCounts) > 1
+    assert sum(frameCounts) == 60
+
+def test_segments_rotate_when_the_resolution_changes(tmp_path, source):
+    recorder = VideoRecorder(str(tmp_path), 60, 100 * 1024 * 1024, 100)
+    recorder.start(30)
+
+    add_frames(recorder, source, 2)
+    source.set_resolution((80, 60))
+    add_frames(recorder, source, 2)
+    recorder.cleanup()
+
+    assert get_segment_frame_counts(tmp_path) == [2, 2]
+
+def test_frames_are_dropped_when_the_queue_is_full(tmp_path, source, monkeypatch, capsys):
+    # the encoder doesn't take any frames off the queue until it is released
+    release = Event()
+    encode_frames = VideoRecorder._encode_frames
+
+    def held_encoder(self, queue, fps, stats) -> None:
+        release.wait()
+        encode_frames(self, queue, fps, stats)
+
+    monkeypatch.setattr(VideoRecorder, "_encode_frames", held_encoder)
+
+    recorder = VideoRecorder(str(tmp_path), 60, 100 * 1024 * 1024, 2)
+    recorder.start(30)
+    add_frames(recorder, source, 5)
+    release.set()
+    recorder.cleanup()
+
+    assert get_segment_frame_counts(tmp_path) == [2]
+    assert "2 frames encoded" in capsys.readouterr().out
+    assert recorder._droppedFrames == 3
+
+def test_stop_lets_the_encoder_finish_in_the_background(tmp_path, source):
+    recorder = VideoRecorder(str(tmp_path), 60, 100 * 1024 * 1024, 100)
+    recorder.start(30)
+    worker = recorder._worker
+    add_frames(recorder, source, 5)
+
+    recorder.stop()
+    assert not recorder.recording
+
+    # a new recording can start while the last one is still being finished
+    recorder.start(30)
+    add_frames(recorder, source, 1)
+    recorder.cleanup()
+
+    assert worker.exitcode == 0
+    assert sorted(get_segment_frame_counts(tmp_path)) == [1, 5]
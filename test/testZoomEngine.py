@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import cv2
+import numpy as np
+import pytest
+from zoomEngine import ZoomEngine
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(1).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+
+def get_resized_crop(image, zoomValue: float):
+    height, width = image.shape[:2]
+    halfWidth: int = int(width / (2 * zoomValue))
+    halfHeight: int = int(height / (2 * zoomValue))
+    crop = image[height // 2 - halfHeight:height // 2 + halfHeight, width // 2 - halfWidth:width // 2 + halfWidth]
+    return cv2.resize(crop, (width, height), interpolation=cv2.INTER_LINEAR)
+
+@pytest.mark.parametrize("zoomValue", [1.5, 2.0, 3.7])
+def test_zoomed_image_matches_resized_crop(image, zoomValue):
+    zoomEngine = ZoomEngine((320, 240))
+    zoomEngine.set_zoom_value(zoomValue)
+
+    zoomed = zoomEngine.get_zoomed_image(image)
+    difference = np.abs(zoomed.astype(np.int16) - get_resized_crop(image, zoomValue))
+
+    assert zoomed.shape == image.shape
+    # the fixed point maps round the sample positions to 1/32 of a pixel
+    assert np.mean(difference) < 2
+    assert np.max(difference) <= 8
+
+def test_zoomed_image_is_written_to_dst(image):
+    zoomEngine = ZoomEngine((320, 240))
+    zoomEngine.set_zoom_value(2.0)
+    dst = np.empty_like(image)
+
+    assert zoomEngine.get_zoomed_image(image, dst) is dst
+
+def test_no_zoom_returns_the_image(image):
+    assert ZoomEngine((320, 240)).get_zoomed_image(image) is image
+
+def test_maps_are_cached_for_recent_zoom_values(image):
+    zoomEngine = ZoomEngine((320, 240), cacheSize=2)
+    for zoomValue in (1.5, 2.0, 1.5, 3.0):
+        zoomEngine.set_zoom_value(zoomValue)
+        zoomEngine.get_zoomed_image(image)
+
+    assert list(zoomEngine._mapCache) == [1.5, 3.0]
+
+def test_frame_size_change_drops_the_maps(image):
+    zoomEngine = ZoomEngine((320, 240))
+    zoomEngine.set_zoom_value(2.0)
+    zoomEngine.get_zoomed_image(image)
+
+    zoomEngine.set_frame_size((160, 120))
+
+    assert zoomEngine.get_zoomed_image(image[:120, :160]).shape == (120, 160, 3)